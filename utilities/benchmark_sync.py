@@ -0,0 +1,482 @@
+"""
+Offline sync benchmark
+Replays recorded nba_api responses through scrape_and_store against a local
+PostgreSQL database and reports wall time, API calls, DB round trips, rows/sec
+and peak RSS per stage, so performance changes can be compared run to run
+without network access or the production database.
+
+    # once, with network: record fixtures for a small game-date window
+    python benchmark_sync.py record --season 2025 --date-from 2025-01-06 --date-to 2025-01-12
+
+    # any time, offline: replay them at 150ms synthetic latency, three runs
+    python benchmark_sync.py run --latency 0.15 --repeat 3 --compare last.json
+
+Record and run with the same BOX_SCORE_MODE so the same endpoints are requested.
+Pass --api-rate to lift the pacer when measuring code rather than pacing.
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------
+# CONFIGURATION
+# ----------------------------------------------------------------------
+UTILITIES_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.environ.get("SYNC_STATE_DIR", os.path.join(UTILITIES_DIR, ".sync_state"))
+BENCHMARK_FIXTURES_DIR = os.environ.get("BENCHMARK_FIXTURES_DIR", os.path.join(STATE_DIR, "benchmark_fixtures"))
+BENCHMARK_REPORTS_DIR = os.environ.get("BENCHMARK_REPORTS_DIR", os.path.join(STATE_DIR, "benchmarks"))
+BENCHMARK_DSN = os.environ.get("BENCHMARK_DSN", "dbname=basky_bench user=postgres host=localhost")
+LOCAL_HOSTS = ("", "localhost", "127.0.0.1", "::1")
+
+# Tables as they exist in production: the Hibernate columns plus the unique keys the
+# scraper upserts on (teams.abbreviation, the NBA ID columns - named like the indexes
+# ensure_schema would create - the games natural key and box_scores(game_id, player_id))
+BENCHMARK_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS teams (
+        id BIGSERIAL PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        city VARCHAR(100),
+        abbreviation VARCHAR(10) UNIQUE,
+        nba_team_id BIGINT UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS players (
+        id BIGSERIAL PRIMARY KEY,
+        name VARCHAR(100),
+        team_id BIGINT REFERENCES teams (id),
+        position VARCHAR(50),
+        jersey_number INTEGER,
+        height VARCHAR(255),
+        weight INTEGER,
+        age INTEGER,
+        games_played INTEGER,
+        minutes_per_game DOUBLE PRECISION,
+        points DOUBLE PRECISION,
+        rebounds DOUBLE PRECISION,
+        assists DOUBLE PRECISION,
+        steals DOUBLE PRECISION,
+        blocks DOUBLE PRECISION,
+        turnovers DOUBLE PRECISION,
+        field_goal_percentage DOUBLE PRECISION,
+        three_point_percentage DOUBLE PRECISION,
+        free_throw_percentage DOUBLE PRECISION,
+        offensive_rebounds DOUBLE PRECISION,
+        defensive_rebounds DOUBLE PRECISION,
+        field_goals_made DOUBLE PRECISION,
+        field_goals_attempted DOUBLE PRECISION,
+        three_pointers_made DOUBLE PRECISION,
+        three_pointers_attempted DOUBLE PRECISION,
+        free_throws_made DOUBLE PRECISION,
+        free_throws_attempted DOUBLE PRECISION,
+        plus_minus DOUBLE PRECISION,
+        fantasy_points DOUBLE PRECISION,
+        double_doubles INTEGER,
+        triple_doubles INTEGER,
+        personal_fouls DOUBLE PRECISION,
+        efficiency_rating DOUBLE PRECISION,
+        true_shooting_percentage DOUBLE PRECISION,
+        effective_field_goal_percentage DOUBLE PRECISION,
+        assist_to_turnover_ratio DOUBLE PRECISION,
+        impact_score DOUBLE PRECISION,
+        usage_rate DOUBLE PRECISION,
+        player_efficiency_rating DOUBLE PRECISION,
+        is_starter BOOLEAN,
+        nba_player_id BIGINT UNIQUE,
+        stats_season_end_year INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS games (
+        id BIGSERIAL PRIMARY KEY,
+        game_date DATE,
+        home_team_id BIGINT REFERENCES teams (id),
+        away_team_id BIGINT REFERENCES teams (id),
+        home_score INTEGER,
+        away_score INTEGER,
+        nba_game_id VARCHAR(10) UNIQUE,
+        UNIQUE (game_date, home_team_id, away_team_id)
+    );
+    CREATE TABLE IF NOT EXISTS box_scores (
+        id BIGSERIAL PRIMARY KEY,
+        game_id BIGINT NOT NULL REFERENCES games (id),
+        player_id BIGINT NOT NULL REFERENCES players (id),
+        team_id BIGINT NOT NULL REFERENCES teams (id),
+        minutes_played VARCHAR(10),
+        points INTEGER,
+        rebounds INTEGER,
+        assists INTEGER,
+        steals INTEGER,
+        blocks INTEGER,
+        turnovers INTEGER,
+        field_goals_made INTEGER,
+        field_goals_attempted INTEGER,
+        three_pointers_made INTEGER,
+        three_pointers_attempted INTEGER,
+        free_throws_made INTEGER,
+        free_throws_attempted INTEGER,
+        plus_minus INTEGER,
+        is_starter BOOLEAN,
+        UNIQUE (game_id, player_id)
+    );
+"""
+
+# ----------------------------------------------------------------------
+# COUNTERS
+# ----------------------------------------------------------------------
+class Counter:
+    """Thread-safe running total."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def add(self, count=1):
+        with self._lock:
+            self.value += count
+
+db_round_trips = Counter()
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """Cursor counting statements sent to the server (execute_batch/execute_values pages included)."""
+
+    def execute(self, query, vars=None):
+        db_round_trips.add()
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        db_round_trips.add(len(vars_list))
+        return super().executemany(query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        db_round_trips.add()
+        return super().copy_expert(sql, file, size)
+
+class CountingConnection(psycopg2.extensions.connection):
+    """Connection whose cursors, commits and rollbacks count as round trips."""
+
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault("cursor_factory", CountingCursor)
+        return super().cursor(*args, **kwargs)
+
+    def commit(self):
+        db_round_trips.add()
+        return super().commit()
+
+    def rollback(self):
+        db_round_trips.add()
+        return super().rollback()
+
+class RssMonitor:
+    """
+    Peak resident set size since the last reset(), sampled from /proc/self/statm.
+    Where /proc is unavailable (macOS) the process-lifetime peak from getrusage is used.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._proc = os.path.exists("/proc/self/statm")
+        self._stop = threading.Event()
+        self.peak = self.current()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def current(self):
+        if self._proc:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * self._page_size
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.current())
+
+    def reset(self):
+        self.peak = self.current()
+        return self.peak
+
+    def stop(self):
+        self._stop.set()
+
+# ----------------------------------------------------------------------
+# FIXTURES
+# ----------------------------------------------------------------------
+class FixtureStore:
+    """
+    Recorded nba_api responses kept in a PayloadArchive (the scraper's gzip,
+    content-addressed format), plus a manifest.json with the recorded sync scope.
+    """
+
+    def __init__(self, directory, archive):
+        self.directory = directory
+        self.archive = archive
+        self.recorded = Counter()
+        self.replayed = Counter()
+        self.misses = Counter()
+
+    def record(self, endpoint):
+        self.archive.store(endpoint)
+        self.recorded.add()
+
+    def replayer(self, latency=0.0, jitter=0.0, seed=0):
+        """Response source for the scraper's replay hook, sleeping latency +/- jitter per call."""
+        rng = random.Random(seed)
+        rng_lock = threading.Lock()
+
+        def replay(endpoint):
+            with rng_lock:
+                delay = latency * (1 + rng.uniform(-jitter, jitter))
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                payload = self.archive.load(endpoint)
+            except LookupError:
+                self.misses.add()
+                raise
+            self.replayed.add()
+            return payload
+
+        return replay
+
+    def write_manifest(self, scope):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "manifest.json"), "w") as manifest_file:
+            json.dump({**scope, "recorded_at": datetime.datetime.now().isoformat()}, manifest_file, indent=2)
+
+    def read_manifest(self):
+        path = os.path.join(self.directory, "manifest.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No fixtures recorded in {self.directory}; run `benchmark_sync.py record` first")
+        with open(path) as manifest_file:
+            return json.load(manifest_file)
+
+# ----------------------------------------------------------------------
+# DATABASE
+# ----------------------------------------------------------------------
+def check_local_dsn(dsn, allow_remote=False):
+    """Refuse to benchmark against anything but a local database unless explicitly allowed."""
+    host = psycopg2.extensions.parse_dsn(dsn).get("host", "")
+    if host not in LOCAL_HOSTS and not host.startswith("/") and not allow_remote:
+        raise ValueError(f"Benchmark DSN points at {host!r}; use a local PostgreSQL or pass --allow-remote")
+
+def reset_database(conn):
+    """Recreate the benchmark tables empty, so they always match BENCHMARK_SCHEMA."""
+    with conn.cursor() as cur:
+        # Aggregate tables are recreated by the scraper's ensure_schema
+        cur.execute("""
+            DROP TABLE IF EXISTS player_season_stats, team_season_stats, season_aggregate_queue,
+                                 box_scores, games, players, teams CASCADE
+        """)
+        cur.execute(BENCHMARK_SCHEMA)
+    conn.commit()
+
+# ----------------------------------------------------------------------
+# BENCHMARK RUN
+# ----------------------------------------------------------------------
+def load_scraper(state_dir, api_rate=None):
+    """Import the scraper with its run state in state_dir (and pacing lifted to api_rate)."""
+    os.environ["SYNC_STATE_DIR"] = state_dir
+    os.environ["INCREMENTAL_SYNC"] = "false"
+    os.environ["PAYLOAD_ARCHIVE"] = "false"
+    if api_rate:
+        os.environ["NBA_API_RATE"] = os.environ["NBA_API_MAX_RATE"] = str(api_rate)
+        os.environ["NBA_API_BURST"] = str(max(1, int(api_rate)))
+    sys.path.insert(0, UTILITIES_DIR)
+    return importlib.import_module("nba_scrape_to_postgres")
+
+def make_stage_progress(nba, fixtures, rss):
+    """SyncProgress subclass recording per-stage wall time, API calls, round trips, rows and peak RSS."""
+
+    class StageProgress(nba.SyncProgress):
+        def __init__(self):
+            super().__init__()
+            self.stage_metrics = {}
+            self._stage_start = {}
+
+        def _counters(self):
+            return {
+                "api_calls": fixtures.replayed.value + fixtures.misses.value + fixtures.recorded.value,
+                "db_round_trips": db_round_trips.value,
+                "rows": sum(self.rows_written.values()),
+            }
+
+        def begin_stage(self, stage):
+            super().begin_stage(stage)
+            rss.reset()
+            self._stage_start[stage] = (time.perf_counter(), self._counters())
+
+        def end_stage(self, stage, status="done"):
+            super().end_stage(stage, status)
+            started, before = self._stage_start.pop(stage, (time.perf_counter(), self._counters()))
+            wall = time.perf_counter() - started
+            after = self._counters()
+            rows = after["rows"] - before["rows"]
+            self.stage_metrics[stage] = {
+                "status": status,
+                "wall_seconds": round(wall, 3),
+                "api_calls": after["api_calls"] - before["api_calls"],
+                "db_round_trips": after["db_round_trips"] - before["db_round_trips"],
+                "rows": rows,
+                "rows_per_second": round(rows / wall, 1) if wall > 0 else 0.0,
+                "peak_rss_mb": round(rss.peak / 1024 / 1024, 1),
+            }
+
+    return StageProgress
+
+def run_sync_once(nba, progress_cls, scope, state_dir, dsn):
+    """One scrape_and_store run on an empty database and fresh run state; returns its progress."""
+    for name in os.listdir(state_dir):
+        path = os.path.join(state_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    nba.db_pool.close()
+    nba.db_pool = nba.ConnectionPool(connect=lambda: psycopg2.connect(dsn, connection_factory=CountingConnection))
+    with nba.db_pool.connection() as conn:
+        reset_database(conn)
+    progress = progress_cls()
+    nba.scrape_and_store(incremental=False, resume=False, progress=progress,
+                         season_end_year=scope["season"], stages=scope.get("stages"),
+                         date_from=scope.get("date_from"), date_to=scope.get("date_to"))
+    return progress
+
+def summarize_runs(runs):
+    """Per-stage medians over repeated runs."""
+    def median(values):
+        values = sorted(values)
+        middle = len(values) // 2
+        return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+    summary = {}
+    for stage in runs[0]["stages"]:
+        samples = [run["stages"][stage] for run in runs if stage in run["stages"]]
+        summary[stage] = {
+            metric: round(median([sample[metric] for sample in samples]), 3)
+            for metric in ("wall_seconds", "api_calls", "db_round_trips", "rows", "rows_per_second", "peak_rss_mb")
+        }
+    summary["total"] = {"wall_seconds": round(median([run["wall_seconds"] for run in runs]), 3)}
+    return summary
+
+def print_report(report, baseline=None):
+    header = f"{'stage':<12}{'wall s':>10}{'api':>8}{'db rt':>9}{'rows':>9}{'rows/s':>11}{'rss MB':>9}"
+    if baseline:
+        header += f"{'vs base':>10}"
+    print(header)
+    print("-" * len(header))
+    for stage, metrics in report["summary"].items():
+        if stage == "total":
+            continue
+        line = (f"{stage:<12}{metrics['wall_seconds']:>10.2f}{metrics['api_calls']:>8g}"
+                f"{metrics['db_round_trips']:>9g}{metrics['rows']:>9g}{metrics['rows_per_second']:>11.1f}"
+                f"{metrics['peak_rss_mb']:>9.1f}")
+        base = (baseline or {}).get("summary", {}).get(stage)
+        if base and base["wall_seconds"]:
+            line += f"{(metrics['wall_seconds'] / base['wall_seconds'] - 1) * 100:>+9.1f}%"
+        print(line)
+    total = report["summary"]["total"]["wall_seconds"]
+    line = f"{'total':<12}{total:>10.2f}"
+    base = (baseline or {}).get("summary", {}).get("total")
+    if base and base["wall_seconds"]:
+        line += " " * 46 + f"{(total / base['wall_seconds'] - 1) * 100:>+9.1f}%"
+    print(line)
+
+def benchmark(args):
+    state_dir = tempfile.mkdtemp(prefix="basky-bench-")
+    nba = load_scraper(state_dir, api_rate=args.api_rate)
+    fixtures = FixtureStore(args.fixtures, nba.PayloadArchive(args.fixtures))
+    rss = RssMonitor()
+    progress_cls = make_stage_progress(nba, fixtures, rss)
+
+    if args.command == "record":
+        scope = {"season": args.season or nba.SEASON_END_YEAR, "stages": args.stages,
+                 "date_from": args.date_from, "date_to": args.date_to}
+        nba.api_response_sinks.append(fixtures.record)
+        logger.info(f"🎙️  Recording nba_api responses to {args.fixtures}")
+        try:
+            run_sync_once(nba, progress_cls, scope, state_dir, args.dsn)
+        finally:
+            nba.api_response_sinks.remove(fixtures.record)
+        fixtures.write_manifest(scope)
+        logger.info(f"✅ Recorded {fixtures.recorded.value} responses")
+        return
+
+    scope = fixtures.read_manifest()
+    runs = []
+    with nba.replaying_payloads(fixtures.replayer(latency=args.latency, jitter=args.jitter, seed=args.seed), paced=True):
+        for attempt in range(1, args.repeat + 1):
+            logger.info(f"⏱️  Benchmark run {attempt}/{args.repeat} (latency {args.latency}s)")
+            started = time.perf_counter()
+            progress = run_sync_once(nba, progress_cls, scope, state_dir, args.dsn)
+            runs.append({"wall_seconds": round(time.perf_counter() - started, 3), "stages": progress.stage_metrics})
+    rss.stop()
+    if fixtures.misses.value:
+        logger.warning(f"⚠️  {fixtures.misses.value} requests had no recorded fixture; re-record with the current code")
+
+    report = {
+        "created_at": datetime.datetime.now().isoformat(),
+        "scope": scope,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "api_rate": args.api_rate,
+        "fixture_misses": fixtures.misses.value,
+        "runs": runs,
+        "summary": summarize_runs(runs),
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(report, baseline)
+
+    output = args.output or os.path.join(BENCHMARK_REPORTS_DIR, f"benchmark-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+    logger.info(f"📄 Benchmark report written to {output}")
+    shutil.rmtree(state_dir, ignore_errors=True)
+
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark of the NBA sync with recorded API fixtures")
+    parser.add_argument("command", choices=("record", "run"),
+                        help="record fixtures from the live API, or replay them and measure")
+    parser.add_argument("--fixtures", default=BENCHMARK_FIXTURES_DIR, help="fixture directory")
+    parser.add_argument("--dsn", default=BENCHMARK_DSN, help="local PostgreSQL stand-in (tables are dropped and recreated!)")
+    parser.add_argument("--allow-remote", action="store_true", help="allow a non-local DSN")
+    parser.add_argument("--season", type=int, default=None, help="season end year to record (default the scraper's)")
+    parser.add_argument("--stages", default=None, help="comma-separated stages to record (default all)")
+    parser.add_argument("--date-from", default=None, help="first game date to record (YYYY-MM-DD)")
+    parser.add_argument("--date-to", default=None, help="last game date to record (YYYY-MM-DD)")
+    parser.add_argument("--latency", type=float, default=0.15, help="synthetic seconds per replayed API call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction (+/-)")
+    parser.add_argument("--seed", type=int, default=0, help="jitter random seed")
+    parser.add_argument("--api-rate", type=float, default=None,
+                        help="override NBA_API_RATE/NBA_API_MAX_RATE (requests/sec) to take pacing out")
+    parser.add_argument("--repeat", type=int, default=1, help="runs to take the median over")
+    parser.add_argument("--output", default=None, help=f"report path (default under {BENCHMARK_REPORTS_DIR})")
+    parser.add_argument("--compare", default=None, help="earlier report to show wall-time deltas against")
+    args = parser.parse_args()
+
+    try:
+        check_local_dsn(args.dsn, args.allow_remote)
+        benchmark(args)
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        sys.exit(1)
@@ -1,15 +1,20 @@
 """
-Flask API wrapper for NBA scraper
-ZERO CHANGES TO SCRAPING LOGIC - just wraps nba_scrape_to_postgres.py
+Flask API for the NBA scraper (nba_scrape_to_postgres.py)
+Runs syncs as background jobs with stage/date-window selection, per-stage progress
+and cancellation, drives live game polling and the columnar export, and serves
+season aggregates, table counts and Prometheus metrics from the shared pool.
 Deploy this on EC2 alongside your Java backend
 """
 
-from flask import Flask, jsonify
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 import logging
 import os
 from dotenv import load_dotenv
 import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
 
 # Load environment variables from .env file
@@ -26,8 +31,8 @@ if not os.environ.get("DB_HOST"):
     os.environ.setdefault("DB_SSLMODE", "require")
     # DB_PASSWORD must be set in environment or .env file for security
 
-# Import your EXACT existing scraper function - NO LOGIC CHANGES
-from nba_scrape_to_postgres import scrape_and_store, get_connection
+# Scraper entry points, sync job plumbing, live poller, export and aggregate queries
+from nba_scrape_to_postgres import scrape_and_store, db_pool, api_pacer, SyncProgress, SyncCancelled, parse_sync_scope, parse_profile_mode, LiveGamePoller, Metric, render_metrics, export_season, export_status, SEASON_END_YEAR, get_season_leaders, get_player_season_stats
 
 app = Flask(__name__)
 CORS(app)
@@ -38,33 +43,211 @@ logging.basicConfig(
 )
 logger = logging.getLogger("nba_api")
 
+HTTP_REQUEST_SECONDS = Metric(
+    "http_request_seconds", "histogram", "Flask request latency", ("method", "route", "status"))
+NBA_API_PACING_RATE = Metric("nba_api_pacing_rate", "gauge", "Current adaptive nba_api request rate (requests/sec)")
+NBA_API_PACING_CALLS = Metric("nba_api_pacing_calls_total", "counter", "nba_api calls seen by the pacer", ("outcome",))
+DB_POOL_CONNECTIONS = Metric("db_pool_connections", "gauge", "Connection pool size by state", ("state",))
+DB_POOL_EVENTS = Metric("db_pool_events_total", "counter", "Connection pool events", ("event",))
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        # Label by route pattern, not raw path, so job IDs don't explode the label set
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method,
+                                     route=route, status=response.status_code)
+    return response
+
+# Open the pool's minimum connections up front so the first status poll is warm
+try:
+    db_pool.warm()
+except Exception as e:
+    logger.warning(f"⚠️  Could not pre-open database connections: {e}")
+
+# Table counts only change when a sync writes, so /api/nba/status serves them from
+# memory. The cache is dropped when a sync finishes; the TTL covers writes made by
+# anything else. STATUS_COUNT_MODE=estimate reads planner row estimates instead.
+STATUS_CACHE_TTL = float(os.environ.get("STATUS_CACHE_TTL", "300"))
+STATUS_COUNT_MODE = os.environ.get("STATUS_COUNT_MODE", "exact")
+
+STATUS_TABLES = ("teams", "players", "games", "box_scores")
+
+EXACT_COUNTS_QUERY = "SELECT " + ", ".join(
+    f"(SELECT COUNT(*) FROM {table})" for table in STATUS_TABLES
+)
+
+# reltuples is -1 for tables that have never been vacuumed/analyzed
+ESTIMATED_COUNTS_QUERY = """
+    SELECT c.relname, c.reltuples::bigint
+    FROM pg_class c
+    WHERE c.oid IN (""" + ", ".join(f"'{table}'::regclass" for table in STATUS_TABLES) + """)
+"""
+
+
+class StatusCache:
+    """Cached table counts; concurrent misses share one query instead of each scanning."""
+
+    def __init__(self, ttl=STATUS_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # mode -> (counts, computed_at, monotonic timestamp)
+
+    def _query(self, mode):
+        with db_pool.connection() as conn, conn.cursor() as cur:
+            if mode == "estimate":
+                cur.execute(ESTIMATED_COUNTS_QUERY)
+                estimates = dict(cur.fetchall())
+                if all(estimates.get(table, -1) >= 0 for table in STATUS_TABLES):
+                    return {table: estimates[table] for table in STATUS_TABLES}
+                # Never analyzed yet - fall back to exact counts
+            cur.execute(EXACT_COUNTS_QUERY)
+            return dict(zip(STATUS_TABLES, cur.fetchone()))
+
+    def get(self, mode="exact"):
+        """Return (counts, computed_at, cached)."""
+        with self._lock:
+            entry = self._entries.get(mode)
+            if entry and time.monotonic() - entry[2] < self.ttl:
+                return entry[0], entry[1], True
+            counts = self._query(mode)
+            computed_at = datetime.now().isoformat()
+            self._entries[mode] = (counts, computed_at, time.monotonic())
+            return counts, computed_at, False
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+status_cache = StatusCache()
+
+# Number of finished sync jobs kept for GET /api/nba/sync/jobs
+SYNC_JOB_HISTORY = int(os.environ.get("SYNC_JOB_HISTORY", "20"))
+
 # Track sync status
 sync_status = {
     "is_running": False,
     "last_sync": None,
     "last_error": None,
-    "last_success": None
+    "last_success": None,
+    "job_id": None
 }
 
-def run_sync_background():
-    """Run sync in background thread"""
+
+class SyncJob:
+    """One background scrape_and_store run and its live SyncProgress."""
+
+    def __init__(self, options):
+        self.job_id = uuid.uuid4().hex
+        self.options = options
+        self.state = "running"
+        self.progress = SyncProgress()
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.error = None
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "options": self.options,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "progress": self.progress.snapshot()
+        }
+
+
+class JobRegistry:
+    """Sync jobs by ID; at most one runs at a time, the most recent finished ones are kept."""
+
+    def __init__(self, history=SYNC_JOB_HISTORY):
+        self.history = history
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+
+    def start(self, **options):
+        """Create and start a job, or return (None, running_job) if one is in progress."""
+        with self._lock:
+            running = next((job for job in self._jobs.values() if job.state == "running"), None)
+            if running:
+                return None, running
+            job = SyncJob(options)
+            self._jobs[job.job_id] = job
+            finished = [job_id for job_id, other in self._jobs.items() if other.state != "running"]
+            for job_id in finished[:max(0, len(finished) - self.history)]:
+                del self._jobs[job_id]
+        thread = threading.Thread(target=run_sync_background, args=(job,), daemon=True)
+        thread.start()
+        return job, None
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+
+sync_jobs = JobRegistry()
+
+# Game-night live poller (one at a time)
+live_poller = None
+live_poller_lock = threading.Lock()
+
+def run_sync_background(job):
+    """Run sync in background thread (resumes an interrupted run from its checkpoint)"""
     global sync_status
     try:
         sync_status["is_running"] = True
         sync_status["last_error"] = None
-        logger.info("🚀 Background sync started")
+        sync_status["job_id"] = job.job_id
+        logger.info(f"🚀 Background sync started (job {job.job_id})")
         
-        scrape_and_store()
+        scrape_and_store(progress=job.progress, **job.options)
         
+        job.state = "succeeded"
         sync_status["last_success"] = datetime.now().isoformat()
         logger.info("✅ Background sync completed successfully")
         
+    except SyncCancelled:
+        job.state = "cancelled"
+        sync_status["last_error"] = "cancelled"
+        logger.warning(f"🛑 Background sync cancelled (job {job.job_id})")
     except Exception as e:
+        job.state = "failed"
+        job.error = str(e)
         sync_status["last_error"] = str(e)
         logger.error(f"❌ Background sync failed: {e}")
     finally:
+        status_cache.invalidate()
+        job.finished_at = datetime.now().isoformat()
         sync_status["is_running"] = False
-        sync_status["last_sync"] = datetime.now().isoformat()
+        sync_status["last_sync"] = job.finished_at
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics: nba_api latency/retries, DB writes, stage durations, HTTP latency"""
+    pacing = api_pacer.snapshot()
+    NBA_API_PACING_RATE.set(pacing["rate"])
+    NBA_API_PACING_CALLS.set(pacing["successes"], outcome="success")
+    NBA_API_PACING_CALLS.set(pacing["throttles"], outcome="throttled")
+    pool = db_pool.stats()
+    for state in ("size", "idle", "in_use"):
+        DB_POOL_CONNECTIONS.set(pool[state], state=state)
+    for event in ("checkouts", "waits", "timeouts", "created", "discarded", "healthchecks"):
+        DB_POOL_EVENTS.set(pool[event], event=event)
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
 
 
 @app.route('/health', methods=['GET'])
@@ -78,25 +261,49 @@ def sync():
     """
     Trigger NBA data sync (runs in background)
     Your Java backend calls this: POST http://localhost:5000/api/nba/sync
+    Add ?refresh_bios=true to refetch every player bio (e.g. on trade-deadline days)
+    Optional ?stages=box_scores,players and ?date_from=/&date_to=YYYY-MM-DD limit the
+    run, e.g. a post-game refresh of last night's box scores and player aggregates
+    Add ?profile=true (or spans/cprofile/sample) to write a timing report for the run;
+    its path shows up as progress.profile_report on the job
+    Returns a job_id; follow it with GET /api/nba/sync/jobs/<job_id>
     """
-    global sync_status
-    
-    if sync_status["is_running"]:
+    try:
+        stages, date_from, date_to = parse_sync_scope(
+            request.args.get("stages"), request.args.get("date_from"), request.args.get("date_to")
+        )
+        profile = request.args.get("profile")
+        if profile is not None:
+            profile = parse_profile_mode(profile) or ""
+    except ValueError as e:
         return jsonify({
             "success": False,
-            "message": "Sync already in progress",
-            "status": sync_status
-        }), 409
+            "error": str(e)
+        }), 400
     
     try:
         # Start sync in background thread
-        thread = threading.Thread(target=run_sync_background, daemon=True)
-        thread.start()
+        refresh_bios = request.args.get("refresh_bios", "false").lower() == "true" or None
+        job, running = sync_jobs.start(
+            refresh_bios=refresh_bios,
+            stages=list(stages),
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            profile=profile
+        )
+        if running:
+            return jsonify({
+                "success": False,
+                "message": "Sync already in progress",
+                "job_id": running.job_id,
+                "status": sync_status
+            }), 409
         
-        logger.info("🚀 Sync triggered (running in background)")
+        logger.info(f"🚀 Sync triggered (running in background as job {job.job_id})")
         return jsonify({
             "success": True,
-            "message": "NBA data sync started in background. Check /api/nba/sync/status for progress.",
+            "message": f"NBA data sync started in background. Check /api/nba/sync/jobs/{job.job_id} for progress.",
+            "job_id": job.job_id,
             "status": sync_status
         }), 202  # 202 Accepted
         
@@ -113,46 +320,233 @@ def sync_status_endpoint():
     """Check sync status"""
     return jsonify({
         "success": True,
-        "status": sync_status
+        "status": sync_status,
+        "api_pacing": api_pacer.snapshot()
+    }), 200
+
+
+@app.route('/api/nba/sync/jobs', methods=['GET'])
+def sync_jobs_endpoint():
+    """List the running and recent sync jobs, newest first"""
+    return jsonify({
+        "success": True,
+        "jobs": [job.to_dict() for job in sync_jobs.list()]
+    }), 200
+
+
+@app.route('/api/nba/sync/jobs/<job_id>', methods=['GET'])
+def sync_job_endpoint(job_id):
+    """Current stage, games processed, rows written, API calls and throughput of one job"""
+    job = sync_jobs.get(job_id)
+    if not job:
+        return jsonify({"success": False, "error": f"Unknown job {job_id}"}), 404
+    return jsonify({
+        "success": True,
+        "job": job.to_dict(),
+        "api_pacing": api_pacer.snapshot()
+    }), 200
+
+
+@app.route('/api/nba/sync/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_sync_job(job_id):
+    """Stop a running job between stages/games; it resumes from its checkpoint next time"""
+    job = sync_jobs.get(job_id)
+    if not job:
+        return jsonify({"success": False, "error": f"Unknown job {job_id}"}), 404
+    if job.state != "running":
+        return jsonify({
+            "success": False,
+            "message": f"Job already {job.state}",
+            "job": job.to_dict()
+        }), 409
+    
+    job.progress.cancel()
+    logger.info(f"🛑 Cancellation requested for job {job_id}")
+    return jsonify({
+        "success": True,
+        "message": "Cancellation requested; the sync stops after the current game",
+        "job": job.to_dict()
+    }), 202
+
+
+@app.route('/api/nba/live', methods=['GET'])
+def live_status():
+    """Live polling state: running, live games, rows fetched vs. written, next poll"""
+    return jsonify({
+        "success": True,
+        "live": live_poller.snapshot() if live_poller else {"running": False}
+    }), 200
+
+
+@app.route('/api/nba/live/start', methods=['POST'])
+def start_live_polling():
+    """Start polling today's games and writing changed box score rows"""
+    global live_poller
+    with live_poller_lock:
+        if live_poller and live_poller.running:
+            return jsonify({
+                "success": False,
+                "message": "Live polling already running",
+                "live": live_poller.snapshot()
+            }), 409
+        live_poller = LiveGamePoller().start()
+    logger.info("🔴 Live polling started")
+    return jsonify({
+        "success": True,
+        "message": "Live polling started. Check /api/nba/live for progress.",
+        "live": live_poller.snapshot()
+    }), 202
+
+
+@app.route('/api/nba/live/stop', methods=['POST'])
+def stop_live_polling():
+    """Stop live polling after the current poll"""
+    with live_poller_lock:
+        if not (live_poller and live_poller.running):
+            return jsonify({
+                "success": False,
+                "message": "Live polling is not running"
+            }), 409
+        live_poller.stop()
+    return jsonify({
+        "success": True,
+        "message": "Live polling stopping",
+        "live": live_poller.snapshot()
+    }), 202
+
+
+@app.route('/api/nba/leaders', methods=['GET'])
+def leaders():
+    """
+    Season leaders from the player_season_stats aggregate table (an index scan)
+    Optional ?season=2025, ?stat=points_per_game, ?limit=10 and ?min_games=0
+    """
+    try:
+        season = int(request.args.get("season", SEASON_END_YEAR))
+        limit = min(int(request.args.get("limit", 10)), 100)
+        min_games = int(request.args.get("min_games", 0))
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "season, limit and min_games must be integers"
+        }), 400
+    stat = request.args.get("stat", "points_per_game")
+    
+    try:
+        with db_pool.connection() as conn:
+            rows = get_season_leaders(conn, season, stat=stat, limit=limit, min_games=min_games)
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+    return jsonify({
+        "success": True,
+        "season_end_year": season,
+        "stat": stat,
+        "leaders": rows
+    }), 200
+
+
+@app.route('/api/nba/players/<int:player_id>/season-stats', methods=['GET'])
+def player_season_stats(player_id):
+    """Per-season totals, per-game averages and advanced metrics of one player"""
+    try:
+        with db_pool.connection() as conn:
+            seasons = get_player_season_stats(conn, player_id)
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+    if not seasons:
+        return jsonify({"success": False, "error": f"No season stats for player {player_id}"}), 404
+    return jsonify({
+        "success": True,
+        "player_id": player_id,
+        "seasons": seasons
+    }), 200
+
+
+@app.route('/api/nba/export', methods=['POST'])
+def export():
+    """
+    Export a season's box scores (one file per game date) and player stats to
+    Parquet/Arrow files; only game dates changed since the last export are rewritten
+    Optional ?season=2025 (default current) and ?full=true to rewrite everything
+    """
+    try:
+        season = int(request.args.get("season", SEASON_END_YEAR))
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "season must be a season end year, e.g. 2025"
+        }), 400
+    full = request.args.get("full", "false").lower() == "true"
+    
+    try:
+        with db_pool.connection() as conn:
+            summary = export_season(conn, season, full=full)
+        return jsonify({
+            "success": True,
+            "export": summary
+        }), 200
+    except Exception as e:
+        logger.error(f"❌ Export failed: {e}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/nba/export', methods=['GET'])
+def export_status_endpoint():
+    """Exported partitions, rows and last export time per dataset and season"""
+    return jsonify({
+        "success": True,
+        "exports": export_status()
     }), 200
 
 
 @app.route('/api/nba/status', methods=['GET'])
 def status():
-    """Check database status"""
+    """
+    Check database status
+    Counts are cached until the next sync finishes; ?mode=estimate returns planner
+    row estimates (no table scans) and ?refresh=true forces a recount.
+    """
+    mode = request.args.get("mode", STATUS_COUNT_MODE)
+    if mode not in ("exact", "estimate"):
+        return jsonify({
+            "success": False,
+            "error": f"Unknown mode '{mode}' (expected 'exact' or 'estimate')"
+        }), 400
+    
     try:
-        conn = get_connection()
-        
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM teams")
-            teams = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM players")
-            players = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM games")
-            games = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM box_scores")
-            box_scores = cur.fetchone()[0]
-        
-        conn.close()
+        if request.args.get("refresh", "false").lower() == "true":
+            status_cache.invalidate()
+        counts, computed_at, cached = status_cache.get(mode)
         
         return jsonify({
             "success": True,
-            "data": {
-                "teams": teams,
-                "players": players,
-                "games": games,
-                "box_scores": box_scores
-            },
-            "needs_sync": teams == 0
+            "data": counts,
+            "needs_sync": counts["teams"] == 0,
+            "count_mode": mode,
+            "cached": cached,
+            "computed_at": computed_at,
+            "db_pool": db_pool.stats()
         }), 200
         
     except Exception as e:
         return jsonify({
             "success": False,
-            "error": str(e)
+            "error": str(e),
+            "db_pool": db_pool.stats()
         }), 500
 
 
@@ -1,11 +1,38 @@
+import argparse
+import cProfile
+import contextvars
+import functools
+import pstats
+import sys
 import time
+import csv
 import datetime
+import gzip
+import hashlib
+import io
+import json
 import logging
+import multiprocessing
+import sqlite3
+import threading
+from contextlib import contextmanager
+from zoneinfo import ZoneInfo
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import psycopg2
-from psycopg2.extras import execute_batch
+import psycopg2.pool
+from psycopg2.extensions import quote_ident
+from psycopg2.extras import execute_batch, execute_values
+import numpy as np
 import pandas as pd
-from nba_api.stats.endpoints import leaguestandings, playergamelog, leaguegamefinder, commonplayerinfo, leaguedashplayerstats, commonteamroster, boxscoretraditionalv2
+import requests
+from nba_api.stats.endpoints import leaguestandings, leaguegamelog, leaguegamefinder, commonplayerinfo, leaguedashplayerstats, commonteamroster, boxscoretraditionalv2, scoreboardv2
 from nba_api.stats.static import teams, players
+from nba_api.stats.library.http import NBAStatsResponse
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # only needed for the columnar export
+    pa = pq = None
 
 # ----------------------------------------------------------------------
 # CONFIGURATION
@@ -20,6 +47,99 @@ DB_HOST = os.environ.get("DB_HOST", "db.hbsdjlaogfdcjlghjuct.supabase.co")
 DB_PORT = os.environ.get("DB_PORT", "5432")
 DB_SSLMODE = os.environ.get("DB_SSLMODE", "require")  # Supabase requires SSL
 
+# Connection pool shared by the Flask handlers and the background sync. Idle
+# connections older than DB_POOL_HEALTHCHECK_IDLE seconds are pinged before reuse.
+DB_POOL_MIN = int(os.environ.get("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.environ.get("DB_POOL_MAX", "5"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+DB_POOL_HEALTHCHECK_IDLE = float(os.environ.get("DB_POOL_HEALTHCHECK_IDLE", "30"))
+
+# Box score ingestion: "season" pulls every player-game row with one LeagueGameLog
+# request (plus two LeagueDashPlayerStats requests for starter status) and only falls
+# back to per-game BoxScoreTraditionalV2 calls for games the log is missing;
+# "per_game" always uses one BoxScoreTraditionalV2 call per game.
+BOX_SCORE_MODE = os.environ.get("BOX_SCORE_MODE", "season")
+
+# nba_api request pacing - every call goes through one shared token bucket, so the
+# worker count only bounds how many requests are in flight at the same time.
+NBA_API_WORKERS = int(os.environ.get("NBA_API_WORKERS", "4"))
+NBA_API_RATE = float(os.environ.get("NBA_API_RATE", "1.5"))  # starting requests per second
+NBA_API_BURST = int(os.environ.get("NBA_API_BURST", "3"))
+NBA_API_TIMEOUT = 120
+
+# Adaptive (AIMD) pacing: the rate grows by NBA_API_RATE_STEP after every successful
+# call and is multiplied by NBA_API_BACKOFF_FACTOR on throttling, timeouts or resets.
+NBA_API_MIN_RATE = float(os.environ.get("NBA_API_MIN_RATE", "0.25"))
+NBA_API_MAX_RATE = float(os.environ.get("NBA_API_MAX_RATE", "4.0"))
+NBA_API_RATE_STEP = float(os.environ.get("NBA_API_RATE_STEP", "0.05"))
+NBA_API_BACKOFF_FACTOR = float(os.environ.get("NBA_API_BACKOFF_FACTOR", "0.5"))
+NBA_API_MAX_ATTEMPTS = int(os.environ.get("NBA_API_MAX_ATTEMPTS", "3"))
+
+# Multi-season backfill: seasons run in this many worker processes, all drawing
+# from one shared NBA API rate budget (the NBA_API_* pacing settings above).
+BACKFILL_WORKERS = int(os.environ.get("BACKFILL_WORKERS", "3"))
+
+# Live game-night polling (seconds between polls): while games are live, in the last
+# LIVE_POLL_CLUTCH_SECONDS of the 4th quarter/OT, and when no game is live. Finished
+# games get LIVE_POLL_FINAL_POLLS more polls to pick up stat corrections.
+LIVE_POLL_INTERVAL = float(os.environ.get("LIVE_POLL_INTERVAL", "60"))
+LIVE_POLL_CLUTCH_INTERVAL = float(os.environ.get("LIVE_POLL_CLUTCH_INTERVAL", "20"))
+LIVE_POLL_IDLE_INTERVAL = float(os.environ.get("LIVE_POLL_IDLE_INTERVAL", "600"))
+LIVE_POLL_CLUTCH_SECONDS = float(os.environ.get("LIVE_POLL_CLUTCH_SECONDS", "300"))
+LIVE_POLL_FINAL_POLLS = int(os.environ.get("LIVE_POLL_FINAL_POLLS", "2"))
+
+# Incremental sync: only fetch box scores for games that have none stored yet or are
+# newer than the last synced game_date. Set to "false" to refetch the whole season.
+INCREMENTAL_SYNC = os.environ.get("INCREMENTAL_SYNC", "true").lower() == "true"
+
+# Starter status: a player is a starter when they started >= 70% of their last
+# STARTER_STATUS_GAMES games (the LastNGames filter in BOX_SCORE_MODE=season)
+STARTER_STATUS_GAMES = int(os.environ.get("STARTER_STATUS_GAMES", "50"))
+
+# Tables written with COPY into a temporary staging table plus one set-based merge
+# instead of execute_batch upserts. Comma-separated subset of: teams, players,
+# games, box_scores. Set to an empty string to use execute_batch everywhere.
+COPY_LOAD_TABLES = {
+    table.strip() for table in os.environ.get("COPY_LOAD_TABLES", "teams,players,games,box_scores").split(",")
+    if table.strip()
+}
+
+# Local state kept between runs (checkpoint journal)
+SYNC_STATE_DIR = os.environ.get("SYNC_STATE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sync_state"))
+CHECKPOINT_PATH = os.path.join(SYNC_STATE_DIR, "sync_checkpoint.sqlite3")
+
+# Player bio cache (position, height, weight, age, jersey number) keyed by NBA player
+# ID. Per-field TTLs in days; a player is refetched once any field is older than its
+# TTL. PLAYER_BIO_REFRESH=true ignores the cache (e.g. on trade-deadline days).
+PLAYER_BIO_CACHE_PATH = os.path.join(SYNC_STATE_DIR, "player_bio_cache.sqlite3")
+PLAYER_BIO_TTLS = {
+    field.strip(): float(days) for field, days in (
+        entry.split("=") for entry in os.environ.get(
+            "PLAYER_BIO_TTLS", "position=30,height=30,weight=7,age=7,jersey_number=3"
+        ).split(",") if entry.strip()
+    )
+}
+PLAYER_BIO_REFRESH = os.environ.get("PLAYER_BIO_REFRESH", "false").lower() == "true"
+
+# Opt-in run profiling: "spans" times each stage and fetch/insert helper, "cprofile"
+# adds cProfile over the sync thread, "sample" adds a wall-clock stack sampler over
+# all threads (flamegraph-ready folded stacks). Reports go to SYNC_STATE_DIR/profiles.
+SYNC_PROFILE = os.environ.get("SYNC_PROFILE", "").lower()
+PROFILE_DIR = os.path.join(SYNC_STATE_DIR, "profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", "0.01"))
+
+# Archive of every raw nba_api response (gzip, content-addressed) for offline rebuilds
+PAYLOAD_ARCHIVE = os.environ.get("PAYLOAD_ARCHIVE", "true").lower() == "true"
+PAYLOAD_ARCHIVE_DIR = os.environ.get("PAYLOAD_ARCHIVE_DIR", os.path.join(SYNC_STATE_DIR, "payload_archive"))
+
+# Columnar export of box scores (one file per game date) and player season stats:
+# "parquet" (compressed) and/or "arrow" (uncompressed IPC, memory-mappable zero-copy).
+# EXPORT_AFTER_SYNC=true exports the changed game dates at the end of every sync.
+EXPORT_DIR = os.environ.get("EXPORT_DIR", os.path.join(SYNC_STATE_DIR, "export"))
+EXPORT_FORMATS = tuple(fmt.strip() for fmt in os.environ.get("EXPORT_FORMATS", "parquet,arrow").split(",") if fmt.strip())
+EXPORT_PARQUET_COMPRESSION = os.environ.get("EXPORT_PARQUET_COMPRESSION", "zstd")
+EXPORT_AFTER_SYNC = os.environ.get("EXPORT_AFTER_SYNC", "false").lower() == "true"
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("nba_scraper")
 
@@ -70,6 +190,878 @@ def get_connection():
         logger.error(f"Connection details: host={DB_HOST}, port={DB_PORT}, dbname={DB_NAME}, user={DB_USER}, sslmode={DB_SSLMODE}")
         raise
 
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections. Callers block up to `timeout` seconds
+    when all `max_size` connections are checked out; idle connections are reused
+    LIFO and pinged first when they have been idle for `healthcheck_idle` seconds.
+    """
+
+    def __init__(self, min_size=DB_POOL_MIN, max_size=DB_POOL_MAX, timeout=DB_POOL_TIMEOUT,
+                 healthcheck_idle=DB_POOL_HEALTHCHECK_IDLE, connect=get_connection):
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.healthcheck_idle = healthcheck_idle
+        self._connect = connect
+        self._idle = []  # (connection, returned_at) pairs, most recently returned last
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {"checkouts": 0, "waits": 0, "timeouts": 0, "created": 0, "discarded": 0, "healthchecks": 0}
+
+    def _open(self):
+        conn = self._connect()
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn, idle_for):
+        if conn.closed:
+            return False
+        if idle_for < self.healthcheck_idle:
+            return True
+        with self._cond:
+            self._stats["healthchecks"] += 1
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def warm(self):
+        """Open connections up to min_size."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            self.putconn(conn)
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise psycopg2.pool.PoolError("connection pool is closed")
+                waited = False
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise psycopg2.pool.PoolError(
+                            f"no database connection available within {self.timeout:g}s "
+                            f"(pool max {self.max_size})"
+                        )
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                else:
+                    conn, returned_at = None, None
+                    self._size += 1
+                self._stats["checkouts"] += 1
+
+            if conn is None:
+                try:
+                    return self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._stats["checkouts"] -= 1
+                        self._cond.notify()
+                    raise
+            if self._is_healthy(conn, time.monotonic() - returned_at):
+                return conn
+            logger.warning("♻️  Discarding stale pooled database connection")
+            with self._cond:
+                self._stats["checkouts"] -= 1
+            self._discard(conn)
+
+    def putconn(self, conn):
+        """Return a connection; open transactions are rolled back, broken ones dropped."""
+        if not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                pass
+        if conn.closed or self._closed:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                **self._stats,
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+# Process-wide pool; connections are opened lazily on first checkout
+db_pool = ConnectionPool()
+
+# ----------------------------------------------------------------------
+# METRICS (Prometheus text exposition)
+# ----------------------------------------------------------------------
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+class Metric:
+    """
+    Minimal thread-safe Prometheus counter, gauge or histogram with labels, rendered
+    by render_metrics() for the Flask /metrics endpoint.
+    """
+
+    def __init__(self, name, kind, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # label values -> float, or [bucket counts, sum, count] for histograms
+        self._lock = threading.Lock()
+        METRICS[name] = self
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    @staticmethod
+    def _format_labels(names, values):
+        if not names:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+        return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            for key, value in items:
+                if self.kind != "histogram":
+                    lines.append(f"{self.name}{self._format_labels(self.labelnames, key)} {value}")
+                    continue
+                bucket_counts, total, count = value
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    labels = self._format_labels(self.labelnames + ("le",), key + (repr(float(bound)),))
+                    lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+                labels = self._format_labels(self.labelnames + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{self._format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{self._format_labels(self.labelnames, key)} {count}")
+        return lines
+
+METRICS = {}
+
+def render_metrics():
+    """All registered metrics in Prometheus text format."""
+    return "\n".join(line for metric in METRICS.values() for line in metric.render()) + "\n"
+
+NBA_API_REQUEST_SECONDS = Metric(
+    "nba_api_request_seconds", "histogram", "nba_api request latency per endpoint class and outcome",
+    ("endpoint", "outcome"))
+NBA_API_RETRIES = Metric("nba_api_retries_total", "counter", "nba_api requests retried after throttling", ("endpoint",))
+NBA_API_FAILURES = Metric(
+    "nba_api_failures_total", "counter", "nba_api requests that failed after all attempts", ("endpoint", "reason"))
+DB_STATEMENT_SECONDS = Metric("db_statement_seconds", "histogram", "Database write latency per insert helper", ("helper",))
+ROWS_UPSERTED = Metric("rows_upserted_total", "counter", "Rows upserted per table", ("table",))
+SYNC_STAGE_SECONDS = Metric(
+    "sync_stage_seconds", "histogram", "scrape_and_store stage durations", ("stage", "status"),
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200))
+
+# ----------------------------------------------------------------------
+# RUN PROFILING
+# ----------------------------------------------------------------------
+PROFILE_MODES = ("spans", "cprofile", "sample")
+
+class RunProfiler:
+    """
+    Timing spans for one sync run, aggregated per name (calls, total, self and max
+    seconds; self excludes nested spans on the same thread), optionally with
+    cProfile over the calling thread or a stack sampler over every thread.
+    """
+
+    def __init__(self, mode="spans", sample_interval=None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.sample_interval = sample_interval or PROFILE_SAMPLE_INTERVAL
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._spans = {}  # name -> [calls, total, self, max]
+        self._samples = {}  # folded stack -> count
+        self._cprofile = None
+        self._sampler = None
+        self._stop = threading.Event()
+        self.started_at = None
+        self.elapsed = None
+
+    @contextmanager
+    def span(self, name):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # time spent in nested spans
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            child_time = stack.pop()
+            if stack:
+                stack[-1] += duration
+            with self._lock:
+                entry = self._spans.setdefault(name, [0, 0.0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += duration
+                entry[2] += duration - child_time
+                entry[3] = max(entry[3], duration)
+
+    def _sample_loop(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                folded = ";".join(reversed(stack))
+                with self._lock:
+                    self._samples[folded] = self._samples.get(folded, 0) + 1
+
+    def start(self):
+        global active_profiler
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        if self.mode == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.mode == "sample":
+            self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+            self._sampler.start()
+        active_profiler = self
+        return self
+
+    def stop(self):
+        global active_profiler
+        if active_profiler is self:
+            active_profiler = None
+        self.elapsed = time.perf_counter() - self._started
+        if self._cprofile:
+            self._cprofile.disable()
+        if self._sampler:
+            self._stop.set()
+            self._sampler.join()
+
+    def write_report(self, label, extra=None, directory=None):
+        """Write <label>.json (plus .pstats or .folded) and return the JSON path."""
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, label)
+        with self._lock:
+            spans = sorted(self._spans.items(), key=lambda item: item[1][2], reverse=True)
+            report = {
+                "label": label,
+                "mode": self.mode,
+                "started_at": datetime.datetime.fromtimestamp(self.started_at).isoformat(),
+                "elapsed_seconds": round(self.elapsed or 0, 3),
+                "spans": [
+                    {"name": name, "calls": calls, "total_seconds": round(total, 4),
+                     "self_seconds": round(self_time, 4), "max_seconds": round(longest, 4)}
+                    for name, (calls, total, self_time, longest) in spans
+                ],
+                **(extra or {}),
+            }
+            samples = dict(self._samples)
+        if self._cprofile:
+            self._cprofile.dump_stats(base + ".pstats")
+            stats = pstats.Stats(base + ".pstats")
+            top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:50]
+            report["cprofile_top"] = [
+                {"function": f"{func[2]} ({os.path.basename(func[0])}:{func[1]})", "calls": calls,
+                 "self_seconds": round(self_time, 4), "cumulative_seconds": round(cumulative, 4)}
+                for func, (_, calls, self_time, cumulative, _) in top
+            ]
+            report["cprofile_file"] = base + ".pstats"
+        if samples:
+            with open(base + ".folded", "w") as folded_file:
+                for stack, count in sorted(samples.items(), key=lambda item: item[1], reverse=True):
+                    folded_file.write(f"{stack} {count}\n")
+            report["samples"] = sum(samples.values())
+            report["folded_stacks_file"] = base + ".folded"
+        with open(base + ".json", "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        return base + ".json"
+
+# The profiler of the sync running in this process, if any
+active_profiler = None
+
+def parse_profile_mode(value):
+    """Normalize a profile flag from env, CLI or API: off -> None, true -> "spans", else a PROFILE_MODES entry."""
+    value = str(value or "").strip().lower()
+    if value in ("", "0", "false", "no", "off", "none"):
+        return None
+    if value in ("1", "true", "yes", "on"):
+        return "spans"
+    if value not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode {value!r}; expected true/false or one of {', '.join(PROFILE_MODES)}")
+    return value
+
+@contextmanager
+def profile_span(name):
+    """Timing span under the active profiler; a no-op when profiling is off."""
+    profiler = active_profiler
+    if profiler is None:
+        yield
+        return
+    with profiler.span(name):
+        yield
+
+def profiled(func):
+    """Wrap a fetch/insert helper in a profile span named after it."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if active_profiler is None:
+            return func(*args, **kwargs)
+        with active_profiler.span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+# ----------------------------------------------------------------------
+# NBA API RATE LIMITING
+# ----------------------------------------------------------------------
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens/sec up to `burst` tokens.
+    The AIMD adjustments (increase_rate/decrease_rate) and the time of the last cut
+    live here too, so every pacer sharing the bucket sees one rate and one cooldown.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._last_cut = float("-inf")
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+    def set_rate(self, rate, drain=False):
+        """Change the refill rate; drain=True also empties the bucket so queued callers wait."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if drain:
+                self._tokens = 0.0
+
+    def increase_rate(self, step, max_rate):
+        """Additive increase: raise the rate by step, up to max_rate. Returns the new rate."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(max_rate, self.rate + step)
+            return self.rate
+
+    def decrease_rate(self, factor, min_rate, cooldown):
+        """
+        Multiplicative decrease: scale the rate by factor (down to min_rate) and drain
+        the bucket, unless the rate was already cut in the last cooldown seconds.
+        Returns the new rate, or None when the cut was skipped.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_cut < cooldown:
+                return None
+            self._last_cut = now
+            self._refill(now)
+            self.rate = max(min_rate, self.rate * factor)
+            self._tokens = 0.0
+            return self.rate
+
+class SharedTokenBucket(TokenBucket):
+    """
+    TokenBucket whose state lives in shared memory behind a process-shared lock, so
+    every backfill worker process draws from (and throttles) one global budget.
+    """
+
+    def __init__(self, rate, burst, context=None):
+        context = context or multiprocessing.get_context()
+        self.burst = burst
+        self._shared_rate = context.RawValue('d', rate)
+        self._shared_tokens = context.RawValue('d', float(burst))
+        # CLOCK_MONOTONIC is system-wide, so timestamps compare across processes
+        self._shared_updated = context.RawValue('d', time.monotonic())
+        self._shared_last_cut = context.RawValue('d', float("-inf"))
+        self._lock = context.Lock()
+
+    @property
+    def rate(self):
+        return self._shared_rate.value
+
+    @rate.setter
+    def rate(self, value):
+        self._shared_rate.value = value
+
+    @property
+    def _tokens(self):
+        return self._shared_tokens.value
+
+    @_tokens.setter
+    def _tokens(self, value):
+        self._shared_tokens.value = value
+
+    @property
+    def _updated(self):
+        return self._shared_updated.value
+
+    @_updated.setter
+    def _updated(self, value):
+        self._shared_updated.value = value
+
+    @property
+    def _last_cut(self):
+        return self._shared_last_cut.value
+
+    @_last_cut.setter
+    def _last_cut(self, value):
+        self._shared_last_cut.value = value
+
+class AdaptivePacer:
+    """
+    AIMD controller for a TokenBucket. Each successful call raises the rate by `step`
+    up to `max_rate`; a throttling signal multiplies it by `factor` down to `min_rate`.
+    Cuts are applied at most once per `cooldown` seconds so a burst of concurrent
+    failures from the same incident only halves the rate once. Rate and cooldown are
+    kept in the bucket and updated under its lock, so with a SharedTokenBucket the
+    pacers of all backfill workers act as one. The call counters are per process.
+    """
+
+    def __init__(self, bucket, min_rate, max_rate, step, factor, cooldown=2.0):
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.factor = factor
+        self.cooldown = cooldown
+        self.successes = 0
+        self.throttles = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current_rate(self):
+        return self.bucket.rate
+
+    def on_success(self):
+        with self._lock:
+            self.successes += 1
+        self.bucket.increase_rate(self.step, self.max_rate)
+
+    def on_throttle(self):
+        with self._lock:
+            self.throttles += 1
+        new_rate = self.bucket.decrease_rate(self.factor, self.min_rate, self.cooldown)
+        if new_rate is not None:
+            logger.warning(f"NBA API throttling detected, request rate reduced to {new_rate:.2f}/s")
+
+    def snapshot(self):
+        """Current pacing state, for status reporting."""
+        with self._lock:
+            return {
+                "rate": round(self.bucket.rate, 3),
+                "successes": self.successes,
+                "throttles": self.throttles,
+            }
+
+def make_pacer(bucket):
+    return AdaptivePacer(
+        bucket,
+        min_rate=NBA_API_MIN_RATE,
+        max_rate=NBA_API_MAX_RATE,
+        step=NBA_API_RATE_STEP,
+        factor=NBA_API_BACKOFF_FACTOR
+    )
+
+api_rate_limiter = TokenBucket(NBA_API_RATE, NBA_API_BURST)
+api_pacer = make_pacer(api_rate_limiter)
+
+def is_throttling_error(error, endpoint=None):
+    """True if a failed request means the upstream is overloaded (429/5xx, timeout or reset)."""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError, ConnectionError, TimeoutError)):
+        return True
+    # nba_api only fails while parsing the body, so check the HTTP status it recorded
+    response = getattr(endpoint, 'nba_response', None)
+    status_code = getattr(response, '_status_code', None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+# Replay hook: when set, fn(endpoint) returns the raw JSON text to load instead of
+# calling the NBA stats API (offline benchmarks, archive rebuilds); it raises if it
+# has no payload. Replayed requests still go through the pacer unless api_replay_paced is off.
+api_response_source = None
+api_replay_paced = True
+# Recording hooks: each fn(endpoint) is called after a live response has loaded
+api_response_sinks = []
+# SyncProgress of the run whose requests are being made; fetch_concurrently carries it
+# onto its worker threads, so requests from other threads (live poller) are not counted
+current_sync_progress = contextvars.ContextVar("current_sync_progress", default=None)
+
+def api_payload_key(endpoint):
+    """Stable key of an nba_api request: sha256 of the endpoint name and its sorted parameters."""
+    params = json.dumps(endpoint.parameters, sort_keys=True, default=str)
+    return hashlib.sha256(f"{endpoint.endpoint}?{params}".encode()).hexdigest()
+
+def send_endpoint_request(endpoint):
+    """endpoint.get_request(), or load the payload from api_response_source when one is set."""
+    source = api_response_source
+    if source is not None:
+        endpoint.nba_response = NBAStatsResponse(response=source(endpoint), status_code=200, url=None)
+        endpoint.load_response()
+        return
+    endpoint.get_request()
+    for sink in api_response_sinks:
+        try:
+            sink(endpoint)
+        except Exception as e:
+            # Recording is best effort; never fail a fetch that succeeded
+            logger.warning(f"Could not record {endpoint.endpoint} response: {e}")
+
+@contextmanager
+def replaying_payloads(source, paced=False):
+    """Serve every nba_api request from source(endpoint) inside the block."""
+    global api_response_source, api_replay_paced
+    saved = api_response_source, api_replay_paced
+    api_response_source, api_replay_paced = source, paced
+    try:
+        yield
+    finally:
+        api_response_source, api_replay_paced = saved
+
+def nba_api_request(endpoint_cls, max_attempts=None, **params):
+    """
+    Call an nba_api endpoint under the shared adaptive pacer.
+    Throttling failures slow the whole module down and are retried up to
+    max_attempts times; any other error is raised immediately.
+    """
+    max_attempts = max_attempts or NBA_API_MAX_ATTEMPTS
+    endpoint_name = endpoint_cls.__name__
+    for attempt in range(1, max_attempts + 1):
+        if api_response_source is None or api_replay_paced:
+            with profile_span("nba_api.rate_limit_wait"):
+                api_rate_limiter.acquire()
+        endpoint = endpoint_cls(timeout=NBA_API_TIMEOUT, get_request=False, **params)
+        progress = current_sync_progress.get()
+        if progress is not None:
+            progress.count_api_call()
+        started = time.perf_counter()
+        try:
+            with profile_span(f"nba_api.request.{endpoint_name}"):
+                send_endpoint_request(endpoint)
+        except Exception as e:
+            throttled = is_throttling_error(e, endpoint)
+            NBA_API_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint_name,
+                                            outcome="throttled" if throttled else "error")
+            if not throttled:
+                NBA_API_FAILURES.inc(endpoint=endpoint_name, reason="error")
+                raise
+            api_pacer.on_throttle()
+            if attempt == max_attempts:
+                NBA_API_FAILURES.inc(endpoint=endpoint_name, reason="throttled")
+                raise
+            NBA_API_RETRIES.inc(endpoint=endpoint_name)
+            logger.warning(f"{endpoint_name} attempt {attempt}/{max_attempts} throttled: {e}")
+            continue
+        NBA_API_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint_name, outcome="success")
+        api_pacer.on_success()
+        if active_profiler is not None:
+            # DataFrame construction happens later in the caller; time it separately
+            get_data_frames = endpoint.get_data_frames
+
+            def profiled_get_data_frames():
+                with profile_span(f"nba_api.get_data_frames.{endpoint_name}"):
+                    return get_data_frames()
+            endpoint.get_data_frames = profiled_get_data_frames
+        return endpoint
+
+def fetch_concurrently(fetch_fn, items, max_workers=None):
+    """
+    Run fetch_fn(item) for every item on a worker pool.
+    Yields (item, result, error) tuples in completion order; error is None on success.
+    Closing the generator early cancels any fetches that have not started yet.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers or NBA_API_WORKERS)
+    try:
+        # Each fetch runs in a copy of the caller's context (see current_sync_progress)
+        futures = {executor.submit(contextvars.copy_context().run, fetch_fn, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                yield item, None, e
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+# ----------------------------------------------------------------------
+# PAYLOAD ARCHIVE
+# ----------------------------------------------------------------------
+# Request parameters holding a game-date window (MM/DD/YYYY)
+PAYLOAD_WINDOW_PARAMETERS = ("DateFrom", "DateTo")
+
+class PayloadArchive:
+    """
+    Compressed, content-addressed archive of raw nba_api responses. Each distinct
+    payload is stored once under blobs/ by its sha256; a SQLite index maps every
+    request (api_payload_key of endpoint + parameters) to the latest payload it
+    returned. Blobs no longer referenced by any request are removed.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or PAYLOAD_ARCHIVE_DIR
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _index(self):
+        # Opened on first use so importing the module never touches the disk
+        if self._db is None:
+            os.makedirs(os.path.join(self.directory, "blobs"), exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), timeout=30,
+                                       check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS payloads (
+                    request_key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    parameters TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS payloads_content_hash ON payloads (content_hash)")
+        return self._db
+
+    def blob_path(self, content_hash):
+        return os.path.join(self.directory, "blobs", content_hash[:2], f"{content_hash}.json.gz")
+
+    def store(self, endpoint):
+        """Archive a loaded endpoint's response (an api_response_sinks hook)."""
+        text = endpoint.nba_response.get_response()
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self.blob_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as blob:
+                blob.write(text)
+            os.replace(tmp_path, path)
+        key = api_payload_key(endpoint)
+        with self._lock:
+            db = self._index()
+            with db:
+                previous = db.execute("SELECT content_hash FROM payloads WHERE request_key = ?", (key,)).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO payloads (request_key, endpoint, parameters, content_hash, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, endpoint.endpoint, json.dumps(endpoint.parameters, sort_keys=True, default=str),
+                     content_hash, time.time())
+                )
+                orphaned = previous and previous[0] != content_hash and db.execute(
+                    "SELECT 1 FROM payloads WHERE content_hash = ? LIMIT 1", (previous[0],)
+                ).fetchone() is None
+        if orphaned:
+            # e.g. a live box score superseded by the final one
+            try:
+                os.remove(self.blob_path(previous[0]))
+            except FileNotFoundError:
+                pass
+
+    def _read_blob(self, content_hash):
+        with gzip.open(self.blob_path(content_hash), "rt", encoding="utf-8") as blob:
+            return blob.read()
+
+    def load(self, endpoint, merge_windows=False):
+        """
+        Raw JSON text archived for this request (an api_response_source); LookupError if none.
+        With merge_windows, a date-windowed request that was never archived as such is
+        answered from the archived windows of the same request (see merge_windows).
+        """
+        with self._lock:
+            row = self._index().execute(
+                "SELECT content_hash FROM payloads WHERE request_key = ?", (api_payload_key(endpoint),)
+            ).fetchone()
+        if row is not None:
+            return self._read_blob(row[0])
+        merged = self.merge_windows(endpoint) if merge_windows else None
+        if merged is None:
+            with self._lock:
+                self.misses += 1
+            raise LookupError(f"No archived payload for {endpoint.endpoint} {endpoint.parameters}")
+        return merged
+
+    def merge_windows(self, endpoint):
+        """
+        Rebuild a DateFrom/DateTo request from every archived request that differs from it
+        only in its window: incremental syncs ask LeagueGameLog for just the new games'
+        dates, so a season is archived as a series of windows, never as the one window a
+        rebuild asks for. Rows are filtered to the requested window and each game's rows
+        come from the latest payload that has the game. None if nothing can be merged.
+        """
+        if not any(name in endpoint.parameters for name in PAYLOAD_WINDOW_PARAMETERS):
+            return None
+
+        def without_window(parameters):
+            return json.dumps({name: value for name, value in parameters.items() if name not in PAYLOAD_WINDOW_PARAMETERS},
+                              sort_keys=True, default=str)
+
+        def parse_window_date(value):
+            return datetime.datetime.strptime(value, "%m/%d/%Y").date() if value else None
+
+        request = without_window(endpoint.parameters)
+        date_from, date_to = (parse_window_date(endpoint.parameters.get(name)) for name in PAYLOAD_WINDOW_PARAMETERS)
+        with self._lock:
+            archived = self._index().execute(
+                "SELECT parameters, content_hash FROM payloads WHERE endpoint = ? ORDER BY fetched_at",
+                (endpoint.endpoint,)
+            ).fetchall()
+        merged = None
+        rows_by_game = {}
+        for parameters, content_hash in archived:
+            if without_window(json.loads(parameters)) != request:
+                continue
+            payload = json.loads(self._read_blob(content_hash))
+            result_sets = payload.get("resultSets")
+            if not isinstance(result_sets, list) or not result_sets:
+                return None
+            headers = result_sets[0]["headers"]
+            if "GAME_ID" not in headers or "GAME_DATE" not in headers:
+                return None
+            game_column, date_column = headers.index("GAME_ID"), headers.index("GAME_DATE")
+            payload_rows = {}
+            for row in result_sets[0]["rowSet"]:
+                game_date = datetime.date.fromisoformat(str(row[date_column])[:10])
+                if (date_from and game_date < date_from) or (date_to and game_date > date_to):
+                    continue
+                payload_rows.setdefault(row[game_column], []).append(row)
+            rows_by_game.update(payload_rows)
+            merged = payload
+        if merged is None:
+            return None
+        merged["resultSets"][0]["rowSet"] = [row for rows in rows_by_game.values() for row in rows]
+        logger.debug(f"Merged archived {endpoint.endpoint} windows into {len(rows_by_game)} games")
+        return json.dumps(merged)
+
+    def seasons(self):
+        """Season end years that have archived requests (from their Season parameters)."""
+        with self._lock:
+            rows = self._index().execute("SELECT DISTINCT parameters FROM payloads").fetchall()
+        seasons = set()
+        for (parameters,) in rows:
+            parameters = json.loads(parameters)
+            for name in ("Season", "SeasonNullable"):
+                season = str(parameters.get(name) or "")
+                if len(season) == 7 and season[4] == "-":
+                    seasons.add(int(season[:4]) + 1)
+        return sorted(seasons)
+
+    def stats(self):
+        with self._lock:
+            requests_count, blobs_count = self._index().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT content_hash) FROM payloads"
+            ).fetchone()
+        return {"requests": requests_count, "payloads": blobs_count}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+payload_archive = PayloadArchive() if PAYLOAD_ARCHIVE else None
+if payload_archive:
+    api_response_sinks.append(payload_archive.store)
+
 # ----------------------------------------------------------------------
 # VALIDATION HELPERS
 # ----------------------------------------------------------------------
@@ -91,6 +1083,18 @@ def safe_int(value):
     except (ValueError, TypeError):
         return None
 
+def format_minutes(value):
+    """Format a decimal minutes value as MM:SS to match BoxScoreTraditionalV2's MIN column."""
+    minutes = safe_float(value)
+    if minutes is None:
+        return None
+    whole = int(minutes)
+    seconds = int(round((minutes - whole) * 60))
+    if seconds == 60:
+        whole += 1
+        seconds = 0
+    return f"{whole}:{seconds:02d}"
+
 def normalize_position(position):
     """Normalize position names to standard format: C, F, G, F-C, G-F"""
     if not position or pd.isna(position):
@@ -167,14 +1171,71 @@ def calculate_advanced_metrics(row):
         'player_efficiency_rating': round(per, 2) if per else None,
     }
 
+def numeric_column(df, column):
+    """Whole-column safe_float: numeric values, NaN where missing or unparsable."""
+    if column not in df:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[column], errors='coerce')
+
+def int_column(values):
+    """Whole-column safe_int: truncated nullable Int64 values, <NA> where missing."""
+    return pd.Series(np.trunc(pd.to_numeric(values, errors='coerce')), index=values.index).astype('Int64')
+
+def calculate_advanced_metrics_columns(df):
+    """
+    Columnar calculate_advanced_metrics: the same seven metrics, defaults and rounding,
+    computed for every row of a stats DataFrame at once. Returns a DataFrame keyed
+    like calculate_advanced_metrics' dict, with NaN where the scalar version gives None.
+    """
+    def stat(column, default, integer=False):
+        # Same as `safe_float(value) or default`: missing and zero both fall back
+        values = numeric_column(df, column)
+        if integer:
+            values = np.trunc(values)
+        return values.where(values.notna() & (values != 0), default)
+
+    pts = stat('PTS', 0)
+    reb = stat('REB', 0)
+    ast = stat('AST', 0)
+    stl = stat('STL', 0)
+    blk = stat('BLK', 0)
+    tov = stat('TOV', 0.1)  # Avoid division by zero
+
+    fgm = stat('FGM', 0)
+    fga = stat('FGA', 1)  # Avoid division by zero
+    fg3m = stat('FG3M', 0)
+    ftm = stat('FTM', 0)
+    fta = stat('FTA', 0)
+
+    gp = stat('GP', 1, integer=True)  # Avoid division by zero
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics = pd.DataFrame({
+            'true_shooting_percentage': np.where(fga + fta > 0, pts / (2 * (fga + 0.44 * fta)), 0),
+            'effective_field_goal_percentage': np.where(fga > 0, (fgm + 0.5 * fg3m) / fga, 0),
+            'assist_to_turnover_ratio': np.where(tov > 0.1, ast / tov, ast),
+            'efficiency_rating': np.where(gp > 0, (pts + reb + ast + stl + blk - tov) / gp, 0),
+            'impact_score': pts + reb + ast + (stl * 2) + (blk * 2) - tov,
+            'usage_rate': np.where(gp > 0, (fga + 0.44 * fta + tov) / gp, 0),
+            'player_efficiency_rating': np.where(gp > 0, (pts + reb + ast + stl + blk - (fga - fgm) - (fta - ftm) - tov) / gp, 0),
+        }, index=df.index)
+
+    digits = {'true_shooting_percentage': 4, 'effective_field_goal_percentage': 4}
+    for column in metrics.columns:
+        # Python's round (not np.round) so ties land exactly where calculate_advanced_metrics puts them;
+        # zero metrics are stored as NULL, as in calculate_advanced_metrics
+        ndigits = digits.get(column, 2)
+        metrics[column] = metrics[column].map(lambda value: round(value, ndigits)).where(metrics[column] != 0)
+    return metrics
+
 def validate_team_data(teams_data):
     """Validate team data before insertion."""
     validated_data = []
     for team in teams_data:
-        if len(team) != 3:  # Now expects (name, city, abbreviation)
+        if len(team) != 4:  # Expects (name, city, abbreviation, nba_team_id)
             logger.warning(f"Invalid team data format: {team}")
             continue
-        name, city, abbrev = team
+        name, city, abbrev, nba_team_id = team
         if not name or not abbrev:
             logger.warning(f"Missing team name or abbreviation: {team}")
             continue
@@ -185,7 +1246,7 @@ def validate_player_data(players_data):
     """Validate player data before insertion."""
     validated_data = []
     for player in players_data:
-        # Expected 38 fields now (extended with advanced stats and calculated metrics)
+        # Expected 41 fields now (extended with advanced stats, calculated metrics, the NBA player ID and stats season)
         if len(player) < 14:  # At minimum must have the basic 14 fields
             logger.warning(f"Invalid player data format (too few fields): {player}")
             continue
@@ -196,9 +1257,190 @@ def validate_player_data(players_data):
         validated_data.append(player)
     return validated_data
 
+# ----------------------------------------------------------------------
+# SCHEMA
+# ----------------------------------------------------------------------
+# Unique indexes (and the constraints owning them) on players.name alone, left over
+# from when players were upserted ON CONFLICT (name)
+PLAYER_NAME_UNIQUE_SQL = """
+    SELECT index_class.relname, owner.conname
+    FROM pg_index i
+    JOIN pg_class index_class ON index_class.oid = i.indexrelid
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+    LEFT JOIN pg_constraint owner ON owner.conindid = i.indexrelid AND owner.contype = 'u'
+    WHERE i.indrelid = to_regclass('players')
+      AND i.indisunique AND NOT i.indisprimary
+      AND i.indnatts = 1 AND a.attname = 'name'
+"""
+
+def ensure_schema(conn):
+    """
+    Add the NBA external ID columns and their unique indexes if they are missing.
+    Ingestion matches teams, players and games on these instead of names and dates.
+    players.stats_season_end_year records which season the stored stats are from.
+    A unique constraint on players.name is dropped: players are keyed on their NBA
+    ID, and two different players can share a name.
+    Also creates the season aggregate tables and their refresh queue.
+    """
+    with conn.cursor() as cur:
+        # ALTER TABLE takes an exclusive lock even when nothing changes, which would
+        # stall concurrent backfill workers, so only run the DDL when something is missing
+        cur.execute("""
+            SELECT COUNT(*) = 4
+                   AND to_regclass('teams_nba_team_id_key') IS NOT NULL
+                   AND to_regclass('players_nba_player_id_key') IS NOT NULL
+                   AND to_regclass('games_nba_game_id_key') IS NOT NULL
+                   AND to_regclass('season_aggregate_queue') IS NOT NULL
+                   AND to_regclass('player_season_stats_points_idx') IS NOT NULL
+                   AND to_regclass('team_season_stats') IS NOT NULL
+                   AND to_regclass('box_scores_team_id_idx') IS NOT NULL
+                   AND NOT EXISTS (""" + PLAYER_NAME_UNIQUE_SQL + """)
+            FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND (table_name, column_name) IN (
+                  ('teams', 'nba_team_id'), ('players', 'nba_player_id'),
+                  ('players', 'stats_season_end_year'), ('games', 'nba_game_id')
+              )
+        """)
+        if cur.fetchone()[0]:
+            conn.rollback()
+            return
+        cur.execute("""
+            ALTER TABLE teams ADD COLUMN IF NOT EXISTS nba_team_id BIGINT;
+            ALTER TABLE players ADD COLUMN IF NOT EXISTS nba_player_id BIGINT;
+            ALTER TABLE players ADD COLUMN IF NOT EXISTS stats_season_end_year INTEGER;
+            ALTER TABLE games ADD COLUMN IF NOT EXISTS nba_game_id VARCHAR(10);
+            CREATE UNIQUE INDEX IF NOT EXISTS teams_nba_team_id_key ON teams (nba_team_id);
+            CREATE UNIQUE INDEX IF NOT EXISTS players_nba_player_id_key ON players (nba_player_id);
+            CREATE UNIQUE INDEX IF NOT EXISTS games_nba_game_id_key ON games (nba_game_id);
+        """)
+        cur.execute(PLAYER_NAME_UNIQUE_SQL)
+        for index_name, constraint_name in cur.fetchall():
+            if constraint_name:
+                cur.execute(f"ALTER TABLE players DROP CONSTRAINT {quote_ident(constraint_name, cur)}")
+            else:
+                cur.execute(f"DROP INDEX {quote_ident(index_name, cur)}")
+            logger.info(f"Dropped unique {constraint_name or index_name} on players.name")
+        cur.execute(AGGREGATE_SCHEMA)
+    conn.commit()
+
+def backfill_external_ids(conn, table, id_column, key_columns, rows):
+    """
+    Stamp NBA IDs onto existing rows that predate the external key column, matching
+    on the old natural key. rows are (nba_id, *key values) tuples. One statement.
+    """
+    # NULL keys never match, and an all-NULL column would break VALUES type inference
+    rows = [row for row in rows if None not in row]
+    if not rows:
+        return
+    value_columns = (id_column,) + tuple(key_columns)
+    query = f"""
+        UPDATE {table} AS t SET {id_column} = v.{id_column}
+        FROM (VALUES %s) AS v ({", ".join(value_columns)})
+        WHERE {" AND ".join(f"t.{column} = v.{column}" for column in key_columns)}
+          AND t.{id_column} IS NULL
+          AND NOT EXISTS (SELECT 1 FROM {table} AS o WHERE o.{id_column} = v.{id_column})
+    """
+    with conn.cursor() as cur:
+        execute_values(cur, query, rows, page_size=len(rows))
+
+# ----------------------------------------------------------------------
+# BULK LOAD (COPY + STAGING MERGE)
+# ----------------------------------------------------------------------
+TEAM_COLUMNS = ("name", "city", "abbreviation", "nba_team_id")
+
+PLAYER_COLUMNS = (
+    "name", "position", "jersey_number", "team_id", "is_starter", "games_played", "minutes_per_game",
+    "points", "rebounds", "assists", "steals", "blocks", "turnovers",
+    "field_goal_percentage", "three_point_percentage", "free_throw_percentage",
+    "offensive_rebounds", "defensive_rebounds",
+    "field_goals_made", "field_goals_attempted",
+    "three_pointers_made", "three_pointers_attempted",
+    "free_throws_made", "free_throws_attempted",
+    "plus_minus", "fantasy_points", "double_doubles", "triple_doubles", "personal_fouls",
+    "age", "height", "weight",
+    "efficiency_rating", "true_shooting_percentage", "effective_field_goal_percentage",
+    "assist_to_turnover_ratio", "impact_score", "usage_rate", "player_efficiency_rating",
+    "nba_player_id", "stats_season_end_year",
+)
+
+# Columns an upsert overwrites on existing players. is_starter is only set on insert:
+# update_starter_status owns it, so a players-only sync keeps the computed flags
+PLAYER_UPDATE_COLUMNS = tuple(column for column in PLAYER_COLUMNS if column not in ("nba_player_id", "is_starter"))
+
+# Stats from an older season never overwrite a newer one, whatever order seasons load in
+PLAYER_STATS_SEASON_GUARD = (
+    "players.stats_season_end_year IS NULL "
+    "OR players.stats_season_end_year <= EXCLUDED.stats_season_end_year"
+)
+
+GAME_COLUMNS = ("nba_game_id", "game_date", "home_team_id", "away_team_id", "home_score", "away_score")
+
+BOX_SCORE_COLUMNS = (
+    "game_id", "player_id", "team_id", "minutes_played", "points", "rebounds", "assists",
+    "steals", "blocks", "turnovers", "field_goals_made", "field_goals_attempted",
+    "three_pointers_made", "three_pointers_attempted", "free_throws_made",
+    "free_throws_attempted", "plus_minus", "is_starter",
+)
+
+COPY_NULL = "\\N"
+
+def use_copy_load(table):
+    """True if `table` is configured to load through COPY + staging merge."""
+    return table in COPY_LOAD_TABLES
+
+def excluded_assignments(columns):
+    """SET clause assigning each column from EXCLUDED, as the execute_batch upserts do."""
+    return ",\n            ".join(f"{column} = EXCLUDED.{column}" for column in columns)
+
+@profiled
+def copy_upsert(conn, table, columns, rows, conflict_columns, update_set, returning=None, update_where=None):
+    """
+    Upsert rows by streaming them with COPY FROM STDIN into a temporary staging table,
+    then merging into `table` with a single INSERT ... SELECT ... ON CONFLICT.
+
+    Rows with the same conflict key keep the last occurrence, matching what a sequence
+    of single-row upserts would leave behind. Rows are merged in conflict-key order so
+    concurrent writers lock them in the same order. `update_where` optionally limits
+    which existing rows are updated. Returns the RETURNING rows if `returning` is
+    given, otherwise the number of rows merged. Does not commit.
+    """
+    key_positions = [columns.index(column) for column in conflict_columns]
+    deduped = {tuple(row[i] for i in key_positions): row for row in rows}
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in deduped.values():
+        writer.writerow([COPY_NULL if value is None else value for value in row])
+    buffer.seek(0)
+
+    staging = f"{table}_staging"
+    column_list = ", ".join(columns)
+    with conn.cursor() as cur:
+        # Temporary tables are session-local and not WAL-logged
+        cur.execute(f"DROP TABLE IF EXISTS {staging}")
+        cur.execute(f"CREATE TEMP TABLE {staging} AS SELECT {column_list} FROM {table} WITH NO DATA")
+        cur.copy_expert(
+            f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+        cur.execute(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {staging}
+            ORDER BY {", ".join(conflict_columns)}
+            ON CONFLICT ({", ".join(conflict_columns)}) DO UPDATE SET
+            {update_set}
+            {f"WHERE {update_where}" if update_where else ""}
+            {f"RETURNING {returning}" if returning else ""}
+        """)
+        result = cur.fetchall() if returning else cur.rowcount
+        cur.execute(f"DROP TABLE {staging}")
+    return result
+
 # ----------------------------------------------------------------------
 # INSERT HELPERS
 # ----------------------------------------------------------------------
+@profiled
 def insert_teams(conn, teams_data):
     """Insert team data with validation."""
     validated_data = validate_team_data(teams_data)
@@ -207,20 +1449,28 @@ def insert_teams(conn, teams_data):
         return
         
     query = """
-        INSERT INTO teams (name, city, abbreviation)
-        VALUES (%s, %s, %s)
+        INSERT INTO teams (name, city, abbreviation, nba_team_id)
+        VALUES (%s, %s, %s, %s)
         ON CONFLICT (abbreviation) DO UPDATE SET
             name = EXCLUDED.name,
-            city = EXCLUDED.city;
+            city = EXCLUDED.city,
+            nba_team_id = EXCLUDED.nba_team_id;
     """
     try:
-        with conn.cursor() as cur:
-            execute_batch(cur, query, validated_data)
+        with DB_STATEMENT_SECONDS.time(helper="insert_teams"):
+            if use_copy_load("teams"):
+                copy_upsert(conn, "teams", TEAM_COLUMNS, validated_data, ("abbreviation",),
+                            excluded_assignments(("name", "city", "nba_team_id")))
+            else:
+                with conn.cursor() as cur:
+                    execute_batch(cur, query, validated_data)
+        ROWS_UPSERTED.inc(len(validated_data), table="teams")
         logger.info(f"Inserted/Updated {len(validated_data)} teams")
     except psycopg2.Error as e:
         logger.error(f"Error inserting teams: {e}")
         raise
 
+@profiled
 def insert_players(conn, players_data):
     """Insert player data with validation."""
     validated_data = validate_player_data(players_data)
@@ -240,14 +1490,15 @@ def insert_players(conn, players_data):
             plus_minus, fantasy_points, double_doubles, triple_doubles, personal_fouls,
             age, height, weight,
             efficiency_rating, true_shooting_percentage, effective_field_goal_percentage,
-            assist_to_turnover_ratio, impact_score, usage_rate, player_efficiency_rating
+            assist_to_turnover_ratio, impact_score, usage_rate, player_efficiency_rating,
+            nba_player_id, stats_season_end_year
         )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (name) DO UPDATE SET
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (nba_player_id) DO UPDATE SET
+            name = EXCLUDED.name,
             position = EXCLUDED.position,
             jersey_number = EXCLUDED.jersey_number,
             team_id = EXCLUDED.team_id,
-            is_starter = EXCLUDED.is_starter,
             games_played = EXCLUDED.games_played,
             minutes_per_game = EXCLUDED.minutes_per_game,
             points = EXCLUDED.points,
@@ -281,48 +1532,74 @@ def insert_players(conn, players_data):
             assist_to_turnover_ratio = EXCLUDED.assist_to_turnover_ratio,
             impact_score = EXCLUDED.impact_score,
             usage_rate = EXCLUDED.usage_rate,
-            player_efficiency_rating = EXCLUDED.player_efficiency_rating;
+            player_efficiency_rating = EXCLUDED.player_efficiency_rating,
+            stats_season_end_year = EXCLUDED.stats_season_end_year
+        WHERE """ + PLAYER_STATS_SEASON_GUARD + """;
     """
+    nba_id_position = PLAYER_COLUMNS.index("nba_player_id")
     try:
-        with conn.cursor() as cur:
-            execute_batch(cur, query, validated_data)
+        with DB_STATEMENT_SECONDS.time(helper="insert_players"):
+            # Rows stored before players were keyed on NBA IDs are matched once by name
+            backfill_external_ids(conn, "players", "nba_player_id", ("name",),
+                                  [(player[nba_id_position], player[0]) for player in validated_data])
+            if use_copy_load("players"):
+                copy_upsert(conn, "players", PLAYER_COLUMNS, validated_data, ("nba_player_id",),
+                            excluded_assignments(PLAYER_UPDATE_COLUMNS), update_where=PLAYER_STATS_SEASON_GUARD)
+            else:
+                with conn.cursor() as cur:
+                    execute_batch(cur, query, validated_data)
+        ROWS_UPSERTED.inc(len(validated_data), table="players")
         logger.info(f"Inserted/Updated {len(validated_data)} players")
     except psycopg2.Error as e:
         logger.error(f"Error inserting players: {e}")
         raise
 
+@profiled
 def insert_games(conn, games_data):
-    """Insert game data with validation."""
+    """
+    Upsert all games in one round trip, keyed on the NBA game ID, and return
+    (game_ids, nba_game_ids) aligned with games_data. RETURNING rows carry the NBA
+    game ID, so the order they come back in does not matter.
+    """
     if not games_data:
         logger.warning("No game data to insert")
         return
-        
-    query = """
-        INSERT INTO games (game_date, home_team_id, away_team_id, home_score, away_score)
-        VALUES (%s, %s, %s, %s, %s)
-        ON CONFLICT (game_date, home_team_id, away_team_id) DO UPDATE SET
-            home_score = EXCLUDED.home_score,
-            away_score = EXCLUDED.away_score
-        RETURNING id;
-    """
-    game_ids = []
-    nba_game_ids = []
+    
+    # game_data is (nba_game_id, game_date, home_team_id, away_team_id, home_score, away_score)
+    update_set = excluded_assignments(GAME_COLUMNS[1:])
     try:
-        with conn.cursor() as cur:
-            for game_data in games_data:
-                # game_data is (nba_game_id, game_date, home_team_id, away_team_id, home_score, away_score)
-                nba_game_ids.append(game_data[0])
-                # Insert only the database fields (skip nba_game_id)
-                cur.execute(query, game_data[1:])
-                game_id = cur.fetchone()[0]
-                game_ids.append(game_id)
-        conn.commit()
+        with DB_STATEMENT_SECONDS.time(helper="insert_games"):
+            # Rows stored before games were keyed on NBA IDs are matched once by date and teams
+            backfill_external_ids(conn, "games", "nba_game_id", ("game_date", "home_team_id", "away_team_id"),
+                                  [game_data[:4] for game_data in games_data])
+            if use_copy_load("games"):
+                returned = copy_upsert(conn, "games", GAME_COLUMNS, games_data, ("nba_game_id",),
+                                       update_set, returning="id, nba_game_id")
+            else:
+                # One multi-row statement; duplicate keys would make ON CONFLICT fail, so keep the last
+                unique_rows = list({game_data[0]: game_data for game_data in games_data}.values())
+                query = f"""
+                    INSERT INTO games ({", ".join(GAME_COLUMNS)})
+                    VALUES %s
+                    ON CONFLICT (nba_game_id) DO UPDATE SET
+                        {update_set}
+                    RETURNING id, nba_game_id;
+                """
+                with conn.cursor() as cur:
+                    returned = execute_values(cur, query, unique_rows, page_size=len(unique_rows), fetch=True)
+            conn.commit()
+        ROWS_UPSERTED.inc(len(games_data), table="games")
+        
+        db_id_by_nba_id = {nba_game_id: db_id for db_id, nba_game_id in returned}
+        nba_game_ids = [game_data[0] for game_data in games_data]
+        game_ids = [db_id_by_nba_id[nba_game_id] for nba_game_id in nba_game_ids]
         logger.info(f"Inserted/Updated {len(games_data)} games")
         return game_ids, nba_game_ids
     except psycopg2.Error as e:
         logger.error(f"Error inserting games: {e}")
         raise
 
+@profiled
 def insert_box_scores(conn, box_scores_data):
     """Insert box score data with validation."""
     if not box_scores_data:
@@ -352,176 +1629,688 @@ def insert_box_scores(conn, box_scores_data):
             free_throws_made = EXCLUDED.free_throws_made,
             free_throws_attempted = EXCLUDED.free_throws_attempted,
             plus_minus = EXCLUDED.plus_minus,
-            is_starter = EXCLUDED.is_starter;
+            is_starter = COALESCE(EXCLUDED.is_starter, box_scores.is_starter);
     """
     try:
-        with conn.cursor() as cur:
-            execute_batch(cur, query, box_scores_data)
-        conn.commit()
+        with DB_STATEMENT_SECONDS.time(helper="insert_box_scores"):
+            if use_copy_load("box_scores"):
+                copy_upsert(conn, "box_scores", BOX_SCORE_COLUMNS, box_scores_data, ("game_id", "player_id"),
+                            excluded_assignments(BOX_SCORE_COLUMNS[3:-1])
+                            + ",\n            is_starter = COALESCE(EXCLUDED.is_starter, box_scores.is_starter)")
+            else:
+                with conn.cursor() as cur:
+                    execute_batch(cur, query, box_scores_data)
+            # Same transaction as the rows, so a crash can never lose a pending refresh
+            enqueue_aggregate_refresh(conn, box_scores_data)
+            conn.commit()
+        ROWS_UPSERTED.inc(len(box_scores_data), table="box_scores")
         logger.info(f"Inserted/Updated {len(box_scores_data)} box score entries")
     except psycopg2.Error as e:
         logger.error(f"Error inserting box scores: {e}")
         raise
 
 # ----------------------------------------------------------------------
-# NBA API DATA FETCHING FUNCTIONS
+# SEASON AGGREGATES
 # ----------------------------------------------------------------------
-def get_team_standings(season_year):
-    """Fetch team standings using NBA API."""
-    # NBA API uses season format like "2024-25"
-    season_str = f"{season_year-1}-{str(season_year)[-2:]}"
-    logger.info(f"Fetching standings for season {season_str}...")
-    
-    standings = leaguestandings.LeagueStandings(season=season_str, timeout=120)
-    standings_df = standings.get_data_frames()[0]
-    
-    # Get team abbreviations from static teams - this has the CORRECT abbreviations
-    all_teams = teams.get_teams()
-    # Create mapping from team name to full team info
-    team_name_to_info = {}
-    for team in all_teams:
-        team_name_to_info[team['full_name']] = team
-        team_name_to_info[team['nickname']] = team
-    
-    teams_data = []
-    for _, row in standings_df.iterrows():
-        team_name = row['TeamName']
-        
-        # Try to find the matching team info
-        team_info = None
-        # First try exact match on full name
-        if team_name in team_name_to_info:
-            team_info = team_name_to_info[team_name]
-        else:
-            # Try to find by matching any part of the name
-            for api_team in all_teams:
-                if api_team['nickname'] in team_name or team_name in api_team['full_name']:
-                    team_info = api_team
-                    break
-        
+# Plain summary tables instead of materialized views: a view can only be refreshed
+# whole, while box score upserts queue just the (player, team, season) they touch in
+# season_aggregate_queue and refresh_season_aggregates rebuilds only those rows.
+# Box score columns summed per player/team and season
+AGGREGATE_TOTAL_COLUMNS = (
+    "points", "rebounds", "assists", "steals", "blocks", "turnovers",
+    "field_goals_made", "field_goals_attempted", "three_pointers_made", "three_pointers_attempted",
+    "free_throws_made", "free_throws_attempted", "plus_minus",
+)
+AGGREGATE_PER_GAME_COLUMNS = AGGREGATE_TOTAL_COLUMNS
+AGGREGATE_PERCENTAGES = {
+    "field_goal_percentage": ("field_goals_made", "field_goals_attempted"),
+    "three_point_percentage": ("three_pointers_made", "three_pointers_attempted"),
+    "free_throw_percentage": ("free_throws_made", "free_throws_attempted"),
+}
+ADVANCED_METRIC_COLUMNS = (
+    "true_shooting_percentage", "effective_field_goal_percentage", "assist_to_turnover_ratio",
+    "efficiency_rating", "impact_score", "usage_rate", "player_efficiency_rating",
+)
+# Indexed per-game/metric columns that GET /api/nba/leaders can rank by
+AGGREGATE_LEADER_STATS = (
+    "points_per_game", "rebounds_per_game", "assists_per_game", "steals_per_game", "blocks_per_game",
+    "player_efficiency_rating", "efficiency_rating", "true_shooting_percentage",
+)
+
+# Decimal minutes of a box score "MM:SS" (or plain minutes) value
+MINUTES_SQL = """
+    CASE WHEN bs.minutes_played ~ '^[0-9]+([.][0-9]+)?:[0-9]+$'
+         THEN split_part(bs.minutes_played, ':', 1)::float8 + split_part(bs.minutes_played, ':', 2)::float8 / 60
+         WHEN bs.minutes_played ~ '^[0-9]+([.][0-9]+)?$' THEN bs.minutes_played::float8
+    END
+"""
+
+# Season of a game date, matching season_date_range (seasons run August to August)
+SEASON_END_YEAR_SQL = "(EXTRACT(YEAR FROM g.game_date)::int + CASE WHEN EXTRACT(MONTH FROM g.game_date) >= 8 THEN 1 ELSE 0 END)"
+
+def aggregate_table_ddl(table, key_column, extra_columns):
+    columns = [f"{key_column} BIGINT NOT NULL", "season_end_year INTEGER NOT NULL", *extra_columns,
+               "games_played INTEGER NOT NULL", "minutes DOUBLE PRECISION", "minutes_per_game DOUBLE PRECISION"]
+    columns += [f"{column} INTEGER" for column in AGGREGATE_TOTAL_COLUMNS]
+    columns += [f"{column}_per_game DOUBLE PRECISION" for column in AGGREGATE_PER_GAME_COLUMNS]
+    columns += [f"{column} DOUBLE PRECISION" for column in (*AGGREGATE_PERCENTAGES, *ADVANCED_METRIC_COLUMNS)]
+    columns += ["refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()", f"PRIMARY KEY ({key_column}, season_end_year)"]
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n    " + ",\n    ".join(columns) + "\n);"
+
+AGGREGATE_SCHEMA = "\n".join([
+    """
+    CREATE TABLE IF NOT EXISTS season_aggregate_queue (
+        player_id BIGINT NOT NULL,
+        team_id BIGINT NOT NULL,
+        season_end_year INTEGER NOT NULL,
+        PRIMARY KEY (player_id, team_id, season_end_year)
+    );
+    CREATE INDEX IF NOT EXISTS box_scores_player_id_idx ON box_scores (player_id);
+    CREATE INDEX IF NOT EXISTS box_scores_team_id_idx ON box_scores (team_id);
+    """,
+    aggregate_table_ddl("player_season_stats", "player_id", ["team_id BIGINT", "games_started INTEGER"]),
+    aggregate_table_ddl("team_season_stats", "team_id", ["wins INTEGER", "losses INTEGER"]),
+    *[
+        f"CREATE INDEX IF NOT EXISTS player_season_stats_{stat.replace('_per_game', '')}_idx "
+        f"ON player_season_stats (season_end_year, {stat} DESC NULLS LAST);"
+        for stat in AGGREGATE_LEADER_STATS
+    ],
+])
+
+def advanced_metrics_sql():
+    """
+    calculate_advanced_metrics as SQL over per-game inputs (m_* columns): the same
+    defaults for missing/zero stats, the same formulas and rounding, 0 stored as NULL.
+    """
+    formulas = {
+        "true_shooting_percentage": ("CASE WHEN m_fga + m_fta > 0 THEN m_pts / (2 * (m_fga + 0.44 * m_fta)) ELSE 0 END", 4),
+        "effective_field_goal_percentage": ("CASE WHEN m_fga > 0 THEN (m_fgm + 0.5 * m_fg3m) / m_fga ELSE 0 END", 4),
+        "assist_to_turnover_ratio": ("CASE WHEN m_tov > 0.1 THEN m_ast / m_tov ELSE m_ast END", 2),
+        "efficiency_rating": ("(m_pts + m_reb + m_ast + m_stl + m_blk - m_tov) / m_gp", 2),
+        "impact_score": ("m_pts + m_reb + m_ast + (m_stl * 2) + (m_blk * 2) - m_tov", 2),
+        "usage_rate": ("(m_fga + 0.44 * m_fta + m_tov) / m_gp", 2),
+        "player_efficiency_rating": ("(m_pts + m_reb + m_ast + m_stl + m_blk - (m_fga - m_fgm) - (m_fta - m_ftm) - m_tov) / m_gp", 2),
+    }
+    return ",\n".join(f"NULLIF(ROUND(({formula})::numeric, {digits}), 0)::float8"
+                      for formula, digits in (formulas[column] for column in ADVANCED_METRIC_COLUMNS))
+
+def season_aggregate_sql(table, key_column, extra_columns, extra_aggregates, games_played_sql, extra_select=""):
+    """
+    INSERT ... SELECT rebuilding `table` rows for the (key, season) pairs passed as two
+    arrays: totals from box_scores, per-game averages, shooting percentages and metrics.
+    """
+    metric_inputs = {
+        "m_pts": ("points", 0), "m_reb": ("rebounds", 0), "m_ast": ("assists", 0), "m_stl": ("steals", 0),
+        "m_blk": ("blocks", 0), "m_tov": ("turnovers", 0.1), "m_fgm": ("field_goals_made", 0),
+        "m_fga": ("field_goals_attempted", 1), "m_fg3m": ("three_pointers_made", 0),
+        "m_ftm": ("free_throws_made", 0), "m_fta": ("free_throws_attempted", 0),
+    }
+    insert_columns = [key_column, "season_end_year", *extra_columns, "games_played", "minutes", "minutes_per_game",
+                      *AGGREGATE_TOTAL_COLUMNS, *(f"{column}_per_game" for column in AGGREGATE_PER_GAME_COLUMNS),
+                      *AGGREGATE_PERCENTAGES, *ADVANCED_METRIC_COLUMNS]
+    return f"""
+        WITH touched (key_id, season_end_year) AS (
+            SELECT DISTINCT * FROM unnest(%s::bigint[], %s::int[])
+        ),
+        lines AS (
+            SELECT t.key_id, t.season_end_year, bs.game_id, bs.team_id, bs.is_starter, g.game_date,
+                   g.home_team_id, g.home_score, g.away_score, {MINUTES_SQL} AS minutes,
+                   {", ".join(f"bs.{column}" for column in AGGREGATE_TOTAL_COLUMNS)}
+            FROM touched t
+            JOIN box_scores bs ON bs.{key_column} = t.key_id
+            JOIN games g ON g.id = bs.game_id
+            WHERE g.game_date >= make_date(t.season_end_year - 1, 8, 1)
+              AND g.game_date < make_date(t.season_end_year, 8, 1)
+        ),
+        totals AS (
+            SELECT key_id, season_end_year, {extra_aggregates},
+                   {games_played_sql} AS games_played, SUM(minutes) AS minutes,
+                   {", ".join(f"SUM({column})::int AS {column}" for column in AGGREGATE_TOTAL_COLUMNS)}
+            FROM lines
+            GROUP BY key_id, season_end_year
+        ),
+        per_game AS (
+            SELECT totals.*, minutes / NULLIF(games_played, 0) AS minutes_per_game,
+                   {", ".join(f"{column}::float8 / NULLIF(games_played, 0) AS {column}_per_game"
+                              for column in AGGREGATE_TOTAL_COLUMNS)}
+            FROM totals
+        ),
+        inputs AS (
+            SELECT per_game.*, COALESCE(NULLIF(games_played, 0), 1) AS m_gp,
+                   {", ".join(f"COALESCE(NULLIF({column}_per_game, 0), {default}) AS {name}"
+                              for name, (column, default) in metric_inputs.items())}
+            FROM per_game
+        )
+        INSERT INTO {table} ({", ".join(insert_columns)})
+        SELECT key_id, season_end_year, {extra_select}games_played, minutes, minutes_per_game,
+               {", ".join(AGGREGATE_TOTAL_COLUMNS)},
+               {", ".join(f"{column}_per_game" for column in AGGREGATE_PER_GAME_COLUMNS)},
+               {", ".join(f"ROUND(({made}::float8 / NULLIF({attempted}, 0))::numeric, 3)::float8"
+                          for made, attempted in AGGREGATE_PERCENTAGES.values())},
+               {advanced_metrics_sql()}
+        FROM inputs
+    """
+
+PLAYER_SEASON_AGGREGATE_SQL = season_aggregate_sql(
+    "player_season_stats", "player_id", ("team_id", "games_started"),
+    # Current team: the one from the player's latest game of the season
+    "(array_agg(team_id ORDER BY game_date DESC))[1] AS team_id, COUNT(*) FILTER (WHERE is_starter) AS games_started",
+    "COUNT(*) FILTER (WHERE COALESCE(minutes, 0) > 0 OR points > 0)",
+    extra_select="team_id, games_started, ",
+)
+
+TEAM_SEASON_AGGREGATE_SQL = season_aggregate_sql(
+    "team_season_stats", "team_id", ("wins", "losses"),
+    "COUNT(DISTINCT game_id) FILTER (WHERE CASE WHEN home_team_id = key_id THEN home_score > away_score "
+    "ELSE away_score > home_score END) AS wins, "
+    "COUNT(DISTINCT game_id) FILTER (WHERE CASE WHEN home_team_id = key_id THEN home_score < away_score "
+    "ELSE away_score < home_score END) AS losses",
+    "COUNT(DISTINCT game_id)",
+    extra_select="wins, losses, ",
+)
+
+def enqueue_aggregate_refresh(conn, box_scores_data):
+    """Queue the players and teams of upserted box score rows for an aggregate refresh (no commit)."""
+    pairs = {(row[0], row[1], row[2]) for row in box_scores_data}
+    game_ids, player_ids, team_ids = (list(values) for values in zip(*pairs)) if pairs else ([], [], [])
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            INSERT INTO season_aggregate_queue (player_id, team_id, season_end_year)
+            SELECT DISTINCT q.player_id, q.team_id, {SEASON_END_YEAR_SQL}
+            FROM unnest(%s::bigint[], %s::bigint[], %s::bigint[]) AS q (game_id, player_id, team_id)
+            JOIN games g ON g.id = q.game_id
+            ON CONFLICT DO NOTHING
+        """, (game_ids, player_ids, team_ids))
+
+def enqueue_season_aggregates(conn, season_year):
+    """Queue every player and team with box scores in the season (no commit)."""
+    season_start, season_end = season_date_range(season_year)
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO season_aggregate_queue (player_id, team_id, season_end_year)
+            SELECT DISTINCT bs.player_id, bs.team_id, %s
+            FROM box_scores bs
+            JOIN games g ON g.id = bs.game_id
+            WHERE g.game_date >= %s AND g.game_date < %s
+            ON CONFLICT DO NOTHING
+        """, (season_year, season_start, season_end))
+
+@profiled
+def refresh_season_aggregates(conn):
+    """
+    Drain the refresh queue: rebuild player_season_stats and team_season_stats rows
+    for just the queued (player, season) and (team, season) pairs, in one transaction
+    with the dequeue so a failed refresh leaves them queued. Returns rows per table.
+    """
+    with DB_STATEMENT_SECONDS.time(helper="refresh_season_aggregates"):
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM season_aggregate_queue RETURNING player_id, team_id, season_end_year")
+            queued = cur.fetchall()
+            if not queued:
+                conn.rollback()
+                return {"player_season_stats": 0, "team_season_stats": 0}
+            player_keys = sorted({(player_id, season) for player_id, _, season in queued})
+            team_keys = sorted({(team_id, season) for _, team_id, season in queued})
+            refreshed = {}
+            for table, key_column, pairs, query in (
+                ("player_season_stats", "player_id", player_keys, PLAYER_SEASON_AGGREGATE_SQL),
+                ("team_season_stats", "team_id", team_keys, TEAM_SEASON_AGGREGATE_SQL),
+            ):
+                keys, seasons = [key for key, _ in pairs], [season for _, season in pairs]
+                cur.execute(f"""
+                    DELETE FROM {table} s
+                    USING unnest(%s::bigint[], %s::int[]) AS t (key_id, season_end_year)
+                    WHERE s.{key_column} = t.key_id AND s.season_end_year = t.season_end_year
+                """, (keys, seasons))
+                cur.execute(query, (keys, seasons))
+                refreshed[table] = cur.rowcount
+        conn.commit()
+    for table, count in refreshed.items():
+        ROWS_UPSERTED.inc(count, table=table)
+    logger.info(f"📊 Refreshed season aggregates for {len(player_keys)} players and {len(team_keys)} teams")
+    return refreshed
+
+def get_season_leaders(conn, season_year, stat="points_per_game", limit=10, min_games=0):
+    """Top players of a season by an AGGREGATE_LEADER_STATS column (an index scan)."""
+    if stat not in AGGREGATE_LEADER_STATS:
+        raise ValueError(f"Unknown stat {stat!r}; expected one of {', '.join(AGGREGATE_LEADER_STATS)}")
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            SELECT s.player_id, p.name, t.abbreviation, s.games_played, s.{stat}
+            FROM player_season_stats s
+            JOIN players p ON p.id = s.player_id
+            LEFT JOIN teams t ON t.id = s.team_id
+            WHERE s.season_end_year = %s AND s.{stat} IS NOT NULL AND s.games_played >= %s
+            ORDER BY s.{stat} DESC NULLS LAST
+            LIMIT %s
+        """, (season_year, min_games, limit))
+        rows = cur.fetchall()
+    conn.rollback()
+    return [
+        {"player_id": player_id, "name": name, "team": team, "games_played": games_played, stat: value}
+        for player_id, name, team, games_played, value in rows
+    ]
+
+def get_player_season_stats(conn, player_id):
+    """Every season row of one player from player_season_stats, newest first."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT * FROM player_season_stats WHERE player_id = %s ORDER BY season_end_year DESC
+        """, (player_id,))
+        columns = [column.name for column in cur.description]
+        rows = cur.fetchall()
+    conn.rollback()
+    return [
+        {column: value.isoformat() if isinstance(value, datetime.datetime) else value
+         for column, value in zip(columns, row)}
+        for row in rows
+    ]
+
+# ----------------------------------------------------------------------
+# IDENTITY RESOLUTION
+# ----------------------------------------------------------------------
+class IdentityResolver:
+    """
+    Run-scoped lookup tables from NBA player/team IDs, player names and team
+    abbreviations/names to database IDs. Loaded once per run and refreshed after players or teams are
+    upserted, so no stage has to re-read the players/teams tables per game.
+    """
+
+    def __init__(self):
+        all_teams = teams.get_teams()
+        self.nba_team_id_to_abbrev = {team['id']: team['abbreviation'] for team in all_teams}
+        self.player_ids = {}
+        self.nba_player_ids = {}
+        self.team_ids = {}
+        self.nba_team_ids = {}
+
+    def load(self, conn):
+        self.refresh_teams(conn)
+        self.refresh_players(conn)
+        return self
+
+    def refresh_teams(self, conn):
+        # Rebind rather than mutate so worker threads always see a complete mapping
+        team_ids = get_team_id_mapping(conn)
+        nba_team_ids = {
+            nba_id: team_ids[abbrev] for nba_id, abbrev in self.nba_team_id_to_abbrev.items()
+            if abbrev in team_ids
+        }
+        with conn.cursor() as cur:
+            cur.execute("SELECT nba_team_id, id FROM teams WHERE nba_team_id IS NOT NULL")
+            nba_team_ids.update(cur.fetchall())
+        self.nba_team_ids = nba_team_ids
+        self.team_ids = team_ids
+
+    def refresh_players(self, conn):
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, name, nba_player_id FROM players")
+            rows = cur.fetchall()
+        self.nba_player_ids = {row[2]: row[0] for row in rows if row[2] is not None}
+        self.player_ids = {row[1]: row[0] for row in rows}
+
+    def player_id(self, name, nba_player_id=None):
+        # The NBA ID survives renames and punctuation changes; the name is a fallback
+        db_id = self.nba_player_ids.get(safe_int(nba_player_id))
+        if db_id is None:
+            db_id = self.player_ids.get(name)
+        return db_id
+
+    def team_id(self, abbrev_or_name):
+        return self.team_ids.get(abbrev_or_name)
+
+    def team_id_for_nba(self, nba_team_id):
+        return self.nba_team_ids.get(nba_team_id)
+
+# ----------------------------------------------------------------------
+# PLAYER BIO CACHE
+# ----------------------------------------------------------------------
+BIO_FIELDS = ("position", "height", "weight", "age", "jersey_number")
+
+class PlayerBioCache:
+    """
+    On-disk SQLite cache of roster/CommonPlayerInfo bio fields per (season, NBA player
+    ID), with one fetched_at per field so each field can expire on its own TTL.
+    """
+
+    def __init__(self, path=None, ttls=None):
+        self.path = path or PLAYER_BIO_CACHE_PATH
+        self.ttls = {field: (ttls or PLAYER_BIO_TTLS).get(field, 7) * 86400 for field in BIO_FIELDS}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS player_bio_fields (
+                nba_player_id INTEGER NOT NULL,
+                season TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (nba_player_id, season, field)
+            )
+        """)
+
+    def get(self, season, nba_player_ids):
+        """Return {nba_player_id: {field: (value, fetched_at)}} for cached players."""
+        entries = {}
+        rows = self._db.execute(
+            "SELECT nba_player_id, field, value, fetched_at FROM player_bio_fields WHERE season = ?",
+            (season,)
+        )
+        wanted = set(nba_player_ids)
+        for nba_player_id, field, value, fetched_at in rows:
+            if nba_player_id in wanted:
+                entries.setdefault(nba_player_id, {})[field] = (json.loads(value), fetched_at)
+        return entries
+
+    def is_fresh(self, entry, now=None):
+        now = now or time.time()
+        return all(
+            field in entry and now - entry[field][1] < self.ttls[field]
+            for field in BIO_FIELDS
+        )
+
+    def put(self, season, bios):
+        """Store {nba_player_id: {field: value}}; every given field is stamped now."""
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO player_bio_fields (nba_player_id, season, field, value, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (nba_player_id, season, field, json.dumps(value), now)
+                    for nba_player_id, bio in bios.items()
+                    for field, value in bio.items()
+                ]
+            )
+
+    def close(self):
+        self._db.close()
+
+# ----------------------------------------------------------------------
+# NBA API DATA FETCHING FUNCTIONS
+# ----------------------------------------------------------------------
+@profiled
+def get_team_standings(season_year):
+    """Fetch team standings using NBA API."""
+    # NBA API uses season format like "2024-25"
+    season_str = f"{season_year-1}-{str(season_year)[-2:]}"
+    logger.info(f"Fetching standings for season {season_str}...")
+    
+    standings = nba_api_request(leaguestandings.LeagueStandings, season=season_str)
+    standings_df = standings.get_data_frames()[0]
+    
+    # Get team abbreviations from static teams - this has the CORRECT abbreviations
+    all_teams = teams.get_teams()
+    # Create mapping from team name to full team info
+    team_name_to_info = {}
+    for team in all_teams:
+        team_name_to_info[team['full_name']] = team
+        team_name_to_info[team['nickname']] = team
+    
+    teams_data = []
+    for _, row in standings_df.iterrows():
+        team_name = row['TeamName']
+        
+        # Try to find the matching team info
+        team_info = None
+        # First try exact match on full name
+        if team_name in team_name_to_info:
+            team_info = team_name_to_info[team_name]
+        else:
+            # Try to find by matching any part of the name
+            for api_team in all_teams:
+                if api_team['nickname'] in team_name or team_name in api_team['full_name']:
+                    team_info = api_team
+                    break
+        
         if team_info:
             name = team_info['full_name']
             city = team_info['city']
             abbrev = team_info['abbreviation']
+            nba_team_id = team_info['id']
         else:
             # Fallback
             name = team_name
             city = None
             abbrev = team_name[:3].upper()
+            nba_team_id = safe_int(row.get('TeamID'))
             logger.warning(f"Could not find full info for {team_name}, using defaults")
         
         teams_data.append((
-            name,      # Full team name
-            city,      # City
-            abbrev     # Team abbreviation
+            name,        # Full team name
+            city,        # City
+            abbrev,      # Team abbreviation
+            nba_team_id  # NBA team ID
         ))
     
     return teams_data
 
-def get_player_positions(season_year, player_ids_dict=None):
-    """Get player positions and physical stats by fetching all team rosters, with fallback to CommonPlayerInfo."""
+@profiled
+def get_player_positions(season_year, player_ids_dict=None, player_team_ids=None, refresh=None):
+    """
+    Get player positions and physical stats from team rosters, with fallback to
+    CommonPlayerInfo. Bios are cached on disk per NBA player ID, so only rosters of
+    teams with new or stale players, and fallbacks for those players, hit the API.
+    player_team_ids maps NBA player ID -> NBA team ID; refresh=True bypasses the cache.
+    """
     season_str = f"{season_year-1}-{str(season_year)[-2:]}"
-    logger.info(f"Fetching player positions from team rosters...")
+    refresh = PLAYER_BIO_REFRESH if refresh is None else refresh
     
     all_teams = teams.get_teams()
     player_positions = {}
     player_physical_stats = {}  # Store height, weight, age
+    player_ids_dict = {name: safe_int(nba_id) for name, nba_id in (player_ids_dict or {}).items()}
+    player_team_ids = {safe_int(nba_id): safe_int(team_id) for nba_id, team_id in (player_team_ids or {}).items()}
     
-    for i, team in enumerate(all_teams):
-        try:
-            # Rate limiting - wait between API calls
-            if i > 0:
-                time.sleep(0.6)  # NBA API rate limit
-            
-            roster = commonteamroster.CommonTeamRoster(
-                season=season_str,
-                team_id=team['id'],
-                timeout=120
-            )
-            roster_df = roster.get_data_frames()[0]
-            
-            for _, player_row in roster_df.iterrows():
-                player_name = player_row.get('PLAYER')
-                position = normalize_position(player_row.get('POSITION'))
-                if player_name and position:
-                    player_positions[player_name] = position
-                
-                # Store physical stats if available
-                if player_name:
-                    # Store with original name AND normalized name (without periods/spaces)
-                    stats_dict = {
-                        'height': player_row.get('HEIGHT'),
+    def add_player(player_name, bio):
+        if bio.get('position'):
+            player_positions[player_name] = bio['position']
+        stats_dict = {
+            'height': bio.get('height'),
+            'weight': bio.get('weight'),
+            'age': bio.get('age'),
+            'jersey_number': bio.get('jersey_number')
+        }
+        player_physical_stats[player_name] = stats_dict
+        # Also store with normalized name for better matching
+        normalized_name = player_name.replace('.', '').replace(' ', '').lower()
+        player_physical_stats[normalized_name] = stats_dict
+    
+    bio_cache = PlayerBioCache()
+    try:
+        # Serve fresh cache entries; everything else is fetched below
+        cached = {} if refresh else bio_cache.get(season_str, player_ids_dict.values())
+        now = time.time()
+        stale_ids = set()
+        for player_name, nba_id in player_ids_dict.items():
+            entry = cached.get(nba_id)
+            if entry and bio_cache.is_fresh(entry, now):
+                add_player(player_name, {field: value for field, (value, _) in entry.items()})
+            else:
+                stale_ids.add(nba_id)
+        if player_ids_dict:
+            logger.info(f"Player bio cache: {len(player_ids_dict) - len(stale_ids)} fresh, {len(stale_ids)} new or stale")
+        
+        # Only rosters of teams with a new/stale player (all of them without a player list)
+        if player_ids_dict:
+            stale_team_ids = {player_team_ids.get(nba_id) for nba_id in stale_ids}
+            roster_teams = [team for team in all_teams if team['id'] in stale_team_ids]
+        else:
+            roster_teams = all_teams
+        if roster_teams:
+            logger.info(f"Fetching player positions from {len(roster_teams)} team rosters...")
+        
+        def fetch_roster(team):
+            roster = nba_api_request(commonteamroster.CommonTeamRoster, season=season_str, team_id=team['id'])
+            return roster.get_data_frames()[0]
+        
+        refreshed = {}  # nba_player_id -> bio fetched this run
+        for team, roster_df, error in fetch_concurrently(fetch_roster, roster_teams):
+            if error:
+                logger.warning(f"Failed to fetch roster for {team['full_name']}: {error}")
+                continue
+            try:
+                roster_bios = {}
+                for _, player_row in roster_df.iterrows():
+                    player_name = player_row.get('PLAYER')
+                    if not player_name:
+                        continue
+                    height = player_row.get('HEIGHT')
+                    bio = {
+                        'position': normalize_position(player_row.get('POSITION')),
+                        'height': None if pd.isna(height) else height,
                         'weight': safe_int(player_row.get('WEIGHT')),
                         'age': safe_int(player_row.get('AGE')),
                         'jersey_number': safe_int(player_row.get('NUM'))
                     }
-                    player_physical_stats[player_name] = stats_dict
-                    # Also store with normalized name for better matching
-                    normalized_name = player_name.replace('.', '').replace(' ', '').lower()
-                    player_physical_stats[normalized_name] = stats_dict
+                    add_player(player_name, bio)
+                    nba_id = safe_int(player_row.get('PLAYER_ID'))
+                    if nba_id is not None:
+                        roster_bios[nba_id] = bio
+                bio_cache.put(season_str, roster_bios)
+                refreshed.update(roster_bios)
+                
+                logger.debug(f"Fetched roster for {team['abbreviation']} ({len(roster_df)} players)")
+                
+            except Exception as e:
+                logger.warning(f"Failed to process roster for {team['full_name']}: {e}")
+                continue
+        
+        logger.info(f"Retrieved positions for {len(player_positions)} players from rosters and cache")
+        
+        # Fallback: Use CommonPlayerInfo for stale players the rosters did not cover
+        missing_players = [
+            (player_name, nba_id) for player_name, nba_id in player_ids_dict.items()
+            if nba_id in stale_ids and not (refreshed.get(nba_id) or {}).get('position')
+        ]
+        if missing_players:
+            missing_count = 0
+            logger.info(f"Fetching positions for {len(missing_players)} players not in current rosters...")
             
-            logger.debug(f"Fetched roster for {team['abbreviation']} ({len(roster_df)} players)")
+            def fetch_player_info(item):
+                player_info = nba_api_request(commonplayerinfo.CommonPlayerInfo, player_id=item[1])
+                return player_info.get_data_frames()[0]
             
-        except Exception as e:
-            logger.warning(f"Failed to fetch roster for {team['full_name']}: {e}")
-            continue
-    
-    logger.info(f"Retrieved positions for {len(player_positions)} players from rosters")
-    
-    # Fallback: Use CommonPlayerInfo for players not in rosters
-    if player_ids_dict:
-        missing_count = 0
-        logger.info(f"Fetching positions for players not in current rosters...")
-        
-        for player_name, player_id in player_ids_dict.items():
-            if player_name not in player_positions:
+            for (player_name, nba_id), info_df, error in fetch_concurrently(fetch_player_info, missing_players):
+                if error:
+                    logger.debug(f"Could not fetch position for {player_name}: {error}")
+                    continue
                 try:
-                    time.sleep(0.6)  # Rate limiting
-                    player_info = commonplayerinfo.CommonPlayerInfo(player_id=player_id, timeout=120)
-                    info_df = player_info.get_data_frames()[0]
-                    
                     if not info_df.empty:
-                        position = normalize_position(info_df.iloc[0].get('POSITION'))
-                        if position:
-                            player_positions[player_name] = position
-                            missing_count += 1
-                        
-                        # Also get physical stats
-                        player_physical_stats[player_name] = {
-                            'height': info_df.iloc[0].get('HEIGHT'),
-                            'weight': safe_int(info_df.iloc[0].get('WEIGHT')),
-                            'age': None  # Age not reliably available in CommonPlayerInfo
+                        info = info_df.iloc[0]
+                        height = info.get('HEIGHT')
+                        previous = refreshed.get(nba_id) or {field: value for field, (value, _) in cached.get(nba_id, {}).items()}
+                        bio = {
+                            'position': normalize_position(info.get('POSITION')),
+                            'height': None if pd.isna(height) else height,
+                            'weight': safe_int(info.get('WEIGHT')),
+                            # Age is not reliably available in CommonPlayerInfo; jersey comes from rosters
+                            'age': previous.get('age'),
+                            'jersey_number': previous.get('jersey_number')
                         }
+                        if bio['position']:
+                            missing_count += 1
+                        add_player(player_name, bio)
+                        bio_cache.put(season_str, {nba_id: bio})
                             
                 except Exception as e:
-                    logger.debug(f"Could not fetch position for {player_name}: {e}")
+                    logger.debug(f"Could not process player info for {player_name}: {e}")
                     continue
-        
-        if missing_count > 0:
-            logger.info(f"Retrieved {missing_count} additional positions using CommonPlayerInfo")
+            
+            if missing_count > 0:
+                logger.info(f"Retrieved {missing_count} additional positions using CommonPlayerInfo")
+    finally:
+        bio_cache.close()
     
     logger.info(f"Total positions retrieved: {len(player_positions)}")
     return player_positions, player_physical_stats
 
-def get_all_players_info(season_year, conn):
+@profiled
+def build_player_rows(stats_df, resolver, player_positions, player_physical_stats, season_year):
+    """
+    Columnar transform of LeagueDashPlayerStats rows into insert_players tuples.
+    Type coercion, NaN handling, team mapping and the derived metrics all run as
+    whole-column operations, so the cost stays flat for multi-season backfills.
+    """
+    names = stats_df['PLAYER_NAME']
+
+    # Height/weight/jersey from the roster data: exact name first, then normalized name
+    physical_df = pd.DataFrame.from_dict(player_physical_stats, orient='index')
+    physical_df = physical_df.reindex(columns=['height', 'weight', 'age', 'jersey_number'])
+    normalized_names = names.str.replace('.', '', regex=False).str.replace(' ', '', regex=False).str.lower()
+    has_exact = names.isin(physical_df.index).to_numpy()
+    physical = physical_df.reindex(normalized_names).reset_index(drop=True)
+    physical[has_exact] = physical_df.reindex(names[has_exact]).to_numpy()
+    physical.index = stats_df.index
+
+    # If age not in API stats, use roster age
+    age = int_column(numeric_column(stats_df, 'AGE').fillna(pd.to_numeric(physical['age'], errors='coerce')))
+    metrics = calculate_advanced_metrics_columns(stats_df)
+
+    rows = pd.DataFrame({
+        'name': names,
+        'position': names.map(player_positions),
+        'jersey_number': int_column(physical['jersey_number']),
+        'team_id': int_column(stats_df['TEAM_ID'].map(resolver.nba_team_ids)),
+        'is_starter': False,  # will be updated by update_starter_status
+        'games_played': int_column(stats_df['GP']),
+        'minutes_per_game': numeric_column(stats_df, 'MIN'),
+        'points': numeric_column(stats_df, 'PTS'),
+        'rebounds': numeric_column(stats_df, 'REB'),
+        'assists': numeric_column(stats_df, 'AST'),
+        'steals': numeric_column(stats_df, 'STL'),
+        'blocks': numeric_column(stats_df, 'BLK'),
+        'turnovers': numeric_column(stats_df, 'TOV'),
+        'field_goal_percentage': numeric_column(stats_df, 'FG_PCT'),
+        'three_point_percentage': numeric_column(stats_df, 'FG3_PCT'),
+        'free_throw_percentage': numeric_column(stats_df, 'FT_PCT'),
+        'offensive_rebounds': numeric_column(stats_df, 'OREB'),
+        'defensive_rebounds': numeric_column(stats_df, 'DREB'),
+        'field_goals_made': numeric_column(stats_df, 'FGM'),
+        'field_goals_attempted': numeric_column(stats_df, 'FGA'),
+        'three_pointers_made': numeric_column(stats_df, 'FG3M'),
+        'three_pointers_attempted': numeric_column(stats_df, 'FG3A'),
+        'free_throws_made': numeric_column(stats_df, 'FTM'),
+        'free_throws_attempted': numeric_column(stats_df, 'FTA'),
+        'plus_minus': numeric_column(stats_df, 'PLUS_MINUS'),
+        'fantasy_points': numeric_column(stats_df, 'NBA_FANTASY_PTS'),
+        'double_doubles': int_column(numeric_column(stats_df, 'DD2')),
+        'triple_doubles': int_column(numeric_column(stats_df, 'TD3')),
+        'personal_fouls': numeric_column(stats_df, 'PF'),
+        'age': age,
+        'height': physical['height'],
+        'weight': int_column(physical['weight']),
+        'efficiency_rating': metrics['efficiency_rating'],
+        'true_shooting_percentage': metrics['true_shooting_percentage'],
+        'effective_field_goal_percentage': metrics['effective_field_goal_percentage'],
+        'assist_to_turnover_ratio': metrics['assist_to_turnover_ratio'],
+        'impact_score': metrics['impact_score'],
+        'usage_rate': metrics['usage_rate'],
+        'player_efficiency_rating': metrics['player_efficiency_rating'],
+        'nba_player_id': int_column(stats_df['PLAYER_ID']),
+        'stats_season_end_year': season_year,
+    })
+
+    # Box as plain Python values with None for missing, which is what psycopg2 adapts
+    rows = rows.astype(object).where(rows.notna(), None)
+    return list(rows.itertuples(index=False, name=None))
+
+@profiled
+def get_all_players_info(season_year, conn, resolver=None, refresh_bios=None):
     """Get list of all NBA players with their stats."""
     season_str = f"{season_year-1}-{str(season_year)[-2:]}"
     logger.info(f"Fetching player stats for season {season_str}...")
     
     try:
-        # Get team ID mapping
-        team_id_map = get_team_id_mapping(conn)
-        
-        # Get all NBA teams to map API team IDs to abbreviations
-        all_teams = teams.get_teams()
-        nba_team_id_to_abbrev = {team['id']: team['abbreviation'] for team in all_teams}
+        # Team ID mapping (NBA team ID -> database ID)
+        resolver = resolver or IdentityResolver().load(conn)
         
         # Fetch player stats from NBA API first to get player IDs
-        player_stats = leaguedashplayerstats.LeagueDashPlayerStats(
+        player_stats = nba_api_request(
+            leaguedashplayerstats.LeagueDashPlayerStats,
             season=season_str,
             season_type_all_star='Regular Season',
-            per_mode_detailed='PerGame',
-            timeout=120
+            per_mode_detailed='PerGame'
         )
         stats_df = player_stats.get_data_frames()[0]
         
@@ -530,117 +2319,17 @@ def get_all_players_info(season_year, conn):
             return []
         
         # Create a mapping of player names to IDs for fallback position lookup
-        player_ids_dict = {row['PLAYER_NAME']: row['PLAYER_ID'] for _, row in stats_df.iterrows()}
-        
-        # Get player positions and physical stats from team rosters with fallback to CommonPlayerInfo
-        player_positions, player_physical_stats = get_player_positions(season_year, player_ids_dict)
+        player_ids_dict = dict(zip(stats_df['PLAYER_NAME'], stats_df['PLAYER_ID']))
+        # Current team per player, so only rosters with new/stale players are fetched
+        player_team_ids = dict(zip(stats_df['PLAYER_ID'], stats_df['TEAM_ID']))
         
-        players_data = []
+        # Get player positions and physical stats from the bio cache and team rosters,
+        # with fallback to CommonPlayerInfo
+        player_positions, player_physical_stats = get_player_positions(
+            season_year, player_ids_dict, player_team_ids, refresh=refresh_bios
+        )
         
-        for _, row in stats_df.iterrows():
-            # Get player basic info
-            player_name = row['PLAYER_NAME']
-            
-            # Map team ID to database team ID
-            nba_team_id = row.get('TEAM_ID')
-            team_abbrev = nba_team_id_to_abbrev.get(nba_team_id)
-            db_team_id = team_id_map.get(team_abbrev) if team_abbrev else None
-            
-            # Get position from roster data or fallback
-            position = player_positions.get(player_name)
-            
-            # Extract basic stats with safe conversion
-            games_played = safe_int(row.get('GP'))
-            minutes_per_game = safe_float(row.get('MIN'))
-            points = safe_float(row.get('PTS'))
-            rebounds = safe_float(row.get('REB'))
-            assists = safe_float(row.get('AST'))
-            steals = safe_float(row.get('STL'))
-            blocks = safe_float(row.get('BLK'))
-            turnovers = safe_float(row.get('TOV'))
-            field_goal_pct = safe_float(row.get('FG_PCT'))
-            three_point_pct = safe_float(row.get('FG3_PCT'))
-            free_throw_pct = safe_float(row.get('FT_PCT'))
-            
-            # Extract shooting details
-            offensive_rebounds = safe_float(row.get('OREB'))
-            defensive_rebounds = safe_float(row.get('DREB'))
-            field_goals_made = safe_float(row.get('FGM'))
-            field_goals_attempted = safe_float(row.get('FGA'))
-            three_pointers_made = safe_float(row.get('FG3M'))
-            three_pointers_attempted = safe_float(row.get('FG3A'))
-            free_throws_made = safe_float(row.get('FTM'))
-            free_throws_attempted = safe_float(row.get('FTA'))
-            
-            # Extract advanced metrics
-            plus_minus = safe_float(row.get('PLUS_MINUS'))
-            fantasy_points = safe_float(row.get('NBA_FANTASY_PTS'))
-            double_doubles = safe_int(row.get('DD2'))
-            triple_doubles = safe_int(row.get('TD3'))
-            personal_fouls = safe_float(row.get('PF'))
-            
-            # Extract player info (age from API, height/weight from cached roster data)
-            age = safe_int(row.get('AGE'))
-            
-            # Get height and weight from cached physical stats (already fetched during roster calls)
-            # Try exact match first, then try normalized name
-            physical_stats = player_physical_stats.get(player_name, {})
-            if not physical_stats:
-                # Try normalized name (remove periods and spaces, lowercase)
-                normalized_name = player_name.replace('.', '').replace(' ', '').lower()
-                physical_stats = player_physical_stats.get(normalized_name, {})
-            
-            height = physical_stats.get('height')
-            weight = physical_stats.get('weight')
-            jersey_number = physical_stats.get('jersey_number')
-            # If age not in API stats, use roster age
-            if age is None:
-                age = physical_stats.get('age')
-            
-            # Calculate advanced metrics
-            calculated_metrics = calculate_advanced_metrics(row)
-            
-            players_data.append((
-                player_name,
-                position,
-                jersey_number,
-                db_team_id,
-                False,  # is_starter - will be updated by update_starter_status.py
-                games_played,
-                minutes_per_game,
-                points,
-                rebounds,
-                assists,
-                steals,
-                blocks,
-                turnovers,
-                field_goal_pct,
-                three_point_pct,
-                free_throw_pct,
-                offensive_rebounds,
-                defensive_rebounds,
-                field_goals_made,
-                field_goals_attempted,
-                three_pointers_made,
-                three_pointers_attempted,
-                free_throws_made,
-                free_throws_attempted,
-                plus_minus,
-                fantasy_points,
-                double_doubles,
-                triple_doubles,
-                personal_fouls,
-                age,
-                height,
-                weight,
-                calculated_metrics['efficiency_rating'],
-                calculated_metrics['true_shooting_percentage'],
-                calculated_metrics['effective_field_goal_percentage'],
-                calculated_metrics['assist_to_turnover_ratio'],
-                calculated_metrics['impact_score'],
-                calculated_metrics['usage_rate'],
-                calculated_metrics['player_efficiency_rating']
-            ))
+        players_data = build_player_rows(stats_df, resolver, player_positions, player_physical_stats, season_year)
         
         logger.info(f"Found {len(players_data)} players with stats")
         return players_data
@@ -665,24 +2354,68 @@ def get_team_id_mapping(conn):
         logger.error(f"Error fetching team mapping: {e}")
     return team_map
 
-def get_recent_games(season_year, conn, limit=None):
-    """Get games from the season with team IDs. If limit is None, gets all games."""
+def pair_game_rows(games_df, resolver, limit=None):
+    """
+    Turn LeagueGameFinder team-game rows into one game tuple per GAME_ID:
+    (nba_game_id, game_date, home_team_id, away_team_id, home_score, away_score).
+
+    The two team rows of each game are pivoted side by side with a grouped cumcount,
+    home/away comes from the first row's MATCHUP ("@" marks the away team) and team
+    IDs are mapped in bulk, so the cost is linear in the number of rows. Games are
+    ordered most recent first; games without both team rows are dropped.
+    """
+    # Sort by date descending to get most recent games from the season
+    games_df = games_df.assign(GAME_DATE=pd.to_datetime(games_df['GAME_DATE']))
+    games_df = games_df.sort_values('GAME_DATE', ascending=False, kind='stable')
+    
+    # Pivot: first and second team row of each game side by side
+    row_in_game = games_df.groupby('GAME_ID', sort=False).cumcount()
+    first = games_df[row_in_game == 0].set_index('GAME_ID')
+    second = games_df[row_in_game == 1].set_index('GAME_ID')
+    pairs = first[['GAME_DATE', 'MATCHUP', 'TEAM_ID', 'PTS']].join(
+        second[['TEAM_ID', 'PTS']], rsuffix='_2', how='inner'
+    )
+    if limit:
+        pairs = pairs.head(limit)
+    
+    # MATCHUP format is "TEAM @ TEAM" for the away team, "TEAM vs. TEAM" for the home team
+    first_is_away = pairs['MATCHUP'].fillna('').str.contains('@', regex=False).to_numpy()
+    home_nba_ids = np.where(first_is_away, pairs['TEAM_ID_2'], pairs['TEAM_ID'])
+    away_nba_ids = np.where(first_is_away, pairs['TEAM_ID'], pairs['TEAM_ID_2'])
+    home_scores = np.where(first_is_away, pairs['PTS_2'], pairs['PTS'])
+    away_scores = np.where(first_is_away, pairs['PTS'], pairs['PTS_2'])
+    
+    games = pd.DataFrame({
+        'nba_game_id': pairs.index,
+        'game_date': pairs['GAME_DATE'].dt.date.to_numpy(),
+        'home_team_id': int_column(pd.Series(home_nba_ids).map(resolver.nba_team_ids)),
+        'away_team_id': int_column(pd.Series(away_nba_ids).map(resolver.nba_team_ids)),
+        'home_score': int_column(pd.Series(home_scores)),
+        'away_score': int_column(pd.Series(away_scores)),
+    })
+    games = games.astype(object).where(games.notna(), None)
+    return list(games.itertuples(index=False, name=None))
+
+@profiled
+def get_recent_games(season_year, conn, limit=None, resolver=None, date_from=None, date_to=None):
+    """
+    Get games from the season with team IDs. If limit is None, gets all games.
+    date_from/date_to (inclusive) restrict the request to a game-date window.
+    """
     season_str = f"{season_year-1}-{str(season_year)[-2:]}"
     logger.info(f"Fetching games for season {season_str}...")
     
     try:
-        # Get team ID mapping from database
-        team_id_map = get_team_id_mapping(conn)
-        
-        # Get all NBA teams to map team IDs to abbreviations
-        all_teams = teams.get_teams()
-        nba_team_abbrev_map = {team['id']: team['abbreviation'] for team in all_teams}
+        # Team ID mapping (NBA team ID -> database ID)
+        resolver = resolver or IdentityResolver().load(conn)
         
         # Use LeagueGameFinder to get games
-        game_finder = leaguegamefinder.LeagueGameFinder(
+        game_finder = nba_api_request(
+            leaguegamefinder.LeagueGameFinder,
             season_nullable=season_str,
             season_type_nullable='Regular Season',
-            timeout=120
+            date_from_nullable=date_from.strftime('%m/%d/%Y') if date_from else '',
+            date_to_nullable=date_to.strftime('%m/%d/%Y') if date_to else ''
         )
         games_df = game_finder.get_data_frames()[0]
         
@@ -690,63 +2423,7 @@ def get_recent_games(season_year, conn, limit=None):
             logger.warning("No games found for this season")
             return []
         
-        # Sort by date descending to get most recent games from the season
-        games_df['GAME_DATE'] = pd.to_datetime(games_df['GAME_DATE'])
-        games_df = games_df.sort_values('GAME_DATE', ascending=False)
-        
-        # Group by game to get unique games
-        games_data = []
-        seen_game_ids = set()
-        
-        for _, row in games_df.iterrows():
-            game_id = row['GAME_ID']
-            
-            if game_id not in seen_game_ids:
-                seen_game_ids.add(game_id)
-                
-                # Get both teams for this game
-                game_rows = games_df[games_df['GAME_ID'] == game_id]
-                
-                if len(game_rows) >= 2:
-                    row1 = game_rows.iloc[0]
-                    row2 = game_rows.iloc[1]
-                    
-                    # Map team IDs to database IDs using abbreviations
-                    team1_abbrev = nba_team_abbrev_map.get(row1['TEAM_ID'], None)
-                    team2_abbrev = nba_team_abbrev_map.get(row2['TEAM_ID'], None)
-                    
-                    team1_db_id = team_id_map.get(team1_abbrev)
-                    team2_db_id = team_id_map.get(team2_abbrev)
-                    
-                    # Determine home/away based on matchup string if available
-                    # In NBA API, the home team is typically the second one or can be inferred from MATCHUP
-                    # MATCHUP format is usually "TEAM @ TEAM" where @ indicates away team
-                    matchup = row1.get('MATCHUP', '')
-                    if '@' in matchup:
-                        # row1 is away team, row2 is home team
-                        home_team_id = team2_db_id
-                        away_team_id = team1_db_id
-                        home_score = int(row2['PTS'])
-                        away_score = int(row1['PTS'])
-                    else:
-                        # row1 is home team, row2 is away team
-                        home_team_id = team1_db_id
-                        away_team_id = team2_db_id
-                        home_score = int(row1['PTS'])
-                        away_score = int(row2['PTS'])
-                    
-                    games_data.append((
-                        game_id,  # NBA game ID
-                        row1['GAME_DATE'].date(),
-                        home_team_id,
-                        away_team_id,
-                        home_score,
-                        away_score
-                    ))
-                
-                # Only break if limit is set
-                if limit and len(games_data) >= limit:
-                    break
+        games_data = pair_game_rows(games_df, resolver, limit=limit)
         
         logger.info(f"Found {len(games_data)} games from season {season_str}")
         return games_data
@@ -755,204 +2432,277 @@ def get_recent_games(season_year, conn, limit=None):
         logger.error(f"Error fetching games: {e}")
         return []
 
-def get_box_scores_for_game(nba_game_id, db_game_id, conn, max_retries=3):
-    """Fetch box scores for a specific game from NBA API with retry logic."""
+@profiled
+def get_box_scores_for_game(nba_game_id, db_game_id, conn, max_retries=3, resolver=None):
+    """
+    Fetch box scores for a specific game from NBA API; retries are paced by the shared
+    adaptive limiter. Errors are raised, so callers count the game as failed and leave
+    it to be fetched again instead of recording it as done.
+    """
+    box_score = nba_api_request(
+        boxscoretraditionalv2.BoxScoreTraditionalV2,
+        max_attempts=max_retries,
+        game_id=nba_game_id
+    )
+    player_stats = box_score.get_data_frames()[0]
     
-    for attempt in range(max_retries):
-        try:
-            # Exponential backoff for rate limiting
-            if attempt > 0:
-                wait_time = 2 ** attempt  # 2, 4, 8 seconds
-                logger.debug(f"Retry {attempt + 1}/{max_retries} for game {nba_game_id}, waiting {wait_time}s")
-                time.sleep(wait_time)
-            else:
-                time.sleep(0.8)  # Increased base rate limit
-            
-            box_score = boxscoretraditionalv2.BoxScoreTraditionalV2(
-                game_id=nba_game_id,
-                timeout=120
-            )
-            player_stats = box_score.get_data_frames()[0]
-            
-            if player_stats.empty:
-                logger.debug(f"No box score data for game {nba_game_id}")
-                return []
-            
-            # Get player name to database ID mapping
-            with conn.cursor() as cur:
-                cur.execute("SELECT id, name FROM players")
-                player_name_to_id = {row[1]: row[0] for row in cur.fetchall()}
-                
-                # Get team abbreviation to ID mapping
-                cur.execute("SELECT id, abbreviation FROM teams")
-                team_abbrev_to_id = {row[1]: row[0] for row in cur.fetchall()}
-            
-            # Get NBA team ID to abbreviation mapping
-            all_teams = teams.get_teams()
-            nba_team_id_to_abbrev = {team['id']: team['abbreviation'] for team in all_teams}
-            
-            box_scores_data = []
-            
-            for _, row in player_stats.iterrows():
-                player_name = row['PLAYER_NAME']
-                player_db_id = player_name_to_id.get(player_name)
-                
-                if not player_db_id:
-                    logger.debug(f"Player not found in database: {player_name}")
-                    continue
-                
-                # Get team database ID
-                nba_team_id = row['TEAM_ID']
-                team_abbrev = nba_team_id_to_abbrev.get(nba_team_id)
-                team_db_id = team_abbrev_to_id.get(team_abbrev)
-                
-                if not team_db_id:
-                    logger.debug(f"Team not found for player {player_name}")
-                    continue
-                
-                # Extract stats
-                minutes = row.get('MIN')
-                is_starter = str(row.get('START_POSITION', '')).strip() != ''
-                
-                box_score_entry = (
-                    db_game_id,
-                    player_db_id,
-                    team_db_id,
-                    minutes,
-                    safe_int(row.get('PTS')),
-                    safe_int(row.get('REB')),
-                    safe_int(row.get('AST')),
-                    safe_int(row.get('STL')),
-                    safe_int(row.get('BLK')),
-                    safe_int(row.get('TO')),
-                    safe_int(row.get('FGM')),
-                    safe_int(row.get('FGA')),
-                    safe_int(row.get('FG3M')),
-                    safe_int(row.get('FG3A')),
-                    safe_int(row.get('FTM')),
-                    safe_int(row.get('FTA')),
-                    safe_int(row.get('PLUS_MINUS')),
-                    is_starter
-                )
-                box_scores_data.append(box_score_entry)
-            
-            return box_scores_data
-            
-        except (ConnectionError, TimeoutError, Exception) as e:
-            error_msg = str(e)
-            if attempt < max_retries - 1:
-                # Retry on connection/timeout errors
-                if 'timeout' in error_msg.lower() or 'connection' in error_msg.lower():
-                    logger.warning(f"Attempt {attempt + 1} failed for game {nba_game_id}: {error_msg}")
-                    continue
-            # Final attempt or non-retryable error
-            logger.warning(f"Error fetching box score for game {nba_game_id} after {attempt + 1} attempts: {e}")
-            return []
+    if player_stats.empty:
+        logger.debug(f"No box score data for game {nba_game_id}")
+        return []
+    
+    # Player/team ID mappings (loaded once per run when a resolver is passed in)
+    resolver = resolver or IdentityResolver().load(conn)
+    
+    box_scores_data = []
+    
+    for _, row in player_stats.iterrows():
+        player_name = row['PLAYER_NAME']
+        player_db_id = resolver.player_id(player_name, row['PLAYER_ID'])
+        
+        if not player_db_id:
+            logger.debug(f"Player not found in database: {player_name}")
+            continue
+        
+        # Get team database ID
+        team_db_id = resolver.team_id_for_nba(row['TEAM_ID'])
+        
+        if not team_db_id:
+            logger.debug(f"Team not found for player {player_name}")
+            continue
+        
+        # Extract stats
+        minutes = row.get('MIN')
+        is_starter = str(row.get('START_POSITION', '')).strip() != ''
+        
+        box_score_entry = (
+            db_game_id,
+            player_db_id,
+            team_db_id,
+            minutes,
+            safe_int(row.get('PTS')),
+            safe_int(row.get('REB')),
+            safe_int(row.get('AST')),
+            safe_int(row.get('STL')),
+            safe_int(row.get('BLK')),
+            safe_int(row.get('TO')),
+            safe_int(row.get('FGM')),
+            safe_int(row.get('FGA')),
+            safe_int(row.get('FG3M')),
+            safe_int(row.get('FG3A')),
+            safe_int(row.get('FTM')),
+            safe_int(row.get('FTA')),
+            safe_int(row.get('PLUS_MINUS')),
+            is_starter
+        )
+        box_scores_data.append(box_score_entry)
     
-    return []  # All retries exhausted
+    return box_scores_data
+
+@profiled
+def get_season_box_scores(season_year, conn, game_id_map, date_from=None, resolver=None, date_to=None):
+    """
+    Fetch every player-game row of the season with a single LeagueGameLog request.
+    If date_from/date_to are given, only games in that (inclusive) window are requested.
+
+    Returns a dict of NBA game ID -> list of box score tuples in the same layout
+    get_box_scores_for_game produces. Only games present in game_id_map (NBA game
+    ID -> database game ID) are included; games the log does not cover are absent,
+    so callers can fall back to get_box_scores_for_game for them.
+
+    The game log has no START_POSITION column, so is_starter is left as None and
+    insert_box_scores keeps whatever starter flag is already stored; starter status
+    comes from get_recent_starts instead.
+    """
+    season_str = f"{season_year-1}-{str(season_year)[-2:]}"
+    logger.info(f"Fetching season player game logs for {season_str}...")
+
+    game_log = nba_api_request(
+        leaguegamelog.LeagueGameLog,
+        season=season_str,
+        player_or_team_abbreviation='P',
+        season_type_all_star='Regular Season',
+        date_from_nullable=date_from.strftime('%m/%d/%Y') if date_from else '',
+        date_to_nullable=date_to.strftime('%m/%d/%Y') if date_to else ''
+    )
+    log_df = game_log.get_data_frames()[0]
+
+    if log_df.empty:
+        logger.warning("No player game logs found for this season")
+        return {}
+
+    resolver = resolver or IdentityResolver().load(conn)
+
+    box_scores_by_game = {}
+    skipped_rows = 0
+
+    for row in log_df.to_dict('records'):
+        db_game_id = game_id_map.get(row['GAME_ID'])
+        if db_game_id is None:
+            continue
+
+        player_db_id = resolver.player_id(row['PLAYER_NAME'], row.get('PLAYER_ID'))
+        team_db_id = resolver.team_id_for_nba(row['TEAM_ID'])
+        if not player_db_id or not team_db_id:
+            skipped_rows += 1
+            continue
+
+        box_scores_by_game.setdefault(row['GAME_ID'], []).append((
+            db_game_id,
+            player_db_id,
+            team_db_id,
+            format_minutes(row.get('MIN')),
+            safe_int(row.get('PTS')),
+            safe_int(row.get('REB')),
+            safe_int(row.get('AST')),
+            safe_int(row.get('STL')),
+            safe_int(row.get('BLK')),
+            safe_int(row.get('TOV')),
+            safe_int(row.get('FGM')),
+            safe_int(row.get('FGA')),
+            safe_int(row.get('FG3M')),
+            safe_int(row.get('FG3A')),
+            safe_int(row.get('FTM')),
+            safe_int(row.get('FTA')),
+            safe_int(row.get('PLUS_MINUS')),
+            None  # is_starter - not available in the season game log
+        ))
+
+    if skipped_rows:
+        logger.debug(f"Skipped {skipped_rows} game log rows with unknown players or teams")
+    logger.info(f"Season game log covers {len(box_scores_by_game)} games ({len(log_df)} player-game rows)")
+    return box_scores_by_game
+
+def get_box_score_sync_state(conn):
+    """
+    Find which games already have box scores with one set-based query.
+    Returns (set of database game IDs with box_scores rows, latest game_date among them).
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT g.id, g.game_date
+            FROM games g
+            WHERE EXISTS (SELECT 1 FROM box_scores b WHERE b.game_id = g.id)
+        """)
+        rows = cur.fetchall()
+    synced_game_ids = {row[0] for row in rows}
+    last_synced_date = max((row[1] for row in rows), default=None)
+    return synced_game_ids, last_synced_date
 
 # ----------------------------------------------------------------------
 # STARTER STATUS UPDATE
 # ----------------------------------------------------------------------
-def update_starter_status(conn, season_year, num_games=50):
+def season_date_range(season_year):
+    """[start, end) game_date bounds for the season ending in season_year."""
+    return datetime.date(season_year - 1, 8, 1), datetime.date(season_year, 8, 1)
+
+@profiled
+def get_recent_starts(season_year, num_games=None):
+    """
+    Games played and games started by each player over the last num_games games of
+    the season (LastNGames counts team games), from two season-level
+    LeagueDashPlayerStats requests: all games, and StarterBench=Starters.
+    The season game log has no START_POSITION, so this replaces per-game box score
+    requests. Returns {nba_player_id: (games, starts)}.
+    """
+    num_games = num_games or STARTER_STATUS_GAMES
+    season_str = f"{season_year-1}-{str(season_year)[-2:]}"
+
+    def games_played(starter_bench=''):
+        stats = nba_api_request(
+            leaguedashplayerstats.LeagueDashPlayerStats,
+            season=season_str,
+            season_type_all_star='Regular Season',
+            per_mode_detailed='Totals',
+            last_n_games=num_games,
+            starter_bench_nullable=starter_bench
+        ).get_data_frames()[0]
+        if stats.empty:
+            return {}
+        return dict(zip(stats['PLAYER_ID'].astype('int64'), stats['GP'].astype('int64')))
+
+    games, starts = games_played(), games_played('Starters')
+    return {int(player_id): (int(count), int(starts.get(player_id, 0))) for player_id, count in games.items()}
+
+@profiled
+def update_starter_status(conn, season_year, num_games=None):
     """
-    Determine and update which players are starters based on recent games.
-    Uses boxscore START_POSITION field to identify starters.
+    Determine and update which players are starters: a player is a starter when they
+    started >= 70% of their last num_games games (default STARTER_STATUS_GAMES,
+    minimum 3 games). In BOX_SCORE_MODE=season the counts come from
+    get_recent_starts (two requests however many games were synced); in per_game
+    mode from the starter flags of the stored box scores, with no API calls.
+    One set-based UPDATE either way.
     """
-    logger.info(f"Updating starter status from recent {num_games} games...")
+    num_games = num_games or STARTER_STATUS_GAMES
+    logger.info(f"Updating starter status from each player's last {num_games} games...")
+    
+    # Determine starters (>=70% of games started, min 3 games)
+    threshold = 0.7
+    min_games = 3
     
     try:
-        # Get recent game IDs
-        season_str = f"{season_year-1}-{str(season_year)[-2:]}"
-        game_finder = leaguegamefinder.LeagueGameFinder(
-            season_nullable=season_str,
-            season_type_nullable='Regular Season',
-            timeout=120
-        )
-        games_df = game_finder.get_data_frames()[0]
-        
-        if games_df.empty:
-            logger.warning("No games found for starter analysis")
-            return
-        
-        game_ids = games_df['GAME_ID'].unique()[:num_games]
-        logger.info(f"Analyzing {len(game_ids)} games for starter information...")
+        season_start, season_end = season_date_range(season_year)
+        params = {
+            "season_year": season_year,
+            "season_start": season_start,
+            "season_end": season_end,
+            "num_games": num_games,
+            "min_games": min_games,
+            "threshold": threshold,
+        }
+        if BOX_SCORE_MODE == "season":
+            recent_starts = get_recent_starts(season_year, num_games=num_games)
+            params["nba_player_ids"] = list(recent_starts)
+            params["games"] = [games for games, _ in recent_starts.values()]
+            params["starts"] = [starts for _, starts in recent_starts.values()]
+            starters_sql = """
+                starters AS (
+                    SELECT p.id AS player_id
+                    FROM unnest(%(nba_player_ids)s::bigint[], %(games)s::int[], %(starts)s::int[])
+                         AS r (nba_player_id, games, starts)
+                    JOIN players p ON p.nba_player_id = r.nba_player_id
+                    WHERE r.games >= %(min_games)s AND r.starts >= %(threshold)s * r.games
+                )
+            """
+        else:
+            starters_sql = """
+                recent AS (
+                    SELECT b.player_id, b.is_starter,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY b.player_id ORDER BY g.game_date DESC, g.id DESC
+                           ) AS game_rank
+                    FROM box_scores b
+                    JOIN games g ON g.id = b.game_id
+                    WHERE b.is_starter IS NOT NULL
+                      AND g.game_date >= %(season_start)s AND g.game_date < %(season_end)s
+                ),
+                starters AS (
+                    SELECT player_id
+                    FROM recent
+                    WHERE game_rank <= %(num_games)s
+                    GROUP BY player_id
+                    HAVING COUNT(*) >= %(min_games)s
+                       AND COUNT(*) FILTER (WHERE is_starter) >= %(threshold)s * COUNT(*)
+                )
+            """
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                WITH {starters_sql}
+                UPDATE players
+                SET is_starter = (id IN (SELECT player_id FROM starters))
+                WHERE is_starter IS DISTINCT FROM (id IN (SELECT player_id FROM starters))
+                  -- Only players whose stored stats are from this season
+                  AND (stats_season_end_year IS NULL OR stats_season_end_year = %(season_year)s)
+            """, params)
+            changed_count = cur.rowcount
+            
+            # Report results
+            cur.execute("SELECT COUNT(*) FILTER (WHERE is_starter), COUNT(*) FROM players")
+            starter_count, total_count = cur.fetchone()
+        conn.commit()
         
-        # Track starter counts
-        starter_counts = {}
-        games_analyzed = 0
-        
-        for i, game_id in enumerate(game_ids):
-            try:
-                # Rate limiting
-                if i > 0 and i % 10 == 0:
-                    logger.info(f"Processed {i}/{len(game_ids)} games...")
-                    time.sleep(2)
-                elif i > 0:
-                    time.sleep(0.6)
-                
-                # Fetch boxscore
-                boxscore = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id, timeout=120)
-                player_stats = boxscore.get_data_frames()[0]
-                
-                if player_stats.empty:
-                    continue
-                
-                games_analyzed += 1
-                
-                # Check each player's START_POSITION
-                for _, row in player_stats.iterrows():
-                    player_name = row.get('PLAYER_NAME')
-                    start_position = row.get('START_POSITION', '')
-                    
-                    if player_name:
-                        if player_name not in starter_counts:
-                            starter_counts[player_name] = {'started': 0, 'total': 0}
-                        
-                        starter_counts[player_name]['total'] += 1
-                        # START_POSITION is non-empty for starters (e.g., 'F', 'C', 'G')
-                        if start_position and start_position.strip():
-                            starter_counts[player_name]['started'] += 1
-                
-            except Exception as e:
-                logger.warning(f"Error processing game {game_id}: {e}")
-                continue
-        
-        logger.info(f"Analyzed {games_analyzed} games, found data for {len(starter_counts)} players")
-        
-        # Determine starters (>=70% of games started, min 3 games)
-        threshold = 0.7
-        min_games = 3
-        
-        # First, set all players to non-starter
-        with conn.cursor() as cur:
-            cur.execute("UPDATE players SET is_starter = FALSE")
-        
-        # Update starters
-        starters_to_update = []
-        for player_name, counts in starter_counts.items():
-            if counts['total'] >= min_games:
-                starter_percentage = counts['started'] / counts['total']
-                if starter_percentage >= threshold:
-                    starters_to_update.append((player_name,))
-        
-        if starters_to_update:
-            with conn.cursor() as cur:
-                execute_batch(cur, 
-                    "UPDATE players SET is_starter = TRUE WHERE name = %s",
-                    starters_to_update
-                )
-        
-        conn.commit()
-        
-        # Report results
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM players WHERE is_starter = TRUE")
-            starter_count = cur.fetchone()[0]
-            cur.execute("SELECT COUNT(*) FROM players")
-            total_count = cur.fetchone()[0]
-        
-        logger.info(f"✅ Updated starter status: {starter_count} starters out of {total_count} players")
+        logger.info(f"✅ Updated starter status: {starter_count} starters out of {total_count} players ({changed_count} changed)")
+        return changed_count
         
     except Exception as e:
         logger.error(f"Error updating starter status: {e}")
@@ -961,118 +2711,673 @@ def update_starter_status(conn, season_year, num_games=50):
         raise
 
 # ----------------------------------------------------------------------
-# MAIN SCRAPER LOGIC
+# RUN CHECKPOINT JOURNAL
 # ----------------------------------------------------------------------
-def scrape_and_store():
-    """Main scraping function with comprehensive error handling."""
-    conn = None
-    try:
-        conn = get_connection()
-        
-        # --- 1. Team standings (for records) ---
-        logger.info("Fetching team standings...")
+class SyncCheckpoint:
+    """
+    Durable SQLite journal for scrape_and_store runs.
+
+    Records every completed stage, the games stage's output and each game whose box
+    scores were committed, so a run that dies midway (crashed background thread,
+    EC2 restart) resumes where it stopped instead of starting again at standings.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CHECKPOINT_PATH
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Backfill worker processes share the journal; wait for each other's writes
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS sync_runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                season_end_year INTEGER NOT NULL,
+                started_at TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS completed_stages (
+                run_id INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, stage)
+            );
+            CREATE TABLE IF NOT EXISTS run_games (
+                run_id INTEGER NOT NULL,
+                db_game_id INTEGER NOT NULL,
+                nba_game_id TEXT NOT NULL,
+                game_date TEXT NOT NULL,
+                PRIMARY KEY (run_id, nba_game_id)
+            );
+            CREATE TABLE IF NOT EXISTS completed_games (
+                run_id INTEGER NOT NULL,
+                nba_game_id TEXT NOT NULL,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, nba_game_id)
+            );
+        """)
+        # Journals written before runs could be scoped to stages/dates are all full runs
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(sync_runs)")}
+        if "scope" not in columns:
+            with self._db:
+                self._db.execute("ALTER TABLE sync_runs ADD COLUMN scope TEXT NOT NULL DEFAULT 'full'")
+        self.run_id = None
+        self.resumed = False
+
+    def begin(self, season_end_year, resume=True, scope="full"):
+        """
+        Resume the latest unfinished run for the season with the same scope (see
+        describe_sync_scope), or start a new one. A partial run never resumes a full
+        one or vice versa, since their completed stages mean different things.
+        """
+        row = None
+        if resume:
+            row = self._db.execute(
+                "SELECT run_id FROM sync_runs WHERE season_end_year = ? AND scope = ? AND finished_at IS NULL ORDER BY run_id DESC LIMIT 1",
+                (season_end_year, scope)
+            ).fetchone()
+        if row:
+            self.run_id = row[0]
+            self.resumed = True
+        else:
+            with self._db:
+                cur = self._db.execute(
+                    "INSERT INTO sync_runs (season_end_year, started_at, scope) VALUES (?, ?, ?)",
+                    (season_end_year, datetime.datetime.now().isoformat(), scope)
+                )
+            self.run_id = cur.lastrowid
+            self.resumed = False
+        return self
+
+    def completed_stages(self):
+        rows = self._db.execute("SELECT stage FROM completed_stages WHERE run_id = ?", (self.run_id,))
+        return {row[0] for row in rows}
+
+    def stage_done(self, stage):
+        return stage in self.completed_stages()
+
+    def mark_stage_done(self, stage):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completed_stages (run_id, stage, completed_at) VALUES (?, ?, ?)",
+                (self.run_id, stage, datetime.datetime.now().isoformat())
+            )
+
+    def save_games(self, completed_games):
+        """Store the games stage output and mark the stage done in one transaction."""
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO run_games (run_id, db_game_id, nba_game_id, game_date) VALUES (?, ?, ?, ?)",
+                [(self.run_id, db_id, nba_id, game_date.isoformat()) for db_id, nba_id, game_date in completed_games]
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO completed_stages (run_id, stage, completed_at) VALUES (?, 'games', ?)",
+                (self.run_id, datetime.datetime.now().isoformat())
+            )
+
+    def load_games(self):
+        """Completed games saved by the games stage, as (db_id, nba_id, game_date) tuples."""
+        rows = self._db.execute(
+            "SELECT db_game_id, nba_game_id, game_date FROM run_games WHERE run_id = ? ORDER BY game_date DESC",
+            (self.run_id,)
+        )
+        return [(row[0], row[1], datetime.date.fromisoformat(row[2])) for row in rows]
+
+    def completed_game_ids(self):
+        rows = self._db.execute("SELECT nba_game_id FROM completed_games WHERE run_id = ?", (self.run_id,))
+        return {row[0] for row in rows}
+
+    def mark_games_done(self, nba_game_ids):
+        now = datetime.datetime.now().isoformat()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO completed_games (run_id, nba_game_id, completed_at) VALUES (?, ?, ?)",
+                [(self.run_id, nba_game_id, now) for nba_game_id in nba_game_ids]
+            )
+
+    def finish(self):
+        with self._db:
+            self._db.execute(
+                "UPDATE sync_runs SET finished_at = ? WHERE run_id = ?",
+                (datetime.datetime.now().isoformat(), self.run_id)
+            )
+
+    def close(self):
+        self._db.close()
+
+# ----------------------------------------------------------------------
+# SYNC PROGRESS AND CANCELLATION
+# ----------------------------------------------------------------------
+class SyncCancelled(Exception):
+    """Raised inside scrape_and_store once its SyncProgress has been cancelled."""
+
+class SyncProgress:
+    """
+    Thread-safe progress of one scrape_and_store run: current stage with per-stage
+    timings, games processed out of total, rows written per table and the NBA API
+    calls made on its behalf (counted through current_sync_progress).
+    Also carries the cooperative cancel flag, checked between stages and games.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.stage = None
+        self.stages = {}
+        self.games_total = 0
+        self.games_processed = 0
+        self.rows_written = {}
+        self.profile_report = None
+        self.api_calls = 0
+
+    def _touch(self):
+        self.updated_at = time.time()
+
+    def begin_stage(self, stage):
+        with self._lock:
+            self.stage = stage
+            self.stages[stage] = {"status": "running", "started_at": time.time(), "finished_at": None}
+            self._touch()
+
+    def end_stage(self, stage, status="done"):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"started_at": time.time()})
+            entry["status"] = status
+            entry["finished_at"] = time.time()
+            self._touch()
+        if status not in ("skipped", "not_selected"):
+            SYNC_STAGE_SECONDS.observe(entry["finished_at"] - entry["started_at"], stage=stage, status=status)
+
+    def set_games_total(self, total):
+        with self._lock:
+            self.games_total = total
+            self.games_processed = 0
+            self._touch()
+
+    def games_done(self, count=1):
+        with self._lock:
+            self.games_processed += count
+            self._touch()
+
+    def add_rows(self, table, count):
+        with self._lock:
+            self.rows_written[table] = self.rows_written.get(table, 0) + count
+            self._touch()
+
+    def count_api_call(self):
+        """One NBA API request sent (or replayed) on behalf of this run."""
+        with self._lock:
+            self.api_calls += 1
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise SyncCancelled("sync cancelled")
+
+    def snapshot(self):
+        with self._lock:
+            now = time.time()
+            elapsed = max(now - self.started_at, 1e-6)
+            api_calls = self.api_calls
+            rows_total = sum(self.rows_written.values())
+            return {
+                "stage": self.stage,
+                "stages": {
+                    stage: {
+                        "status": entry["status"],
+                        "elapsed_seconds": round((entry["finished_at"] or now) - entry["started_at"], 1),
+                    }
+                    for stage, entry in self.stages.items()
+                },
+                "games_processed": self.games_processed,
+                "games_total": self.games_total,
+                "rows_written": dict(self.rows_written),
+                "api_calls": api_calls,
+                "elapsed_seconds": round(elapsed, 1),
+                "seconds_since_progress": round(now - self.updated_at, 1),
+                "throughput": {
+                    "games_per_minute": round(self.games_processed / elapsed * 60, 2),
+                    "rows_per_second": round(rows_total / elapsed, 2),
+                    "api_calls_per_second": round(api_calls / elapsed, 3),
+                },
+                "cancel_requested": self._cancel.is_set(),
+                "profile_report": self.profile_report,
+            }
+
+# ----------------------------------------------------------------------
+# SYNC STAGES
+# ----------------------------------------------------------------------
+SYNC_STAGES = ("teams", "players", "games", "box_scores", "starters", "aggregates")
+
+def parse_sync_scope(stages=None, date_from=None, date_to=None):
+    """
+    Normalize a stage selection and game-date window given on the CLI or API.
+    stages is a list or comma-separated string of SYNC_STAGES (default all), dates
+    are ISO strings or dates. Returns (stages in pipeline order, date_from, date_to)
+    and raises ValueError on unknown stages or bad dates.
+    """
+    if isinstance(stages, str):
+        stages = [stage.strip() for stage in stages.split(",") if stage.strip()]
+    stages = set(stages or SYNC_STAGES)
+    unknown = stages - set(SYNC_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown sync stage(s) {', '.join(sorted(unknown))}; expected any of {', '.join(SYNC_STAGES)}")
+    
+    def parse_date(value, name):
+        if not value or isinstance(value, datetime.date):
+            return value or None
         try:
-            teams_data = get_team_standings(SEASON_END_YEAR)
-            insert_teams(conn, teams_data)
-            conn.commit()
-            logger.info(f"✅ Team records updated - {len(teams_data)} teams")
-        except Exception as e:
-            logger.error(f"Failed to fetch/insert team standings: {e}")
-            if conn:
-                conn.rollback()
-            raise
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a YYYY-MM-DD date, got {value!r}")
+    
+    date_from = parse_date(date_from, "date_from")
+    date_to = parse_date(date_to, "date_to")
+    if date_from and date_to and date_from > date_to:
+        raise ValueError(f"date_from {date_from} is after date_to {date_to}")
+    return tuple(stage for stage in SYNC_STAGES if stage in stages), date_from, date_to
 
-        # --- 2. Player information ---
-        logger.info("Fetching player information...")
+def describe_sync_scope(stages, date_from=None, date_to=None):
+    """Checkpoint key for a run's scope; "full" for the whole pipeline over the whole season."""
+    if tuple(stages) == SYNC_STAGES and not date_from and not date_to:
+        return "full"
+    return f"stages={','.join(stages)};from={date_from or ''};to={date_to or ''}"
+
+@profiled
+def sync_teams(conn, season_year, resolver, progress=None):
+    """Stage 1: team standings."""
+    progress = progress or SyncProgress()
+    teams_data = get_team_standings(season_year)
+    insert_teams(conn, teams_data)
+    conn.commit()
+    progress.add_rows("teams", len(teams_data))
+    resolver.refresh_teams(conn)
+    logger.info(f"✅ Team records updated - {len(teams_data)} teams")
+
+@profiled
+def sync_players(conn, season_year, resolver, refresh_bios=None, progress=None):
+    """Stage 2: player information and season stats."""
+    progress = progress or SyncProgress()
+    players_data = get_all_players_info(season_year, conn, resolver=resolver, refresh_bios=refresh_bios)
+    insert_players(conn, players_data)
+    conn.commit()
+    progress.add_rows("players", len(players_data))
+    resolver.refresh_players(conn)
+    logger.info(f"✅ Inserted {len(players_data)} players")
+
+@profiled
+def sync_games(conn, season_year, resolver, progress=None, date_from=None, date_to=None):
+    """
+    Stage 3: all games of the season, or of the date_from..date_to window.
+    Returns completed games as (db_id, nba_id, game_date) tuples.
+    """
+    progress = progress or SyncProgress()
+    games_data = get_recent_games(season_year, conn, limit=None, resolver=resolver,
+                                  date_from=date_from, date_to=date_to)  # No limit = all games
+    if not games_data:
+        logger.warning("No games found for this season")
+        return []
+    game_ids, nba_game_ids = insert_games(conn, games_data)
+    conn.commit()
+    progress.add_rows("games", len(games_data))
+    logger.info(f"✅ Inserted {len(games_data)} games")
+
+    # Filter to only completed games (where home_score and away_score are not None)
+    return [
+        (db_id, nba_id, game_tuple[1]) for db_id, nba_id, game_tuple in zip(game_ids, nba_game_ids, games_data)
+        if game_tuple[4] is not None and game_tuple[5] is not None  # home_score and away_score
+    ]
+
+def load_completed_games(conn, season_year, date_from=None, date_to=None):
+    """
+    Completed games already stored for the season (optionally within a date window),
+    as (db_id, nba_id, game_date) tuples - used when the games stage is not run.
+    """
+    season_start, season_end = season_date_range(season_year)
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT id, nba_game_id, game_date
+            FROM games
+            WHERE game_date >= %s AND game_date < %s
+              AND (%s::date IS NULL OR game_date >= %s::date)
+              AND (%s::date IS NULL OR game_date <= %s::date)
+              AND nba_game_id IS NOT NULL
+              AND home_score IS NOT NULL AND away_score IS NOT NULL
+            ORDER BY game_date DESC
+        """, (season_start, season_end, date_from, date_from, date_to, date_to))
+        return [tuple(row) for row in cur.fetchall()]
+
+@profiled
+def sync_box_scores(conn, season_year, completed_games, checkpoint, resolver, incremental=True, progress=None):
+    """
+    Stage 4: box scores for completed games.
+    Games already journaled by this run are skipped, and in incremental mode so are
+    games whose box scores are already stored. Every committed game is journaled.
+    Raises SyncCancelled between games once progress is cancelled.
+    """
+    progress = progress or SyncProgress()
+    total_games = len(completed_games)
+    done_game_ids = checkpoint.completed_game_ids()
+    if done_game_ids:
+        completed_games = [game for game in completed_games if game[1] not in done_game_ids]
+        logger.info(f"♻️  {len(done_game_ids)} games already completed in this run, {len(completed_games)} remaining")
+    game_dates = {db_id: game_date for db_id, _, game_date in completed_games}
+
+    # Incremental mode: skip games whose box scores are already stored
+    if incremental:
+        synced_game_ids, last_synced_date = get_box_score_sync_state(conn)
+        completed_games = [
+            (db_id, nba_id, game_date) for db_id, nba_id, game_date in completed_games
+            if db_id not in synced_game_ids or (last_synced_date and game_date > last_synced_date)
+        ]
+        logger.info(f"Incremental sync: {len(completed_games)} games need box scores (last synced game date: {last_synced_date})")
+
+    box_scores_inserted = 0
+    progress.set_games_total(len(completed_games))
+    progress.check_cancelled()
+
+    # --- 4a. Bulk box scores from the season game log ---
+    if BOX_SCORE_MODE == "season" and completed_games:
         try:
-            players_data = get_all_players_info(SEASON_END_YEAR, conn)
-            insert_players(conn, players_data)
-            conn.commit()
-            logger.info(f"✅ Inserted {len(players_data)} players")
+            game_id_map = {nba_id: db_id for db_id, nba_id, _ in completed_games}
+            # Only ask the game log for the date range we actually need
+            needed_dates = [game_dates[db_id] for db_id, _, _ in completed_games]
+            season_box_scores = get_season_box_scores(season_year, conn, game_id_map, date_from=min(needed_dates),
+                                                      date_to=max(needed_dates), resolver=resolver)
+            season_rows = [entry for rows in season_box_scores.values() for entry in rows]
+            if season_rows:
+                insert_box_scores(conn, season_rows)
+                conn.commit()
+                checkpoint.mark_games_done(season_box_scores.keys())
+                box_scores_inserted += len(season_rows)
+                progress.add_rows("box_scores", len(season_rows))
+                progress.games_done(len(season_box_scores))
+            # Only games the season log did not cover go through the per-game path
+            completed_games = [game for game in completed_games if game[1] not in season_box_scores]
+            logger.info(f"✅ Inserted {len(season_rows)} box scores from the season game log, {len(completed_games)} games left for per-game fallback")
         except Exception as e:
-            logger.error(f"Failed to fetch/insert players: {e}")
+            logger.error(f"Season game log ingestion failed, falling back to per-game box scores: {e}")
             if conn:
                 conn.rollback()
-            # Continue without failing completely
-            logger.warning("Continuing without complete player data...")
 
-        # --- 3. All games from the season ---
-        logger.info("Fetching all games from the season...")
+    # --- 4b. Fetch box scores for each remaining completed game ---
+    logger.info(f"Fetching box scores for {len(completed_games)} completed games (out of {total_games} total)...")
+    logger.info(f"⏱️  This will take approximately {len(completed_games) / api_pacer.current_rate / 60:.1f} minutes at {api_pacer.current_rate:.2f} requests/sec with {NBA_API_WORKERS} workers...")
+    failed_games = 0
+
+    def fetch_game_box_scores(game):
+        db_game_id, nba_game_id, _ = game
+        return get_box_scores_for_game(nba_game_id, db_game_id, conn, max_retries=3, resolver=resolver)
+
+    # Fetches run on the worker pool; inserts stay on this thread's connection
+    for i, ((db_game_id, nba_game_id, _), box_scores, error) in enumerate(
+            fetch_concurrently(fetch_game_box_scores, completed_games)):
+        # Leaving the loop cancels the fetches that have not started yet
+        progress.check_cancelled()
+        progress.games_done()
         try:
-            games_data = get_recent_games(SEASON_END_YEAR, conn, limit=None)  # No limit = all games
-            if games_data:
-                game_ids, nba_game_ids = insert_games(conn, games_data)
+            # Progress indicator every 50 games
+            if i > 0 and i % 50 == 0:
+                logger.info(f"  Progress: {i}/{len(completed_games)} games processed ({box_scores_inserted} box scores inserted, {failed_games} failures)")
+
+            if error:
+                raise error
+            if box_scores:
+                insert_box_scores(conn, box_scores)
                 conn.commit()
-                logger.info(f"✅ Inserted {len(games_data)} games")
-                
-                # Filter to only completed games (where home_score and away_score are not None)
-                completed_games = [
-                    (db_id, nba_id) for db_id, nba_id, game_tuple in zip(game_ids, nba_game_ids, games_data)
-                    if game_tuple[4] is not None and game_tuple[5] is not None  # home_score and away_score
-                ]
-                
-                # --- 3a. Fetch box scores for each completed game ---
-                # RESUME FROM SPECIFIC GAME (set to 0 to start from beginning)
-                START_FROM_GAME = 1356  # Resume from game 1357 (0-indexed, so 1356)
-                
-                logger.info(f"Fetching box scores for {len(completed_games)} completed games (out of {len(games_data)} total)...")
-                if START_FROM_GAME > 0:
-                    logger.info(f"⚠️  RESUMING from game {START_FROM_GAME + 1} (skipping first {START_FROM_GAME} games)")
-                logger.info(f"⏱️  This will take approximately {(len(completed_games) - START_FROM_GAME) * 1.5 / 60:.1f} minutes with rate limiting...")
-                box_scores_inserted = 0
-                failed_games = 0
-                
-                for i, (db_game_id, nba_game_id) in enumerate(completed_games):
-                    # Skip games before START_FROM_GAME
-                    if i < START_FROM_GAME:
-                        continue
-                    
-                    try:
-                        # Progress indicator every 50 games
-                        if i > 0 and i % 50 == 0:
-                            logger.info(f"  Progress: {i}/{len(completed_games)} games processed ({box_scores_inserted} box scores inserted, {failed_games} failures)")
-                        
-                        box_scores = get_box_scores_for_game(nba_game_id, db_game_id, conn, max_retries=3)
-                        if box_scores:
-                            insert_box_scores(conn, box_scores)
-                            conn.commit()
-                            box_scores_inserted += len(box_scores)
-                            if (i + 1) % 10 == 0:  # Log every 10th successful game
-                                logger.info(f"  Game {i+1}/{len(completed_games)}: Inserted {len(box_scores)} box scores")
-                        else:
-                            failed_games += 1
-                            if (i + 1) % 20 == 0:  # Log failures less frequently
-                                logger.debug(f"  Game {i+1}/{len(completed_games)}: No box scores found")
-                    except Exception as e:
-                        failed_games += 1
-                        logger.error(f"  Game {i+1}/{len(completed_games)} (NBA ID: {nba_game_id}): Failed to fetch box scores - {e}")
-                        if conn:
-                            conn.rollback()
-                        continue
-                
-                logger.info(f"✅ Inserted {box_scores_inserted} total box scores across {len(completed_games)} completed games")
+                checkpoint.mark_games_done([nba_game_id])
+                box_scores_inserted += len(box_scores)
+                progress.add_rows("box_scores", len(box_scores))
+                if (i + 1) % 10 == 0:  # Log every 10th successful game
+                    logger.info(f"  Game {i+1}/{len(completed_games)}: Inserted {len(box_scores)} box scores")
             else:
-                logger.warning("No games found for this season")
+                failed_games += 1
+                if (i + 1) % 20 == 0:  # Log failures less frequently
+                    logger.debug(f"  Game {i+1}/{len(completed_games)}: No box scores found")
         except Exception as e:
-            logger.error(f"Failed to fetch/insert games: {e}")
+            failed_games += 1
+            logger.error(f"  Game {i+1}/{len(completed_games)} (NBA ID: {nba_game_id}): Failed to fetch box scores - {e}")
             if conn:
                 conn.rollback()
-            # Continue without failing completely
-            logger.warning("Continuing without game data...")
+            continue
 
-        # --- 4. Update starter status ---
-        logger.info("Updating player starter status...")
-        try:
-            update_starter_status(conn, SEASON_END_YEAR, num_games=50)
-        except Exception as e:
-            logger.error(f"Failed to update starter status: {e}")
-            if conn:
-                conn.rollback()
-            # Continue without failing completely
-            logger.warning("Continuing without starter status updates...")
+    logger.info(f"✅ Inserted {box_scores_inserted} total box scores across {total_games} completed games")
+    if failed_games:
+        # Failed games are not journaled, so the next sync fetches them again
+        logger.warning(f"⚠️  {failed_games} games failed or returned no box scores; they will be retried on the next sync")
+
+@profiled
+def sync_aggregates(conn, season_year, progress=None):
+    """
+    Stage 6: refresh season aggregates for the players and teams whose box scores
+    changed. The first time a season has no aggregates, all of it is queued.
+    """
+    progress = progress or SyncProgress()
+    with conn.cursor() as cur:
+        cur.execute("SELECT EXISTS (SELECT 1 FROM player_season_stats WHERE season_end_year = %s)", (season_year,))
+        built = cur.fetchone()[0]
+    if not built:
+        logger.info(f"Building season aggregates for {season_year} from all stored box scores")
+        enqueue_season_aggregates(conn, season_year)
+        conn.commit()
+    refreshed = refresh_season_aggregates(conn)
+    for table, count in refreshed.items():
+        progress.add_rows(table, count)
+    return refreshed
+
+# ----------------------------------------------------------------------
+# MAIN SCRAPER LOGIC
+# ----------------------------------------------------------------------
+def scrape_and_store(incremental=None, resume=True, refresh_bios=None, season_end_year=None, progress=None,
+                     stages=None, date_from=None, date_to=None, profile=None):
+    """
+    Main scraping function with comprehensive error handling.
+    incremental defaults to INCREMENTAL_SYNC; when enabled only games without stored
+    box scores (or newer than the last synced game date) are fetched.
+    With resume=True an unfinished run recorded in the checkpoint journal is picked
+    up where it stopped; completed stages and games are not fetched again.
+    refresh_bios=True refetches every player bio instead of using the bio cache
+    (defaults to PLAYER_BIO_REFRESH).
+    season_end_year defaults to the most recently completed season (SEASON_END_YEAR).
+    progress (a SyncProgress) is updated as the run advances; cancelling it stops the
+    run between stages or games with SyncCancelled, leaving the run resumable.
+    stages limits the run to a subset of SYNC_STAGES, and date_from/date_to limit
+    the games and box_scores stages to a game-date window (player and starter stages
+    are season-wide). With a window, incremental defaults to False so the window's
+    box scores are refetched. Box scores without the games stage use stored games.
+    profile (defaults to SYNC_PROFILE) turns on run profiling; the report path is
+    logged and set on progress.profile_report.
+    """
+    stages, date_from, date_to = parse_sync_scope(stages, date_from, date_to)
+    profile = parse_profile_mode(SYNC_PROFILE if profile is None else profile)
+    if incremental is None:
+        incremental = INCREMENTAL_SYNC and not (date_from or date_to)
+    season_end_year = season_end_year or SEASON_END_YEAR
+    progress = progress or SyncProgress()
+    scope = describe_sync_scope(stages, date_from, date_to)
+    if scope != "full":
+        logger.info(f"Running partial sync ({scope})")
+    checkpoint = SyncCheckpoint().begin(season_end_year, resume=resume, scope=scope)
+    if checkpoint.resumed:
+        completed = ", ".join(stage for stage in SYNC_STAGES if checkpoint.stage_done(stage)) or "none"
+        logger.info(f"♻️  Resuming sync run {checkpoint.run_id} (completed stages: {completed})")
+    profiler = RunProfiler(profile).start() if profile else None
+    progress_token = current_sync_progress.set(progress)
+    conn = None
+    try:
+        conn = db_pool.getconn()
+        ensure_schema(conn)
+        # Player/team ID mappings shared by every stage of this run
+        resolver = IdentityResolver().load(conn)
+        
+        # --- 1. Team standings (for records) ---
+        progress.check_cancelled()
+        progress.begin_stage("teams")
+        if "teams" not in stages:
+            progress.end_stage("teams", "not_selected")
+        elif checkpoint.stage_done("teams"):
+            logger.info("⏭️  Team standings already synced in this run")
+            progress.end_stage("teams", "skipped")
+        else:
+            logger.info("Fetching team standings...")
+            try:
+                sync_teams(conn, season_end_year, resolver, progress=progress)
+                checkpoint.mark_stage_done("teams")
+                progress.end_stage("teams")
+            except Exception as e:
+                logger.error(f"Failed to fetch/insert team standings: {e}")
+                progress.end_stage("teams", "failed")
+                if conn:
+                    conn.rollback()
+                raise
+
+        # --- 2. Player information ---
+        progress.check_cancelled()
+        progress.begin_stage("players")
+        if "players" not in stages:
+            progress.end_stage("players", "not_selected")
+        elif checkpoint.stage_done("players"):
+            logger.info("⏭️  Player information already synced in this run")
+            progress.end_stage("players", "skipped")
+        else:
+            logger.info("Fetching player information...")
+            try:
+                sync_players(conn, season_end_year, resolver, refresh_bios=refresh_bios, progress=progress)
+                checkpoint.mark_stage_done("players")
+                progress.end_stage("players")
+            except Exception as e:
+                logger.error(f"Failed to fetch/insert players: {e}")
+                progress.end_stage("players", "failed")
+                if conn:
+                    conn.rollback()
+                # Continue without failing completely
+                logger.warning("Continuing without complete player data...")
 
+        # --- 3. All games from the season ---
+        completed_games = None
+        progress.check_cancelled()
+        progress.begin_stage("games")
+        if "games" not in stages:
+            progress.end_stage("games", "not_selected")
+        elif checkpoint.stage_done("games"):
+            completed_games = checkpoint.load_games()
+            logger.info(f"⏭️  Games already synced in this run ({len(completed_games)} completed games)")
+            progress.end_stage("games", "skipped")
+        else:
+            logger.info("Fetching all games from the season...")
+            try:
+                completed_games = sync_games(conn, season_end_year, resolver, progress=progress,
+                                             date_from=date_from, date_to=date_to)
+                checkpoint.save_games(completed_games)
+                progress.end_stage("games")
+            except Exception as e:
+                logger.error(f"Failed to fetch/insert games: {e}")
+                progress.end_stage("games", "failed")
+                if conn:
+                    conn.rollback()
+                # Continue without failing completely
+                logger.warning("Continuing without game data...")
+
+        # --- 4. Box scores for each completed game ---
+        progress.check_cancelled()
+        progress.begin_stage("box_scores")
+        if "box_scores" not in stages:
+            progress.end_stage("box_scores", "not_selected")
+        elif checkpoint.stage_done("box_scores"):
+            logger.info("⏭️  Box scores already synced in this run")
+            progress.end_stage("box_scores", "skipped")
+        elif completed_games is None and "games" in stages:
+            logger.warning("Skipping box scores without game data")
+            progress.end_stage("box_scores", "skipped")
+        else:
+            try:
+                if completed_games is None:
+                    # Games stage not selected: use the games already stored
+                    completed_games = load_completed_games(conn, season_end_year, date_from, date_to)
+                    logger.info(f"Using {len(completed_games)} stored completed games")
+                sync_box_scores(conn, season_end_year, completed_games, checkpoint, resolver,
+                                incremental=incremental, progress=progress)
+                checkpoint.mark_stage_done("box_scores")
+                progress.end_stage("box_scores")
+            except SyncCancelled:
+                progress.end_stage("box_scores", "cancelled")
+                raise
+            except Exception as e:
+                logger.error(f"Failed to fetch/insert box scores: {e}")
+                progress.end_stage("box_scores", "failed")
+                if conn:
+                    conn.rollback()
+                # Continue without failing completely
+                logger.warning("Continuing without box score data...")
+
+        # --- 5. Update starter status ---
+        progress.check_cancelled()
+        progress.begin_stage("starters")
+        if "starters" not in stages:
+            progress.end_stage("starters", "not_selected")
+        elif checkpoint.stage_done("starters"):
+            logger.info("⏭️  Starter status already updated in this run")
+            progress.end_stage("starters", "skipped")
+        else:
+            logger.info("Updating player starter status...")
+            try:
+                changed_count = update_starter_status(conn, season_end_year)
+                progress.add_rows("players", changed_count)
+                checkpoint.mark_stage_done("starters")
+                progress.end_stage("starters")
+            except Exception as e:
+                logger.error(f"Failed to update starter status: {e}")
+                progress.end_stage("starters", "failed")
+                if conn:
+                    conn.rollback()
+                # Continue without failing completely
+                logger.warning("Continuing without starter status updates...")
+
+        # --- 6. Refresh season aggregates ---
+        progress.check_cancelled()
+        progress.begin_stage("aggregates")
+        if "aggregates" not in stages:
+            progress.end_stage("aggregates", "not_selected")
+        elif checkpoint.stage_done("aggregates"):
+            logger.info("⏭️  Season aggregates already refreshed in this run")
+            progress.end_stage("aggregates", "skipped")
+        else:
+            logger.info("Refreshing season aggregates...")
+            try:
+                sync_aggregates(conn, season_end_year, progress=progress)
+                checkpoint.mark_stage_done("aggregates")
+                progress.end_stage("aggregates")
+            except Exception as e:
+                logger.error(f"Failed to refresh season aggregates: {e}")
+                progress.end_stage("aggregates", "failed")
+                if conn:
+                    conn.rollback()
+                # Queued refreshes stay queued for the next run
+                logger.warning("Continuing without season aggregate updates...")
+
+        checkpoint.finish()
         logger.info("✅ All core data loaded successfully.")
 
+        if EXPORT_AFTER_SYNC:
+            try:
+                export_season(conn, season_end_year)
+            except Exception as e:
+                # The database is the source of truth; a failed export is retried next sync
+                logger.warning(f"Columnar export failed: {e}")
+
+    except SyncCancelled:
+        logger.warning(f"🛑 Sync cancelled during {progress.stage or 'startup'}; the run can be resumed from its checkpoint")
+        if conn:
+            conn.rollback()
+        raise
     except Exception as e:
         logger.error(f"Scraping failed: {e}")
         if conn:
@@ -1080,11 +3385,588 @@ def scrape_and_store():
         raise
     finally:
         if conn:
-            conn.close()
+            db_pool.putconn(conn)
+        if profiler:
+            profiler.stop()
+            label = f"sync-{season_end_year}-run{checkpoint.run_id}-{datetime.datetime.now():%Y%m%d-%H%M%S}"
+            try:
+                progress.profile_report = profiler.write_report(
+                    label, extra={"season_end_year": season_end_year, "scope": scope, "progress": progress.snapshot()})
+                logger.info(f"⏱️  Profile report written to {progress.profile_report}")
+            except Exception as e:
+                logger.warning(f"Could not write profile report: {e}")
+        checkpoint.close()
+        current_sync_progress.reset(progress_token)
+
+# ----------------------------------------------------------------------
+# LIVE GAME POLLING
+# ----------------------------------------------------------------------
+GAME_STATUS_SCHEDULED, GAME_STATUS_LIVE, GAME_STATUS_FINAL = 1, 2, 3
+
+def live_game_date():
+    """The NBA game day in progress: Eastern date, rolling over at 6am so late games stay on their day."""
+    return (datetime.datetime.now(ZoneInfo("America/New_York")) - datetime.timedelta(hours=6)).date()
+
+def parse_game_clock(value):
+    """Seconds left in the period from ScoreboardV2's LIVE_PC_TIME ("4:32" or "32.1"), or None."""
+    value = str(value or "").strip()
+    if not value:
+        return None
+    try:
+        if ":" in value:
+            minutes, seconds = value.split(":", 1)
+            return int(minutes) * 60 + float(seconds)
+        return float(value)
+    except ValueError:
+        return None
+
+def stat_line_digest(row):
+    """Change-detection hash of one box score row (numbers normalized so DB rows compare equal)."""
+    normalized = tuple(float(value) if isinstance(value, (int, float)) and not isinstance(value, bool)
+                       else value for value in row)
+    return hashlib.blake2b(repr(normalized).encode(), digest_size=16).digest()
+
+class LiveGamePoller:
+    """
+    Game-night polling mode. Watches the day's ScoreboardV2, refetches box scores of
+    live (and just-finished) games at an adaptive interval, and writes only player
+    rows whose stat line changed since the last poll through insert_box_scores.
+    """
+
+    def __init__(self, interval=None, clutch_interval=None, idle_interval=None, final_polls=None):
+        self.interval = interval or LIVE_POLL_INTERVAL
+        self.clutch_interval = clutch_interval or LIVE_POLL_CLUTCH_INTERVAL
+        self.idle_interval = idle_interval or LIVE_POLL_IDLE_INTERVAL
+        self.final_polls = LIVE_POLL_FINAL_POLLS if final_polls is None else final_polls
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._game_date = None
+        self._seeded = set()      # db game IDs whose stored rows have been hashed
+        self._row_digests = {}    # (db_game_id, player_id) -> digest of the stored stat line
+        self._game_digests = {}   # nba_game_id -> digest of the stored games row
+        self._final_polls_done = {}  # nba_game_id -> polls since the game went final
+        self.stats = {
+            "polls": 0, "live_games": 0, "rows_fetched": 0, "rows_written": 0,
+            "games_written": 0, "errors": 0, "last_poll_at": None, "next_poll_in": None,
+        }
+
+    def _reset_day(self, game_date):
+        self._game_date = game_date
+        self._seeded.clear()
+        self._row_digests.clear()
+        self._game_digests.clear()
+        self._final_polls_done.clear()
+
+    def _seed_digests(self, conn, db_game_ids):
+        """Hash rows already stored for newly tracked games, so a restart does not rewrite them."""
+        new_ids = [db_id for db_id in db_game_ids if db_id not in self._seeded]
+        if not new_ids:
+            return
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT {', '.join(BOX_SCORE_COLUMNS)} FROM box_scores WHERE game_id = ANY(%s)",
+                (new_ids,)
+            )
+            for row in cur.fetchall():
+                self._row_digests[(row[0], row[1])] = stat_line_digest(row)
+        self._seeded.update(new_ids)
+
+    def poll_once(self, conn, resolver, game_date=None):
+        """Run one poll; returns the number of seconds to wait before the next one."""
+        game_date = game_date or live_game_date()
+        if game_date != self._game_date:
+            self._reset_day(game_date)
+        
+        scoreboard = nba_api_request(scoreboardv2.ScoreboardV2, game_date=game_date.isoformat())
+        games = scoreboard.game_header.get_data_frame().drop_duplicates('GAME_ID').to_dict('records')
+        line_df = scoreboard.line_score.get_data_frame()
+        points = {(row['GAME_ID'], row['TEAM_ID']): safe_int(row['PTS']) for row in line_df.to_dict('records')}
+        
+        game_rows, tracked, clutch = [], [], False
+        for game in games:
+            status = safe_int(game['GAME_STATUS_ID'])
+            nba_game_id = game['GAME_ID']
+            if status not in (GAME_STATUS_LIVE, GAME_STATUS_FINAL):
+                continue
+            if status == GAME_STATUS_FINAL:
+                done = self._final_polls_done.get(nba_game_id, 0)
+                if done >= self.final_polls:
+                    continue
+                self._final_polls_done[nba_game_id] = done + 1
+            else:
+                seconds_left = parse_game_clock(game.get('LIVE_PC_TIME'))
+                if (safe_int(game.get('LIVE_PERIOD')) or 0) >= 4 and seconds_left is not None \
+                        and seconds_left <= LIVE_POLL_CLUTCH_SECONDS:
+                    clutch = True
+            home_id, away_id = game['HOME_TEAM_ID'], game['VISITOR_TEAM_ID']
+            final = status == GAME_STATUS_FINAL
+            # Scores are only stored once final; a scored game counts as completed for the season sync
+            game_rows.append((
+                nba_game_id, game_date,
+                resolver.team_id_for_nba(home_id), resolver.team_id_for_nba(away_id),
+                points.get((nba_game_id, home_id)) if final else None,
+                points.get((nba_game_id, away_id)) if final else None,
+            ))
+            tracked.append(nba_game_id)
+        
+        live_games = sum(1 for game in games if safe_int(game['GAME_STATUS_ID']) == GAME_STATUS_LIVE)
+        rows_fetched = rows_written = games_written = 0
+        if game_rows:
+            changed_games = [row for row in game_rows if self._game_digests.get(row[0]) != stat_line_digest(row)]
+            if changed_games:
+                insert_games(conn, changed_games)
+                games_written = len(changed_games)
+                for row in changed_games:
+                    self._game_digests[row[0]] = stat_line_digest(row)
+            with conn.cursor() as cur:
+                cur.execute("SELECT nba_game_id, id FROM games WHERE nba_game_id = ANY(%s)", (tracked,))
+                db_ids = dict(cur.fetchall())
+            self._seed_digests(conn, db_ids.values())
+            
+            def fetch_live_box_scores(nba_game_id):
+                return get_box_scores_for_game(nba_game_id, db_ids[nba_game_id], conn, resolver=resolver)
+            
+            changed_rows = []
+            for nba_game_id, box_scores, error in fetch_concurrently(fetch_live_box_scores, [g for g in tracked if g in db_ids]):
+                if error:
+                    logger.warning(f"Live box score fetch failed for {nba_game_id}: {error}")
+                    continue
+                rows_fetched += len(box_scores)
+                for row in box_scores:
+                    digest = stat_line_digest(row)
+                    if self._row_digests.get((row[0], row[1])) != digest:
+                        changed_rows.append((row, digest))
+            if changed_rows:
+                insert_box_scores(conn, [row for row, _ in changed_rows])
+                for row, digest in changed_rows:
+                    self._row_digests[(row[0], row[1])] = digest
+                rows_written = len(changed_rows)
+                # Only the players and teams in the changed rows are recomputed
+                refresh_season_aggregates(conn)
+        
+        if clutch:
+            wait = self.clutch_interval
+        elif live_games or any(done < self.final_polls for done in self._final_polls_done.values()):
+            wait = self.interval
+        else:
+            wait = self.idle_interval
+        
+        with self._lock:
+            self.stats["polls"] += 1
+            self.stats["live_games"] = live_games
+            self.stats["rows_fetched"] += rows_fetched
+            self.stats["rows_written"] += rows_written
+            self.stats["games_written"] += games_written
+            self.stats["last_poll_at"] = datetime.datetime.now().isoformat()
+            self.stats["next_poll_in"] = wait
+        if tracked:
+            logger.info(f"🔴 Live poll: {live_games} live, {len(tracked)} tracked, {rows_written}/{rows_fetched} rows changed, next poll in {wait:.0f}s")
+        return wait
+
+    def run(self, max_polls=None):
+        """Poll until stop() is called (or max_polls polls have run)."""
+        logger.info("🔴 Live game polling started")
+        resolver = None
+        polls = 0
+        while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+            try:
+                # A fresh checkout per poll: the pool health-checks connections idle between polls
+                with db_pool.connection() as conn:
+                    if resolver is None:
+                        ensure_schema(conn)
+                        resolver = IdentityResolver().load(conn)
+                    wait = self.poll_once(conn, resolver)
+            except Exception as e:
+                logger.error(f"Live poll failed: {e}")
+                with self._lock:
+                    self.stats["errors"] += 1
+                wait = self.interval
+            polls += 1
+            self._stop.wait(wait)
+        logger.info("🔴 Live game polling stopped")
+
+    def start(self):
+        """Run in a daemon thread."""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self):
+        with self._lock:
+            return {"running": self.running, "game_date": self._game_date and self._game_date.isoformat(), **self.stats}
+
+# ----------------------------------------------------------------------
+# COLUMNAR EXPORT
+# ----------------------------------------------------------------------
+EXPORT_FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+BOX_SCORE_EXPORT_QUERY = """
+    SELECT g.game_date, g.nba_game_id, bs.game_id, t.abbreviation AS team, bs.team_id,
+           p.nba_player_id, bs.player_id, p.name AS player_name, bs.is_starter, bs.minutes_played,
+           bs.points, bs.rebounds, bs.assists, bs.steals, bs.blocks, bs.turnovers,
+           bs.field_goals_made, bs.field_goals_attempted, bs.three_pointers_made,
+           bs.three_pointers_attempted, bs.free_throws_made, bs.free_throws_attempted, bs.plus_minus
+    FROM box_scores bs
+    JOIN games g ON g.id = bs.game_id
+    JOIN players p ON p.id = bs.player_id
+    JOIN teams t ON t.id = bs.team_id
+    WHERE g.game_date = ANY(%s::date[])
+    ORDER BY g.game_date, bs.game_id, bs.team_id, bs.player_id
+"""
+
+# Postgres type OIDs -> Arrow types, so every partition has the same schema even
+# when a column is entirely NULL on one game date
+ARROW_TYPES_BY_OID = {
+    16: "bool_", 20: "int64", 21: "int64", 23: "int64", 700: "float64", 701: "float64", 1082: "date32",
+}
+
+export_lock = threading.Lock()
+
+class ExportManifest:
+    """SQLite record of exported partitions and the content fingerprint each was written from."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "export_manifest.sqlite3"), timeout=30)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS partitions (
+                dataset TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                partition TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                exported_at REAL NOT NULL,
+                PRIMARY KEY (dataset, season, partition)
+            )
+        """)
+
+    def fingerprints(self, dataset, season):
+        rows = self._db.execute(
+            "SELECT partition, fingerprint FROM partitions WHERE dataset = ? AND season = ?", (dataset, season)
+        )
+        return dict(rows)
+
+    def record(self, dataset, season, partition, fingerprint, row_count):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO partitions VALUES (?, ?, ?, ?, ?, ?)",
+                (dataset, season, partition, fingerprint, row_count, time.time())
+            )
+
+    def forget(self, dataset, season, partition):
+        with self._db:
+            self._db.execute(
+                "DELETE FROM partitions WHERE dataset = ? AND season = ? AND partition = ?", (dataset, season, partition)
+            )
+
+    def summary(self):
+        rows = self._db.execute("""
+            SELECT dataset, season, COUNT(*), SUM(row_count), MAX(exported_at)
+            FROM partitions GROUP BY dataset, season ORDER BY dataset, season
+        """)
+        return [
+            {"dataset": dataset, "season_end_year": season, "partitions": partitions, "rows": row_count,
+             "last_exported_at": datetime.datetime.fromtimestamp(exported_at).isoformat()}
+            for dataset, season, partitions, row_count, exported_at in rows
+        ]
+
+    def close(self):
+        self._db.close()
+
+def arrow_table(description, rows):
+    """Build an Arrow table column by column from a cursor's description and rows."""
+    columns = list(zip(*rows)) if rows else [()] * len(description)
+    fields = [
+        pa.field(column.name, getattr(pa, ARROW_TYPES_BY_OID.get(column.type_code, "string"))())
+        for column in description
+    ]
+    return pa.table([pa.array(list(values), type=field.type) for values, field in zip(columns, fields)],
+                    schema=pa.schema(fields))
+
+def export_path(directory, fmt, dataset, season, partition):
+    return os.path.join(directory, fmt, dataset, str(season), f"{partition}.{EXPORT_FILE_EXTENSIONS[fmt]}")
+
+def write_export_files(table, directory, formats, dataset, season, partition):
+    """Write one partition in every format, each atomically via a temp file."""
+    for fmt in formats:
+        path = export_path(directory, fmt, dataset, season, partition)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        if fmt == "parquet":
+            pq.write_table(table, tmp_path, compression=EXPORT_PARQUET_COMPRESSION)
+        else:
+            # Uncompressed IPC file: pa.memory_map + pa.ipc.open_file reads it without copying
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+def remove_export_files(directory, formats, dataset, season, partition):
+    for fmt in formats:
+        try:
+            os.remove(export_path(directory, fmt, dataset, season, partition))
+        except FileNotFoundError:
+            pass
+
+@profiled
+def export_season(conn, season_end_year, full=False, formats=None, directory=None):
+    """
+    Export a season's box scores (one partition per game date) and player season stats
+    to <EXPORT_DIR>/<format>/<dataset>/<season>/<partition>.<ext>. Only game dates whose
+    box scores changed since the last export are rewritten (full=True rewrites all);
+    dates no longer in the database are removed. Returns a summary dict.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for the columnar export (pip install pyarrow)")
+    formats = tuple(formats or EXPORT_FORMATS)
+    unknown = set(formats) - set(EXPORT_FILE_EXTENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown export format(s) {', '.join(sorted(unknown))}; expected parquet and/or arrow")
+    directory = directory or EXPORT_DIR
+    season_start, season_end = season_date_range(season_end_year)
+    format_key = ",".join(sorted(formats))
+    summary = {"season_end_year": season_end_year, "formats": list(formats), "game_dates_written": 0,
+               "game_dates_unchanged": 0, "game_dates_removed": 0, "box_score_rows": 0, "player_rows": 0}
+
+    with export_lock:
+        manifest = ExportManifest(directory)
+        try:
+            # --- Box scores: fingerprint every game date in one aggregate query ---
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT g.game_date, md5(string_agg(bs::text, ',' ORDER BY bs.id))
+                    FROM box_scores bs
+                    JOIN games g ON g.id = bs.game_id
+                    WHERE g.game_date >= %s AND g.game_date < %s
+                    GROUP BY g.game_date
+                """, (season_start, season_end))
+                current = {game_date.isoformat(): f"{format_key}:{digest}" for game_date, digest in cur.fetchall()}
+            exported = {} if full else manifest.fingerprints("box_scores", season_end_year)
+            changed = sorted(game_date for game_date, fingerprint in current.items()
+                             if exported.get(game_date) != fingerprint)
+            summary["game_dates_unchanged"] = len(current) - len(changed)
+
+            if changed:
+                with conn.cursor() as cur:
+                    cur.execute(BOX_SCORE_EXPORT_QUERY, (changed,))
+                    description = cur.description
+                    rows_by_date = {}
+                    for row in cur.fetchall():
+                        rows_by_date.setdefault(row[0].isoformat(), []).append(row)
+                for game_date in changed:
+                    rows = rows_by_date.get(game_date, [])
+                    write_export_files(arrow_table(description, rows), directory, formats,
+                                       "box_scores", season_end_year, game_date)
+                    manifest.record("box_scores", season_end_year, game_date, current[game_date], len(rows))
+                    summary["box_score_rows"] += len(rows)
+                summary["game_dates_written"] = len(changed)
+
+            for game_date in set(manifest.fingerprints("box_scores", season_end_year)) - set(current):
+                remove_export_files(directory, formats, "box_scores", season_end_year, game_date)
+                manifest.forget("box_scores", season_end_year, game_date)
+                summary["game_dates_removed"] += 1
+
+            # --- Player season stats: one small partition per season ---
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT md5(string_agg(p::text, ',' ORDER BY p.id))
+                    FROM players p WHERE p.stats_season_end_year = %s
+                """, (season_end_year,))
+                fingerprint = f"{format_key}:{cur.fetchone()[0]}"
+                if full or manifest.fingerprints("players", season_end_year).get("players") != fingerprint:
+                    cur.execute(f"""
+                        SELECT p.nba_player_id, p.id AS player_id, p.name, t.abbreviation AS team, p.team_id,
+                               {", ".join(f"p.{column}" for column in PLAYER_COLUMNS
+                                          if column not in ("name", "team_id", "nba_player_id"))}
+                        FROM players p
+                        LEFT JOIN teams t ON t.id = p.team_id
+                        WHERE p.stats_season_end_year = %s
+                        ORDER BY p.id
+                    """, (season_end_year,))
+                    rows = cur.fetchall()
+                    write_export_files(arrow_table(cur.description, rows), directory, formats,
+                                       "players", season_end_year, "players")
+                    manifest.record("players", season_end_year, "players", fingerprint, len(rows))
+                    summary["player_rows"] = len(rows)
+            conn.rollback()
+        finally:
+            manifest.close()
+
+    logger.info(f"🗂️  Exported season {season_end_year}: {summary['game_dates_written']} game dates written, "
+                f"{summary['game_dates_unchanged']} unchanged, {summary['player_rows']} player rows")
+    return summary
+
+def export_status(directory=None):
+    """Exported partitions per dataset and season, from the export manifest."""
+    manifest = ExportManifest(directory or EXPORT_DIR)
+    try:
+        return manifest.summary()
+    finally:
+        manifest.close()
+
+# ----------------------------------------------------------------------
+# OFFLINE REBUILD
+# ----------------------------------------------------------------------
+def rebuild_from_archive(seasons=None, stages=None, archive=None):
+    """
+    Repopulate teams, players, games and box_scores purely from archived payloads,
+    unpaced and without calling the NBA stats API. seasons defaults to every season
+    in the archive. The season game log is answered from the windows incremental
+    syncs archived (PayloadArchive.merge_windows). Requests missing from the archive
+    fail like API errors (stages log and continue) and are counted per season.
+    """
+    archive = archive or payload_archive or PayloadArchive()
+    seasons = sorted(seasons or archive.seasons())
+    if not seasons:
+        raise ValueError(f"No archived seasons in {archive.directory}")
+    results = []
+    with replaying_payloads(functools.partial(archive.load, merge_windows=True)):
+        for season_end_year in seasons:
+            logger.info(f"📦 Rebuilding season {season_end_year} from the payload archive")
+            started = time.monotonic()
+            misses_before = archive.misses
+            progress = SyncProgress()
+            scrape_and_store(incremental=False, resume=False, refresh_bios=False,
+                             season_end_year=season_end_year, progress=progress, stages=stages)
+            result = {
+                "season_end_year": season_end_year,
+                "elapsed_seconds": round(time.monotonic() - started, 1),
+                "rows_written": progress.snapshot()["rows_written"],
+                "archive_misses": archive.misses - misses_before,
+            }
+            if result["archive_misses"]:
+                logger.warning(f"⚠️  {result['archive_misses']} requests for {season_end_year} were not in the archive")
+            results.append(result)
+    return results
+
+# ----------------------------------------------------------------------
+# MULTI-SEASON BACKFILL
+# ----------------------------------------------------------------------
+def init_backfill_worker(bucket):
+    """Process initializer: pace this worker's nba_api calls with the shared bucket."""
+    global api_rate_limiter, api_pacer
+    api_rate_limiter = bucket
+    api_pacer = make_pacer(bucket)
+
+def backfill_season(season_end_year, incremental=None, resume=True):
+    """Sync one season inside a backfill worker process and return its summary."""
+    season_str = f"{season_end_year-1}-{str(season_end_year)[-2:]}"
+    # Tag this worker's log lines with the season it is loading
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(logging.Formatter(f"%(asctime)s - %(levelname)s - [{season_str}] %(message)s"))
+    logger.info(f"📅 Backfilling season {season_str}")
+    started = time.monotonic()
+    scrape_and_store(incremental=incremental, resume=resume, season_end_year=season_end_year)
+    return {
+        "season": season_str,
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+        "api_pacing": api_pacer.snapshot(),
+    }
+
+def backfill_seasons(first_season_end_year, last_season_end_year, workers=None, incremental=None, resume=True):
+    """
+    Load every season from first_season_end_year to last_season_end_year (inclusive)
+    through scrape_and_store, in a pool of worker processes that share one NBA API
+    rate budget. Newest seasons start first. Returns {season_end_year: summary},
+    where a failed season's summary is {"error": message}.
+    """
+    seasons = list(range(max(first_season_end_year, last_season_end_year),
+                         min(first_season_end_year, last_season_end_year) - 1, -1))
+    workers = max(1, min(workers or BACKFILL_WORKERS, len(seasons)))
+    logger.info(f"🗂️  Backfilling {len(seasons)} seasons ({seasons[-1]}-{seasons[0]}) with {workers} worker processes")
+    
+    # spawn, not fork: workers must not inherit this process's pooled connections
+    context = multiprocessing.get_context("spawn")
+    bucket = SharedTokenBucket(NBA_API_RATE, NBA_API_BURST, context=context)
+    
+    # Apply schema changes once up front rather than from every worker at the same time
+    with db_pool.connection() as conn:
+        ensure_schema(conn)
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_backfill_worker, initargs=(bucket,)) as executor:
+        futures = {
+            executor.submit(backfill_season, season, incremental, resume): season
+            for season in seasons
+        }
+        for future in as_completed(futures):
+            season = futures[future]
+            try:
+                results[season] = future.result()
+                logger.info(f"✅ Season {results[season]['season']} done in {results[season]['elapsed_seconds'] / 60:.1f} min ({len(results)}/{len(seasons)} seasons)")
+            except Exception as e:
+                results[season] = {"error": str(e)}
+                logger.error(f"❌ Season ending {season} failed: {e} ({len(results)}/{len(seasons)} seasons)")
+    
+    failed = [season for season, result in results.items() if "error" in result]
+    logger.info(f"🗂️  Backfill finished: {len(seasons) - len(failed)} seasons loaded, {len(failed)} failed {sorted(failed) if failed else ''}")
+    return results
 
 # ----------------------------------------------------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape NBA data into Postgres")
+    parser.add_argument("--backfill", nargs=2, type=int, metavar=("FIRST", "LAST"),
+                        help="load every season from FIRST to LAST (season end years, e.g. 2016 2025)")
+    parser.add_argument("--live", action="store_true",
+                        help="poll today's games and keep their box scores fresh until interrupted")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"backfill worker processes (default BACKFILL_WORKERS={BACKFILL_WORKERS})")
+    parser.add_argument("--stages", default=None,
+                        help=f"comma-separated stages to run (default all: {','.join(SYNC_STAGES)})")
+    parser.add_argument("--date-from", default=None, help="first game date (YYYY-MM-DD) for games/box_scores")
+    parser.add_argument("--date-to", default=None, help="last game date (YYYY-MM-DD) for games/box_scores")
+    parser.add_argument("--season", type=int, default=None,
+                        help=f"season end year (default {SEASON_END_YEAR})")
+    parser.add_argument("--rebuild", nargs="*", type=int, metavar="SEASON", default=None,
+                        help="rebuild the given seasons (default every archived season) from the payload archive")
+    parser.add_argument("--refresh-aggregates", action="store_true",
+                        help="rebuild the season's aggregate tables from its box scores and exit")
+    parser.add_argument("--export", action="store_true",
+                        help=f"export the season's changed game dates to {EXPORT_DIR} and exit")
+    parser.add_argument("--full-export", action="store_true", help="with --export, rewrite every partition")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=None,
+                        help=f"profile the run and write a report under {PROFILE_DIR} (default SYNC_PROFILE)")
+    args = parser.parse_args()
+    
+    try:
+        # Reject bad stage names or dates before any work starts
+        parse_sync_scope(args.stages, args.date_from, args.date_to)
+    except ValueError as e:
+        parser.error(str(e))
+    
     try:
-        scrape_and_store()
+        if args.live:
+            try:
+                LiveGamePoller().run()
+            except KeyboardInterrupt:
+                logger.info("🔴 Live game polling interrupted")
+        elif args.refresh_aggregates:
+            with db_pool.connection() as conn:
+                ensure_schema(conn)
+                enqueue_season_aggregates(conn, args.season or SEASON_END_YEAR)
+                conn.commit()
+                refresh_season_aggregates(conn)
+        elif args.export:
+            with db_pool.connection() as conn:
+                export_season(conn, args.season or SEASON_END_YEAR, full=args.full_export)
+        elif args.rebuild is not None:
+            for result in rebuild_from_archive(args.rebuild or None, stages=args.stages):
+                logger.info(f"📦 {result}")
+        elif args.backfill:
+            if args.profile:
+                # Spawned workers read their config from the environment
+                os.environ["SYNC_PROFILE"] = args.profile
+            backfill_seasons(*args.backfill, workers=args.workers)
+        else:
+            scrape_and_store(season_end_year=args.season, stages=args.stages,
+                             date_from=args.date_from, date_to=args.date_to, profile=args.profile)
     except Exception as e:
         logger.error(f"Script failed: {e}")
@@ -0,0 +1,97 @@
+"""
+Shared fixtures for the scraper tests.
+
+    cd utilities && python -m pytest tests
+
+Tests that need PostgreSQL run against TEST_DATABASE_DSN (a local, disposable
+database - its tables are truncated) and are skipped when it is unset or unreachable.
+"""
+
+import os
+import sys
+import tempfile
+
+import psycopg2
+import pytest
+
+UTILITIES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, UTILITIES_DIR)
+
+# Keep run state out of utilities/.sync_state and never archive test payloads
+os.environ["SYNC_STATE_DIR"] = tempfile.mkdtemp(prefix="basky-tests-")
+os.environ["PAYLOAD_ARCHIVE"] = "false"
+
+import benchmark_sync  # noqa: E402
+import nba_scrape_to_postgres  # noqa: E402
+
+TEST_DATABASE_DSN = os.environ.get("TEST_DATABASE_DSN")
+TEST_SCHEMA = "basky_test"
+
+class FakeClock:
+    """Stand-in for the scraper's time module: sleep() advances monotonic() instantly."""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(nba_scrape_to_postgres, "time", fake)
+    return fake
+
+@pytest.fixture
+def database_dsn():
+    if not TEST_DATABASE_DSN:
+        pytest.skip("TEST_DATABASE_DSN is not set")
+    try:
+        psycopg2.connect(TEST_DATABASE_DSN, connect_timeout=3).close()
+    except psycopg2.Error as e:
+        pytest.skip(f"TEST_DATABASE_DSN is unreachable: {e}")
+    return TEST_DATABASE_DSN
+
+@pytest.fixture
+def scratch_dsn(database_dsn):
+    """database_dsn with its search_path set to a freshly created, empty scratch schema."""
+    with psycopg2.connect(database_dsn) as conn, conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE; CREATE SCHEMA {TEST_SCHEMA}")
+    conn.close()
+    return f"{database_dsn} options='-c search_path={TEST_SCHEMA}'"
+
+@pytest.fixture
+def db_pool(scratch_dsn, monkeypatch):
+    """The scraper's pool, pointed at an empty copy of the production tables in the scratch schema."""
+    pool = nba_scrape_to_postgres.ConnectionPool(connect=lambda: psycopg2.connect(scratch_dsn))
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(benchmark_sync.BENCHMARK_SCHEMA)
+        conn.commit()
+    monkeypatch.setattr(nba_scrape_to_postgres, "db_pool", pool)
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def db(db_pool):
+    with db_pool.connection() as conn:
+        yield conn
+
+@pytest.fixture
+def sync_state(tmp_path, monkeypatch):
+    """Fresh checkpoint journal and bio cache, and nba_api pacing lifted, for full sync runs."""
+    nba = nba_scrape_to_postgres
+    monkeypatch.setattr(nba, "CHECKPOINT_PATH", str(tmp_path / "sync_checkpoint.sqlite3"))
+    monkeypatch.setattr(nba, "PLAYER_BIO_CACHE_PATH", str(tmp_path / "player_bio_cache.sqlite3"))
+    monkeypatch.setattr(nba, "api_rate_limiter", nba.TokenBucket(rate=1000.0, burst=1000))
+    return tmp_path
@@ -0,0 +1,219 @@
+"""
+A tiny, deterministic NBA stats API for tests: four teams, three players each and
+two games per day in January 2025, answering the endpoints the scraper calls with
+payloads in the stats.nba.com layout.
+
+    api = FakeNbaApi(days=6, played_through=4)
+    api.serve(monkeypatch)   # live requests (and their api_response_sinks) hit the fake
+    api.source               # or replay it through nba.api_response_source
+"""
+
+import datetime
+import json
+
+from nba_api.stats.library.http import NBAStatsHTTP, NBAStatsResponse
+
+SEASON = "2024-25"
+SEASON_END_YEAR = 2025
+TEAMS = (
+    (1610612737, "Hawks", "ATL"),
+    (1610612738, "Celtics", "BOS"),
+    (1610612751, "Nets", "BKN"),
+    (1610612766, "Hornets", "CHA"),
+)
+POSITIONS = ("G", "F", "C")
+
+def result_set(name, headers, rows):
+    return {"name": name, "headers": list(headers), "rowSet": [list(row) for row in rows]}
+
+class FakeNbaApi:
+    def __init__(self, days=6, played_through=None):
+        self.days = days
+        self.played_through = days if played_through is None else played_through
+        self.requests = []  # (endpoint, parameters) of every request answered
+        self.players = [
+            {"id": 1_900_000 + team_index * 10 + slot, "name": f"{abbreviation} Player {slot + 1}",
+             "team_id": team_id, "position": POSITIONS[slot], "starter": slot < 2}
+            for team_index, (team_id, _, abbreviation) in enumerate(TEAMS)
+            for slot in range(3)
+        ]
+
+    # ---- league ----
+    def games(self):
+        """Played games as dicts, one per GAME_ID, oldest first."""
+        games = []
+        for day in range(1, self.played_through + 1):
+            for pair in ((0, 1), (2, 3)) if day % 2 else ((1, 2), (3, 0)):
+                home, away = (TEAMS[pair[0]], TEAMS[pair[1]]) if day % 3 else (TEAMS[pair[1]], TEAMS[pair[0]])
+                games.append({"id": f"00224{len(games) + 1:05d}", "date": datetime.date(2025, 1, day),
+                              "home": home, "away": away})
+        return games
+
+    def stat_line(self, player, game):
+        seed = player["id"] % 97 + game["date"].day * 7
+        fga = 8 + seed % 9
+        fgm = fga // 2
+        fg3a = seed % 5
+        fg3m = fg3a // 2
+        fta = seed % 6
+        ftm = fta - fta // 3
+        return {
+            "MIN": 30 - seed % 12 if player["starter"] else 12 + seed % 6,
+            "FGM": fgm, "FGA": fga, "FG3M": fg3m, "FG3A": fg3a, "FTM": ftm, "FTA": fta,
+            "OREB": seed % 3, "DREB": 2 + seed % 5, "REB": seed % 3 + 2 + seed % 5,
+            "AST": seed % 8, "STL": seed % 3, "BLK": seed % 2, "TOV": seed % 4, "PF": seed % 5,
+            "PTS": 2 * fgm + fg3m + ftm, "PLUS_MINUS": seed % 11 - 5,
+        }
+
+    def player_games(self, date_from=None, date_to=None, last_n_games=0):
+        """
+        (player, game, stat line) for every player of both teams in each played game in
+        the window, or only in each team's last last_n_games games.
+        """
+        games = self.games()
+        for game in games:
+            if (date_from and game["date"] < date_from) or (date_to and game["date"] > date_to):
+                continue
+            for player in self.players:
+                if player["team_id"] not in (game["home"][0], game["away"][0]):
+                    continue
+                if last_n_games:
+                    team_games = [g for g in games if player["team_id"] in (g["home"][0], g["away"][0])]
+                    if game not in team_games[-last_n_games:]:
+                        continue
+                yield player, game, self.stat_line(player, game)
+
+    def team_points(self, game, team_id):
+        return sum(self.stat_line(player, game)["PTS"] for player in self.players if player["team_id"] == team_id)
+
+    @staticmethod
+    def matchup(game, team):
+        home, away = game["home"], game["away"]
+        return f"{home[2]} vs. {away[2]}" if team == home else f"{away[2]} @ {home[2]}"
+
+    # ---- endpoints ----
+    def respond(self, endpoint, parameters):
+        """Raw JSON text for a request, like stats.nba.com would return it."""
+        self.requests.append((endpoint, dict(parameters)))
+        season = parameters.get("Season") or parameters.get("SeasonNullable")
+        if season not in (None, SEASON):
+            result_sets = self.empty(endpoint)
+        else:
+            result_sets = getattr(self, endpoint)(parameters)
+        return json.dumps({"resource": endpoint, "parameters": parameters, "resultSets": result_sets})
+
+    def empty(self, endpoint):
+        return [{**result_set_, "rowSet": []} for result_set_ in getattr(self, endpoint)({})]
+
+    @staticmethod
+    def window(parameters):
+        def parse(value):
+            return datetime.datetime.strptime(value, "%m/%d/%Y").date() if value else None
+        return parse(parameters.get("DateFrom")), parse(parameters.get("DateTo"))
+
+    def leaguestandings(self, parameters):
+        return [result_set("Standings", ("TeamID", "TeamName"), [(team_id, name) for team_id, name, _ in TEAMS])]
+
+    def leaguedashplayerstats(self, parameters):
+        columns = ("PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "AGE", "GP", "MIN", "PTS", "REB", "AST", "STL", "BLK",
+                   "TOV", "FG_PCT", "FG3_PCT", "FT_PCT", "OREB", "DREB", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA",
+                   "PLUS_MINUS", "NBA_FANTASY_PTS", "DD2", "TD3", "PF")
+        # StarterBench splits by the player's role in each game; the fake's starters start every game
+        starter_bench = parameters.get("StarterBench")
+        last_n_games = int(parameters.get("LastNGames") or 0)
+        rows = []
+        for player in self.players:
+            if starter_bench and (starter_bench == "Starters") != player["starter"]:
+                continue
+            lines = [line for p, _, line in self.player_games(last_n_games=last_n_games) if p is player]
+            if not lines:
+                continue
+            games = len(lines)
+
+            def per_game(stat):
+                return round(sum(line[stat] for line in lines) / games, 1)
+
+            def pct(made, attempted):
+                attempts = sum(line[attempted] for line in lines)
+                return round(sum(line[made] for line in lines) / attempts, 3) if attempts else 0
+
+            rows.append((
+                player["id"], player["name"], player["team_id"], 25 + player["id"] % 10, games, per_game("MIN"),
+                per_game("PTS"), per_game("REB"), per_game("AST"), per_game("STL"), per_game("BLK"),
+                per_game("TOV"), pct("FGM", "FGA"), pct("FG3M", "FG3A"), pct("FTM", "FTA"), per_game("OREB"),
+                per_game("DREB"), per_game("FGM"), per_game("FGA"), per_game("FG3M"), per_game("FG3A"),
+                per_game("FTM"), per_game("FTA"), per_game("PLUS_MINUS"), per_game("PTS") * 1.2, 0, 0,
+                per_game("PF"),
+            ))
+        return [result_set("LeagueDashPlayerStats", columns, rows)]
+
+    def commonteamroster(self, parameters):
+        team_id = int(parameters.get("TeamID") or 0)
+        columns = ("TeamID", "PLAYER", "NUM", "POSITION", "HEIGHT", "WEIGHT", "AGE", "PLAYER_ID")
+        rows = [
+            (team_id, player["name"], str(player["id"] % 50), player["position"], "6-6", 200 + player["id"] % 40,
+             25 + player["id"] % 10, player["id"])
+            for player in self.players if player["team_id"] == team_id
+        ]
+        return [result_set("CommonTeamRoster", columns, rows), result_set("Coaches", ("TEAM_ID",), [])]
+
+    def commonplayerinfo(self, parameters):
+        player_id = int(parameters.get("PlayerID") or 0)
+        rows = [(player["id"], player["position"], "6-6", 210) for player in self.players if player["id"] == player_id]
+        return [
+            result_set("CommonPlayerInfo", ("PERSON_ID", "POSITION", "HEIGHT", "WEIGHT"), rows),
+            result_set("AvailableSeasons", ("SEASON_ID",), []),
+            result_set("PlayerHeadlineStats", ("PLAYER_ID",), []),
+        ]
+
+    def leaguegamefinder(self, parameters):
+        date_from, date_to = self.window(parameters)
+        columns = ("SEASON_ID", "TEAM_ID", "TEAM_ABBREVIATION", "GAME_ID", "GAME_DATE", "MATCHUP", "PTS")
+        rows = [
+            ("22024", team[0], team[2], game["id"], game["date"].isoformat(), self.matchup(game, team),
+             self.team_points(game, team[0]))
+            for game in self.games()
+            if not (date_from and game["date"] < date_from) and not (date_to and game["date"] > date_to)
+            for team in (game["home"], game["away"])
+        ]
+        return [result_set("LeagueGameFinderResults", columns, rows)]
+
+    def leaguegamelog(self, parameters):
+        columns = ("SEASON_ID", "PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "GAME_ID", "GAME_DATE", "MATCHUP",
+                   "MIN", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "STL",
+                   "BLK", "TOV", "PF", "PTS", "PLUS_MINUS")
+        rows = []
+        for player, game, line in self.player_games(*self.window(parameters)):
+            team = game["home"] if player["team_id"] == game["home"][0] else game["away"]
+            rows.append(("22024", player["id"], player["name"], player["team_id"], game["id"],
+                         game["date"].isoformat(), self.matchup(game, team)) + tuple(line[c] for c in columns[7:]))
+        return [result_set("LeagueGameLog", columns, rows)]
+
+    def boxscoretraditionalv2(self, parameters):
+        columns = ("GAME_ID", "TEAM_ID", "PLAYER_ID", "PLAYER_NAME", "START_POSITION", "MIN", "FGM", "FGA", "FG3M",
+                   "FG3A", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "PTS", "PLUS_MINUS")
+        rows = [
+            (game["id"], player["team_id"], player["id"], player["name"], player["position"] if player["starter"] else "",
+             f"{line['MIN']}:00") + tuple(line["TOV" if c == "TO" else c] for c in columns[6:])
+            for player, game, line in self.player_games()
+            if game["id"] == parameters.get("GameID")
+        ]
+        return [
+            result_set("PlayerStats", columns, rows),
+            result_set("TeamStarterBenchStats", ("GAME_ID",), []),
+            result_set("TeamStats", ("GAME_ID",), []),
+        ]
+
+    # ---- hooks ----
+    def source(self, endpoint):
+        """An nba.api_response_source answering from the fake league."""
+        return self.respond(endpoint.endpoint, endpoint.parameters)
+
+    def serve(self, monkeypatch):
+        """Answer live nba_api requests from the fake league for the rest of the test."""
+        api = self
+
+        def send_api_request(self, endpoint, parameters, *args, **kwargs):
+            return NBAStatsResponse(response=api.respond(endpoint, parameters), status_code=200, url=None)
+
+        monkeypatch.setattr(NBAStatsHTTP, "send_api_request", send_api_request)
@@ -0,0 +1,48 @@
+import argparse
+import json
+import os
+
+import pytest
+from nba_api.stats.library.http import NBAStatsHTTP
+
+import benchmark_sync
+import nba_scrape_to_postgres as nba
+from fake_nba_api import SEASON_END_YEAR, FakeNbaApi
+
+@pytest.fixture
+def benchmark_env(sync_state, monkeypatch):
+    # benchmark() configures the scraper through the environment and swaps its pool
+    for name in ("SYNC_STATE_DIR", "INCREMENTAL_SYNC", "PAYLOAD_ARCHIVE", "NBA_API_RATE", "NBA_API_MAX_RATE", "NBA_API_BURST"):
+        if name in os.environ:
+            monkeypatch.setenv(name, os.environ[name])
+        else:
+            monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(nba, "db_pool", nba.db_pool)
+    return sync_state
+
+def test_benchmark_records_fixtures_and_replays_them(scratch_dsn, benchmark_env, monkeypatch, capsys):
+    FakeNbaApi(days=4).serve(monkeypatch)
+    options = dict(
+        fixtures=str(benchmark_env / "fixtures"), dsn=scratch_dsn, season=SEASON_END_YEAR, stages=None,
+        date_from=None, date_to=None, api_rate=None, latency=0.0, jitter=0.0, seed=0, repeat=1,
+        output=str(benchmark_env / "report.json"), compare=None,
+    )
+    benchmark_sync.benchmark(argparse.Namespace(command="record", **options))
+
+    def offline(*args, **kwargs):
+        raise AssertionError("benchmark run called the NBA API")
+
+    monkeypatch.setattr(NBAStatsHTTP, "send_api_request", offline)
+    benchmark_sync.benchmark(argparse.Namespace(command="run", **options))
+
+    with open(options["output"]) as report_file:
+        report = json.load(report_file)
+    assert report["fixture_misses"] == 0
+    stages = report["runs"][0]["stages"]
+    assert list(stages) == list(nba.SYNC_STAGES)
+    assert {stage: metrics["status"] for stage, metrics in stages.items()} == dict.fromkeys(nba.SYNC_STAGES, "done")
+    # 4 days x 2 games x 6 players
+    assert stages["box_scores"]["rows"] == 48
+    assert stages["teams"]["api_calls"] == 1 and stages["box_scores"]["db_round_trips"] > 0
+    assert "total" in capsys.readouterr().out
+    assert nba.api_response_source is None
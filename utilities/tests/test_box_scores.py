@@ -0,0 +1,53 @@
+import datetime
+
+import pytest
+
+import nba_scrape_to_postgres as nba
+
+class RecordingCheckpoint:
+    def __init__(self):
+        self.done = set()
+
+    def completed_game_ids(self):
+        return set(self.done)
+
+    def mark_games_done(self, nba_game_ids):
+        self.done.update(nba_game_ids)
+
+class RollbackOnlyConnection:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+def test_box_score_fetch_errors_propagate(monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("malformed response")
+
+    monkeypatch.setattr(nba, "nba_api_request", fail)
+    with pytest.raises(ValueError):
+        nba.get_box_scores_for_game("0022400001", 1, conn=None)
+
+def test_failed_games_are_not_journaled(monkeypatch):
+    rows = {"0022400002": [(2, 10, 1) + (None,) * 15]}
+
+    def fetch(nba_game_id, db_game_id, conn, max_retries=3, resolver=None):
+        if nba_game_id not in rows:
+            raise ValueError("malformed response")
+        return rows[nba_game_id]
+
+    inserted = []
+    monkeypatch.setattr(nba, "BOX_SCORE_MODE", "per_game")
+    monkeypatch.setattr(nba, "get_box_scores_for_game", fetch)
+    monkeypatch.setattr(nba, "insert_box_scores", lambda conn, box_scores: inserted.extend(box_scores))
+    checkpoint = RecordingCheckpoint()
+    games = [(1, "0022400001", datetime.date(2025, 1, 5)), (2, "0022400002", datetime.date(2025, 1, 6))]
+    progress = nba.SyncProgress()
+
+    nba.sync_box_scores(RollbackOnlyConnection(), 2025, games, checkpoint, resolver=None,
+                        incremental=False, progress=progress)
+
+    assert checkpoint.done == {"0022400002"}
+    assert inserted == rows["0022400002"]
+    assert progress.snapshot()["games_processed"] == 2
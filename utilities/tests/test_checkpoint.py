@@ -0,0 +1,49 @@
+import datetime
+
+import nba_scrape_to_postgres as nba
+
+def test_checkpoint_round_trips_stages_and_games(tmp_path):
+    path = str(tmp_path / "checkpoint.sqlite3")
+    games = [(11, "0022400011", datetime.date(2025, 1, 5)), (12, "0022400012", datetime.date(2025, 1, 7))]
+
+    checkpoint = nba.SyncCheckpoint(path).begin(2025)
+    checkpoint.mark_stage_done("teams")
+    checkpoint.save_games(games)
+    checkpoint.mark_games_done(["0022400012"])
+    run_id = checkpoint.run_id
+    checkpoint.close()
+
+    resumed = nba.SyncCheckpoint(path).begin(2025)
+    assert resumed.resumed and resumed.run_id == run_id
+    assert resumed.completed_stages() == {"teams", "games"}
+    assert resumed.load_games() == sorted(games, key=lambda game: game[2], reverse=True)
+    assert resumed.completed_game_ids() == {"0022400012"}
+    resumed.close()
+
+def test_finished_run_is_not_resumed(tmp_path):
+    path = str(tmp_path / "checkpoint.sqlite3")
+    checkpoint = nba.SyncCheckpoint(path).begin(2025)
+    checkpoint.mark_stage_done("teams")
+    checkpoint.finish()
+    checkpoint.close()
+
+    fresh = nba.SyncCheckpoint(path).begin(2025)
+    assert not fresh.resumed
+    assert fresh.completed_stages() == set()
+    fresh.close()
+
+def test_checkpoint_resumes_only_same_season_and_scope(tmp_path):
+    path = str(tmp_path / "checkpoint.sqlite3")
+    full = nba.SyncCheckpoint(path).begin(2025)
+    full.mark_stage_done("teams")
+    full.close()
+
+    scope = nba.describe_sync_scope(("box_scores",), datetime.date(2025, 1, 1), None)
+    for season, run_scope in ((2024, "full"), (2025, scope)):
+        other = nba.SyncCheckpoint(path).begin(season, scope=run_scope)
+        assert not other.resumed
+        other.close()
+
+    again = nba.SyncCheckpoint(path).begin(2025, resume=False)
+    assert not again.resumed
+    again.close()
@@ -0,0 +1,114 @@
+import threading
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+import pytest
+
+import nba_scrape_to_postgres as nba
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = 0
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.healthy = True
+
+    def get_transaction_status(self):
+        if self.in_transaction:
+            return psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = 1
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, query):
+                if not connection.healthy:
+                    raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+        return Cursor()
+
+def make_pool(**kwargs):
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection(len(opened)))
+        return opened[-1]
+
+    kwargs.setdefault("healthcheck_idle", 30)
+    return nba.ConnectionPool(connect=connect, **kwargs), opened
+
+def test_pool_reuses_most_recently_returned_connection():
+    pool, opened = make_pool(min_size=0, max_size=3)
+    first, second = pool.getconn(), pool.getconn()
+    pool.putconn(first)
+    pool.putconn(second)
+    assert pool.getconn() is second
+    assert len(opened) == 2
+    assert pool.stats()["checkouts"] == 3
+
+def test_pool_rolls_back_returned_transaction():
+    pool, _ = make_pool(max_size=1)
+    with pool.connection() as conn:
+        conn.in_transaction = True
+    assert conn.rollbacks == 1
+    assert pool.stats()["idle"] == 1
+
+def test_pool_times_out_when_exhausted():
+    pool, _ = make_pool(max_size=1, timeout=0.05)
+    pool.getconn()
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
+    assert pool.stats()["timeouts"] == 1
+
+def test_pool_hands_returned_connection_to_waiter():
+    pool, opened = make_pool(max_size=1, timeout=5)
+    conn = pool.getconn()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    pool.putconn(conn)
+    waiter.join(5)
+    assert got == [conn] and len(opened) == 1
+    assert pool.stats()["waits"] == 1
+
+def test_pool_replaces_connection_failing_healthcheck():
+    pool, opened = make_pool(max_size=1, healthcheck_idle=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.healthy = False
+    replacement = pool.getconn()
+    assert replacement is not conn and conn.closed
+    assert len(opened) == 2
+    assert pool.stats()["discarded"] == 1 and pool.stats()["size"] == 1
+
+def test_pool_drops_closed_connections():
+    pool, _ = make_pool(max_size=2)
+    conn = pool.getconn()
+    conn.close()
+    pool.putconn(conn)
+    assert pool.stats()["size"] == 0
+
+def test_pool_warm_opens_min_size():
+    pool, opened = make_pool(min_size=2, max_size=4)
+    pool.warm()
+    assert len(opened) == 2 and pool.stats()["idle"] == 2
+    pool.close()
+    assert all(conn.closed for conn in opened)
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
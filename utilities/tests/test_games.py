@@ -0,0 +1,45 @@
+import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+
+import nba_scrape_to_postgres as nba
+
+RESOLVER = SimpleNamespace(nba_team_ids={1610612737: 1, 1610612738: 2, 1610612751: 3})
+
+def finder_rows(*rows):
+    return pd.DataFrame(rows, columns=["GAME_ID", "GAME_DATE", "MATCHUP", "TEAM_ID", "PTS"])
+
+def test_pair_game_rows_orients_home_and_away():
+    games_df = finder_rows(
+        ("0022400001", "2025-01-05", "ATL vs. BOS", 1610612737, 110),
+        ("0022400001", "2025-01-05", "BOS @ ATL", 1610612738, 104),
+        # Away team's row first
+        ("0022400002", "2025-01-07", "ATL @ BKN", 1610612737, 99),
+        ("0022400002", "2025-01-07", "BKN vs. ATL", 1610612751, 101),
+    )
+    assert nba.pair_game_rows(games_df, RESOLVER) == [
+        ("0022400002", datetime.date(2025, 1, 7), 3, 1, 101, 99),
+        ("0022400001", datetime.date(2025, 1, 5), 1, 2, 110, 104),
+    ]
+
+def test_pair_game_rows_drops_unpaired_and_applies_limit():
+    games_df = finder_rows(
+        ("0022400001", "2025-01-05", "ATL vs. BOS", 1610612737, 110),
+        ("0022400001", "2025-01-05", "BOS @ ATL", 1610612738, 104),
+        ("0022400002", "2025-01-06", "BOS vs. BKN", 1610612738, None),
+        ("0022400002", "2025-01-06", "BKN @ BOS", 1610612751, None),
+        ("0022400003", "2025-01-08", "ATL vs. BKN", 1610612737, 90),  # other team row missing
+    )
+    games = nba.pair_game_rows(games_df, RESOLVER)
+    assert [game[0] for game in games] == ["0022400002", "0022400001"]
+    # Unplayed games keep NULL scores
+    assert games[0][4:] == (None, None)
+    assert nba.pair_game_rows(games_df, RESOLVER, limit=1) == games[:1]
+
+def test_pair_game_rows_leaves_unknown_teams_null():
+    games_df = finder_rows(
+        ("0022400001", "2025-01-05", "ATL vs. NOP", 1610612737, 110),
+        ("0022400001", "2025-01-05", "NOP @ ATL", 1610612740, 104),
+    )
+    assert nba.pair_game_rows(games_df, RESOLVER) == [("0022400001", datetime.date(2025, 1, 5), 1, None, 110, 104)]
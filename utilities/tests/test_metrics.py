@@ -0,0 +1,50 @@
+import pytest
+
+import nba_scrape_to_postgres as nba
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    # Keep test metrics out of the process-wide /metrics output
+    monkeypatch.setattr(nba, "METRICS", {})
+    return nba.METRICS
+
+def test_counter_renders_sorted_labelled_samples():
+    metric = nba.Metric("rows_total", "counter", "Rows written", ("table",))
+    metric.inc(3, table="players")
+    metric.inc(2, table="box_scores")
+    metric.inc(table="players")
+    assert metric.render() == [
+        "# HELP rows_total Rows written",
+        "# TYPE rows_total counter",
+        'rows_total{table="box_scores"} 2',
+        'rows_total{table="players"} 4',
+    ]
+
+def test_gauge_without_labels_and_label_escaping():
+    gauge = nba.Metric("pool_size", "gauge", "Open connections")
+    gauge.set(3)
+    assert gauge.render()[-1] == "pool_size 3"
+
+    counter = nba.Metric("errors_total", "counter", "Errors", ("reason",))
+    counter.inc(reason='bad "quote" \\ and\nnewline')
+    assert counter.render()[-1] == 'errors_total{reason="bad \\"quote\\" \\\\ and\\nnewline"} 1'
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    histogram = nba.Metric("latency_seconds", "histogram", "Latency", ("endpoint",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 3):
+        histogram.observe(value, endpoint="Standings")
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{endpoint="Standings",le="0.1"} 1',
+        'latency_seconds_bucket{endpoint="Standings",le="1.0"} 2',
+        'latency_seconds_bucket{endpoint="Standings",le="+Inf"} 3',
+        'latency_seconds_sum{endpoint="Standings"} 3.55',
+        'latency_seconds_count{endpoint="Standings"} 3',
+    ]
+
+def test_render_metrics_joins_every_registered_metric(registry):
+    nba.Metric("a_total", "counter", "A").inc()
+    nba.Metric("b_total", "counter", "B").inc(2)
+    assert nba.render_metrics() == (
+        "# HELP a_total A\n# TYPE a_total counter\na_total 1\n"
+        "# HELP b_total B\n# TYPE b_total counter\nb_total 2\n"
+    )
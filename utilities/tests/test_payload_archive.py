@@ -0,0 +1,107 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from nba_api.stats.library.http import NBAStatsHTTP, NBAStatsResponse
+
+import benchmark_sync
+import nba_scrape_to_postgres as nba
+from fake_nba_api import SEASON, SEASON_END_YEAR, FakeNbaApi
+
+def response(endpoint, parameters, text):
+    """A loaded endpoint as the api_response_sinks see it."""
+    return SimpleNamespace(endpoint=endpoint, parameters=parameters,
+                           nba_response=NBAStatsResponse(response=text, status_code=200, url=None))
+
+def request(endpoint, parameters):
+    return SimpleNamespace(endpoint=endpoint, parameters=parameters)
+
+def game_log(api, date_from, date_to):
+    parameters = {"Season": SEASON, "PlayerOrTeam": "P", "DateFrom": date_from, "DateTo": date_to}
+    return response("leaguegamelog", parameters, api.respond("leaguegamelog", parameters))
+
+def game_log_rows(text):
+    return sorted(tuple(row) for row in json.loads(text)["resultSets"][0]["rowSet"])
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = nba.PayloadArchive(str(tmp_path / "archive"))
+    yield archive
+    archive.close()
+
+def test_store_and_load_round_trip(archive):
+    archive.store(response("commonplayerinfo", {"PlayerID": 7}, '{"resultSets": []}'))
+    assert archive.load(request("commonplayerinfo", {"PlayerID": 7})) == '{"resultSets": []}'
+    assert archive.misses == 0
+
+def test_load_miss_raises_and_counts(archive):
+    with pytest.raises(LookupError):
+        archive.load(request("commonplayerinfo", {"PlayerID": 8}))
+    assert archive.misses == 1
+
+def test_identical_payloads_share_a_blob(archive):
+    archive.store(response("commonteamroster", {"TeamID": 1, "Season": SEASON}, "{}"))
+    archive.store(response("commonteamroster", {"TeamID": 2, "Season": SEASON}, "{}"))
+    archive.store(response("leaguestandings", {"SeasonNullable": "2023-24"}, "[]"))
+    assert archive.stats() == {"requests": 3, "payloads": 2}
+    assert archive.seasons() == [2024, SEASON_END_YEAR]
+
+def test_superseded_payload_blob_is_removed(archive):
+    archive.store(response("boxscoretraditionalv2", {"GameID": "1"}, '{"live": true}'))
+    archive.store(response("boxscoretraditionalv2", {"GameID": "1"}, '{"live": false}'))
+    assert archive.load(request("boxscoretraditionalv2", {"GameID": "1"})) == '{"live": false}'
+    blobs = [name for _, _, names in os.walk(os.path.join(archive.directory, "blobs")) for name in names]
+    assert len(blobs) == 1 and archive.stats() == {"requests": 1, "payloads": 1}
+
+def test_unarchived_window_is_merged_from_archived_windows(archive):
+    api = FakeNbaApi(days=6)
+    archive.store(game_log(api, "01/01/2025", "01/03/2025"))
+    archive.store(game_log(api, "01/04/2025", "01/06/2025"))
+    season = request("leaguegamelog", game_log(api, "01/02/2025", "01/06/2025").parameters)
+
+    with pytest.raises(LookupError):
+        archive.load(season)
+    merged = archive.load(season, merge_windows=True)
+    assert game_log_rows(merged) == game_log_rows(api.respond("leaguegamelog", season.parameters))
+    assert archive.misses == 1
+
+    other_season = request("leaguegamelog", {**season.parameters, "Season": "2023-24"})
+    with pytest.raises(LookupError):
+        archive.load(other_season, merge_windows=True)
+
+def box_score_snapshot(db):
+    with db.cursor() as cur:
+        cur.execute("""
+            SELECT g.nba_game_id, p.nba_player_id, b.minutes_played, b.points, b.rebounds, b.assists,
+                   b.field_goals_made, b.field_goals_attempted, b.plus_minus
+            FROM box_scores b
+            JOIN games g ON g.id = b.game_id
+            JOIN players p ON p.id = b.player_id
+            ORDER BY 1, 2
+        """)
+        return cur.fetchall()
+
+def test_rebuild_replays_an_incremental_sync(db, sync_state, monkeypatch, tmp_path):
+    archive = nba.PayloadArchive(str(tmp_path / "archive"))
+    monkeypatch.setattr(nba, "api_response_sinks", [archive.store])
+    api = FakeNbaApi(days=6, played_through=3)
+    api.serve(monkeypatch)
+    stages = "teams,players,games,box_scores"
+    nba.scrape_and_store(incremental=True, resume=False, season_end_year=SEASON_END_YEAR, stages=stages)
+    api.played_through = 6
+    nba.scrape_and_store(incremental=True, resume=False, season_end_year=SEASON_END_YEAR, stages=stages)
+    synced = box_score_snapshot(db)
+    # 6 days x 2 games x 6 players
+    assert len(synced) == 72
+
+    benchmark_sync.reset_database(db)
+
+    def offline(*args, **kwargs):
+        raise AssertionError("rebuild called the NBA API")
+
+    monkeypatch.setattr(NBAStatsHTTP, "send_api_request", offline)
+    results = nba.rebuild_from_archive(stages=stages, archive=archive)
+    archive.close()
+    assert [result["archive_misses"] for result in results] == [0]
+    assert box_score_snapshot(db) == synced
@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import nba_scrape_to_postgres as nba
+
+STAT_COLUMNS = ("PTS", "REB", "AST", "STL", "BLK", "TOV", "FGM", "FGA", "FG3M", "FTM", "FTA", "GP")
+
+def stats_frame():
+    rng = np.random.default_rng(7)
+    rows = [
+        {column: value for column, value in zip(STAT_COLUMNS, rng.uniform(0, 30, len(STAT_COLUMNS)).round(1))}
+        for _ in range(200)
+    ]
+    rows += [
+        dict.fromkeys(STAT_COLUMNS, 0),  # everything falls back to the defaults
+        dict.fromkeys(STAT_COLUMNS, None),
+        {"PTS": "12.5", "FGA": "", "TOV": "n/a", "GP": "3"},  # strings as nba_api sometimes returns them
+        {"PTS": 20, "FGA": 0, "FTA": 0, "TOV": 0.05, "AST": 4, "GP": 0.5},
+        {"PTS": 8, "REB": 2, "TOV": 10, "GP": 2.9},  # negative efficiency, truncated GP
+        {"AST": 0.125, "TOV": 0.1, "GP": 1},  # rounding tie
+    ]
+    return pd.DataFrame(rows, columns=STAT_COLUMNS)
+
+def test_vectorized_metrics_match_scalar_formulas():
+    df = stats_frame()
+    columns = nba.calculate_advanced_metrics_columns(df)
+    for index, row in df.iterrows():
+        expected = nba.calculate_advanced_metrics(row.to_dict())
+        for metric, value in expected.items():
+            actual = columns.at[index, metric]
+            if value is None:
+                assert math.isnan(actual), (index, metric, actual)
+            else:
+                assert actual == pytest.approx(value, abs=1e-12), (index, metric)
+
+def test_vectorized_metrics_tolerate_missing_columns():
+    df = pd.DataFrame({"PTS": [10.0, 0.0], "GP": [2, 1]})
+    columns = nba.calculate_advanced_metrics_columns(df)
+    for index, row in df.iterrows():
+        expected = nba.calculate_advanced_metrics(row.to_dict())
+        actual = {metric: columns.at[index, metric] for metric in expected}
+        assert {metric: None if math.isnan(value) else value for metric, value in actual.items()} == expected
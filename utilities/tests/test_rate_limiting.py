@@ -0,0 +1,105 @@
+import multiprocessing
+import threading
+
+import pytest
+
+import nba_scrape_to_postgres as nba
+
+def test_token_bucket_serves_burst_then_paces(clock):
+    bucket = nba.TokenBucket(rate=2.0, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.slept == []
+    bucket.acquire()
+    assert sum(clock.slept) == pytest.approx(0.5)
+
+def test_token_bucket_refills_up_to_burst(clock):
+    bucket = nba.TokenBucket(rate=1.0, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 60
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.slept == []
+    bucket.acquire()
+    assert sum(clock.slept) == pytest.approx(1.0)
+
+def test_set_rate_drain_empties_bucket(clock):
+    bucket = nba.TokenBucket(rate=4.0, burst=4)
+    bucket.set_rate(1.0, drain=True)
+    bucket.acquire()
+    assert bucket.rate == 1.0
+    assert sum(clock.slept) == pytest.approx(1.0)
+
+def make_pacer(rate=1.0):
+    bucket = nba.TokenBucket(rate=rate, burst=1)
+    return nba.AdaptivePacer(bucket, min_rate=0.25, max_rate=1.2, step=0.1, factor=0.5, cooldown=2.0)
+
+def test_pacer_raises_rate_additively_up_to_max(clock):
+    pacer = make_pacer()
+    pacer.on_success()
+    assert pacer.current_rate == pytest.approx(1.1)
+    for _ in range(5):
+        pacer.on_success()
+    assert pacer.current_rate == pytest.approx(1.2)
+    assert pacer.snapshot()["successes"] == 6
+
+def test_pacer_halves_rate_once_per_cooldown(clock):
+    pacer = make_pacer()
+    pacer.on_throttle()
+    pacer.on_throttle()
+    assert pacer.current_rate == pytest.approx(0.5)
+    clock.now += 2.5
+    pacer.on_throttle()
+    assert pacer.current_rate == pytest.approx(0.25)
+    clock.now += 2.5
+    pacer.on_throttle()
+    assert pacer.current_rate == pytest.approx(0.25)
+    assert pacer.snapshot()["throttles"] == 4
+
+def test_pacer_throttle_drains_bucket(clock):
+    pacer = make_pacer(rate=2.0)
+    pacer.on_throttle()
+    pacer.bucket.acquire()
+    assert sum(clock.slept) == pytest.approx(1.0)
+
+def shared_pacer(bucket):
+    return nba.AdaptivePacer(bucket, min_rate=0.25, max_rate=100.0, step=0.001, factor=0.5, cooldown=60.0)
+
+def test_pacers_sharing_a_bucket_cut_once_per_cooldown():
+    bucket = nba.SharedTokenBucket(rate=2.0, burst=1)
+    first, second = shared_pacer(bucket), shared_pacer(bucket)
+    first.on_throttle()
+    second.on_throttle()
+    assert bucket.rate == pytest.approx(1.0)
+    assert (first.throttles, second.throttles) == (1, 1)
+
+def test_throttle_in_another_process_cools_down_this_one():
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        pytest.skip("fork start method unavailable")
+    bucket = nba.SharedTokenBucket(rate=2.0, burst=1, context=context)
+    worker = context.Process(target=lambda: shared_pacer(bucket).on_throttle())
+    worker.start()
+    worker.join(10)
+    assert worker.exitcode == 0
+    assert bucket.rate == pytest.approx(1.0)
+
+    shared_pacer(bucket).on_throttle()
+    assert bucket.rate == pytest.approx(1.0)
+
+def test_concurrent_increases_are_not_lost():
+    bucket = nba.SharedTokenBucket(rate=1.0, burst=1)
+    pacers = [shared_pacer(bucket) for _ in range(4)]
+
+    def succeed(pacer):
+        for _ in range(500):
+            pacer.on_success()
+
+    threads = [threading.Thread(target=succeed, args=(pacer,)) for pacer in pacers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert bucket.rate == pytest.approx(1.0 + 4 * 500 * 0.001)
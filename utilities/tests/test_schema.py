@@ -0,0 +1,56 @@
+import pytest
+
+import nba_scrape_to_postgres as nba
+
+def player_row(name, nba_player_id, **values):
+    values = {"name": name, "nba_player_id": nba_player_id, "stats_season_end_year": 2025, **values}
+    return tuple(values.get(column) for column in nba.PLAYER_COLUMNS)
+
+def name_uniques(conn):
+    with conn.cursor() as cur:
+        cur.execute(nba.PLAYER_NAME_UNIQUE_SQL)
+        return cur.fetchall()
+
+@pytest.mark.parametrize("ddl", [
+    "ALTER TABLE players ADD CONSTRAINT players_name_key UNIQUE (name)",
+    "CREATE UNIQUE INDEX players_name_idx ON players (name)",
+])
+def test_ensure_schema_drops_unique_player_name(db, ddl):
+    with db.cursor() as cur:
+        cur.execute(ddl)
+    db.commit()
+    nba.ensure_schema(db)
+    assert name_uniques(db) == []
+
+    # Namesakes are different players once players are keyed on NBA IDs
+    nba.insert_players(db, [player_row("Marcus Williams", 201173), player_row("Marcus Williams", 201610)])
+    db.commit()
+    with db.cursor() as cur:
+        cur.execute("SELECT nba_player_id FROM players WHERE name = 'Marcus Williams' ORDER BY nba_player_id")
+        assert cur.fetchall() == [(201173,), (201610,)]
+
+def test_ensure_schema_is_a_no_op_once_applied(db):
+    nba.ensure_schema(db)
+    with db.cursor() as cur:
+        cur.execute("CREATE INDEX players_name_lookup ON players (name)")  # non-unique indexes stay
+    db.commit()
+    nba.ensure_schema(db)
+    with db.cursor() as cur:
+        cur.execute("SELECT to_regclass('players_name_lookup') IS NOT NULL")
+        assert cur.fetchone()[0]
+
+@pytest.mark.parametrize("copy_tables", [{"players"}, set()])
+def test_player_upsert_keeps_computed_starter_flags(db, monkeypatch, copy_tables):
+    monkeypatch.setattr(nba, "COPY_LOAD_TABLES", copy_tables)
+    nba.ensure_schema(db)
+    nba.insert_players(db, [player_row("Trae Young", 1629027, is_starter=False, points=24.0)])
+    with db.cursor() as cur:
+        cur.execute("UPDATE players SET is_starter = TRUE")
+    db.commit()
+
+    # A players-only sync rebuilds every row with is_starter False
+    nba.insert_players(db, [player_row("Trae Young", 1629027, is_starter=False, points=25.5)])
+    db.commit()
+    with db.cursor() as cur:
+        cur.execute("SELECT is_starter, points FROM players")
+        assert cur.fetchall() == [(True, 25.5)]
@@ -0,0 +1,63 @@
+import nba_scrape_to_postgres as nba
+from fake_nba_api import SEASON_END_YEAR, FakeNbaApi
+
+PLAYER_TOTALS_SQL = """
+    SELECT bs.player_id, %(season)s, COUNT(*), COUNT(*) FILTER (WHERE bs.is_starter),
+           SUM(bs.points), SUM(bs.rebounds), SUM(bs.assists), SUM(bs.field_goals_made),
+           SUM(bs.field_goals_attempted), SUM(bs.plus_minus)
+    FROM box_scores bs
+    JOIN games g ON g.id = bs.game_id
+    GROUP BY bs.player_id
+    ORDER BY 1
+"""
+
+TEAM_TOTALS_SQL = """
+    SELECT bs.team_id, %(season)s, COUNT(DISTINCT bs.game_id),
+           COUNT(DISTINCT bs.game_id) FILTER (WHERE CASE WHEN g.home_team_id = bs.team_id
+                                                         THEN g.home_score > g.away_score
+                                                         ELSE g.away_score > g.home_score END),
+           SUM(bs.points), SUM(bs.rebounds), SUM(bs.assists), SUM(bs.field_goals_made),
+           SUM(bs.field_goals_attempted), SUM(bs.plus_minus)
+    FROM box_scores bs
+    JOIN games g ON g.id = bs.game_id
+    GROUP BY bs.team_id
+    ORDER BY 1
+"""
+
+def fetch(db, query, season=SEASON_END_YEAR):
+    with db.cursor() as cur:
+        cur.execute(query, {"season": season})
+        rows = cur.fetchall()
+    db.rollback()
+    return rows
+
+def sync(api, played_through):
+    api.played_through = played_through
+    nba.scrape_and_store(incremental=True, resume=False, season_end_year=SEASON_END_YEAR,
+                         stages="teams,players,games,box_scores,starters,aggregates")
+
+def test_incremental_refresh_matches_a_full_group_by(db, sync_state, monkeypatch):
+    api = FakeNbaApi(days=6)
+    api.serve(monkeypatch)
+    sync(api, played_through=3)
+    # The second run only queues the players and teams of the new games
+    sync(api, played_through=6)
+
+    assert fetch(db, "SELECT COUNT(*) FROM season_aggregate_queue") == [(0,)]
+    players = fetch(db, """
+        SELECT player_id, season_end_year, games_played, games_started, points, rebounds, assists,
+               field_goals_made, field_goals_attempted, plus_minus
+        FROM player_season_stats ORDER BY 1
+    """)
+    teams = fetch(db, """
+        SELECT team_id, season_end_year, games_played, wins, points, rebounds, assists,
+               field_goals_made, field_goals_attempted, plus_minus
+        FROM team_season_stats ORDER BY 1
+    """)
+    assert len(players) == 12 and len(teams) == 4
+    assert players == fetch(db, PLAYER_TOTALS_SQL)
+    assert teams == fetch(db, TEAM_TOTALS_SQL)
+
+def test_refresh_with_an_empty_queue_is_a_no_op(db):
+    nba.ensure_schema(db)
+    assert nba.refresh_season_aggregates(db) == {"player_season_stats": 0, "team_season_stats": 0}
@@ -0,0 +1,86 @@
+import collections
+import datetime
+
+import pytest
+
+import nba_scrape_to_postgres as nba
+from fake_nba_api import SEASON_END_YEAR, FakeNbaApi
+
+def seed_season(conn, starter_flags):
+    """Two teams, two players and one game per entry of starter_flags (Trae Young's flag; Jaylen Brown comes off the bench)."""
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO teams (name, abbreviation) VALUES ('Atlanta Hawks', 'ATL'), ('Boston Celtics', 'BOS')")
+        cur.execute("INSERT INTO players (name, team_id, nba_player_id) VALUES ('Trae Young', 1, 1629027), ('Jaylen Brown', 2, 1627759)")
+        for day, started in enumerate(starter_flags, start=1):
+            cur.execute("""
+                INSERT INTO games (nba_game_id, game_date, home_team_id, away_team_id, home_score, away_score)
+                VALUES (%s, %s, 1, 2, 100, 90) RETURNING id
+            """, (f"00224{day:05d}", datetime.date(2025, 1, day)))
+            game_id = cur.fetchone()[0]
+            cur.execute("""
+                INSERT INTO box_scores (game_id, player_id, team_id, points, is_starter)
+                VALUES (%s, 1, 1, 20, %s), (%s, 2, 2, 18, false)
+            """, (game_id, started, game_id))
+    conn.commit()
+
+def starter_flags(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT name, is_starter FROM players ORDER BY id")
+        rows = cur.fetchall()
+    conn.rollback()
+    return rows
+
+def test_per_game_mode_reads_the_last_games_of_stored_box_scores(db, monkeypatch):
+    def offline(*args, **kwargs):
+        raise AssertionError("starter status called the NBA API")
+
+    monkeypatch.setattr(nba, "BOX_SCORE_MODE", "per_game")
+    monkeypatch.setattr(nba, "nba_api_request", offline)
+    nba.ensure_schema(db)
+    # Benched early, then started the last three games
+    seed_season(db, [False, False, False, True, True, True])
+
+    nba.update_starter_status(db, 2025, num_games=3)
+    assert starter_flags(db) == [("Trae Young", True), ("Jaylen Brown", False)]
+    nba.update_starter_status(db, 2025, num_games=6)
+    assert starter_flags(db) == [("Trae Young", False), ("Jaylen Brown", False)]
+
+@pytest.mark.parametrize("starts, expected", [(7, True), (6, False)])
+def test_season_mode_classifies_from_recent_starts(db, monkeypatch, starts, expected):
+    monkeypatch.setattr(nba, "BOX_SCORE_MODE", "season")
+    monkeypatch.setattr(nba, "get_recent_starts",
+                        lambda season_year, num_games=None: {1629027: (10, starts), 1627759: (2, 2)})
+    nba.ensure_schema(db)
+    seed_season(db, [None])
+
+    nba.update_starter_status(db, 2025)
+    # Jaylen Brown started every game but played fewer than three
+    assert starter_flags(db) == [("Trae Young", expected), ("Jaylen Brown", False)]
+
+def test_season_mode_sync_request_count_does_not_grow_with_games(db, sync_state, monkeypatch):
+    monkeypatch.setattr(nba, "BOX_SCORE_MODE", "season")
+    api = FakeNbaApi(days=10, played_through=8)
+    api.serve(monkeypatch)
+
+    def sync():
+        api.requests.clear()
+        nba.scrape_and_store(incremental=True, resume=False, season_end_year=SEASON_END_YEAR,
+                             stages="teams,players,games,box_scores,starters")
+        return collections.Counter(endpoint for endpoint, _ in api.requests)
+
+    first = sync()
+    assert first["boxscoretraditionalv2"] == 0
+    assert first["leaguegamelog"] == 1
+    # One for the players stage, two for starter status
+    assert first["leaguedashplayerstats"] == 3
+
+    # A nightly sync with two new games costs the same handful of requests
+    api.played_through = 9
+    nightly = sync()
+    assert {endpoint: nightly[endpoint] for endpoint in ("boxscoretraditionalv2", "leaguegamelog", "leaguedashplayerstats")} == \
+        {"boxscoretraditionalv2": 0, "leaguegamelog": 1, "leaguedashplayerstats": 3}
+
+    with db.cursor() as cur:
+        cur.execute("SELECT nba_player_id, is_starter FROM players ORDER BY nba_player_id")
+        flags = dict(cur.fetchall())
+    assert flags == {player["id"]: player["starter"] for player in api.players}
@@ -0,0 +1,41 @@
+import json
+import threading
+
+import pytest
+
+import nba_scrape_to_postgres as nba
+from nba_api.stats.endpoints import leaguestandings
+
+STANDINGS = json.dumps({"resultSets": [{"name": "Standings", "headers": ["TeamID", "TeamName"], "rowSet": []}]})
+
+@pytest.fixture
+def replayed_api(monkeypatch):
+    monkeypatch.setattr(nba, "api_rate_limiter", nba.TokenBucket(rate=1000.0, burst=1000))
+    with nba.replaying_payloads(lambda endpoint: STANDINGS):
+        yield
+
+def request_standings(_=None):
+    return nba.nba_api_request(leaguestandings.LeagueStandings, season="2024-25")
+
+def test_api_calls_are_counted_per_run(replayed_api):
+    run = nba.SyncProgress()
+
+    def poller():
+        # Another thread (the live poller) making requests while the run is active
+        for _ in range(5):
+            request_standings()
+
+    token = nba.current_sync_progress.set(run)
+    try:
+        request_standings()
+        thread = threading.Thread(target=poller)
+        thread.start()
+        # Fetches on the worker pool are counted against the run that started them
+        results = list(nba.fetch_concurrently(request_standings, range(3)))
+        thread.join()
+    finally:
+        nba.current_sync_progress.reset(token)
+    request_standings()
+
+    assert all(error is None for _, _, error in results)
+    assert run.snapshot()["api_calls"] == 4
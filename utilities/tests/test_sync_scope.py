@@ -0,0 +1,28 @@
+import datetime
+
+import pytest
+
+import nba_scrape_to_postgres as nba
+
+def test_default_scope_is_the_full_pipeline():
+    assert nba.parse_sync_scope() == (nba.SYNC_STAGES, None, None)
+    assert nba.describe_sync_scope(*nba.parse_sync_scope()) == "full"
+
+def test_stages_are_returned_in_pipeline_order():
+    stages, date_from, date_to = nba.parse_sync_scope(" starters,games ,, box_scores", "2025-01-06", datetime.date(2025, 1, 12))
+    assert stages == ("games", "box_scores", "starters")
+    assert (date_from, date_to) == (datetime.date(2025, 1, 6), datetime.date(2025, 1, 12))
+    assert nba.describe_sync_scope(stages, date_from, date_to) == "stages=games,box_scores,starters;from=2025-01-06;to=2025-01-12"
+
+def test_a_date_window_makes_a_full_stage_list_partial():
+    assert nba.describe_sync_scope(nba.SYNC_STAGES, datetime.date(2025, 1, 6)) == \
+        "stages=" + ",".join(nba.SYNC_STAGES) + ";from=2025-01-06;to="
+
+@pytest.mark.parametrize("stages, date_from, date_to, message", [
+    ("teams,standings", None, None, "Unknown sync stage"),
+    (None, "01/06/2025", None, "date_from must be a YYYY-MM-DD date"),
+    (["games"], "2025-01-12", "2025-01-06", "is after date_to"),
+])
+def test_invalid_scopes_raise(stages, date_from, date_to, message):
+    with pytest.raises(ValueError, match=message):
+        nba.parse_sync_scope(stages, date_from, date_to)